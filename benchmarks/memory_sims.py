@@ -1,4 +1,5 @@
 import pybamm
+import numpy as np
 
 parameters = ["Marquis2019", "Chen2020"]
 
@@ -77,3 +78,31 @@ class MemDFNSimulationGITT:
             self.model, parameter_values=self.param, experiment=exp
         )
         return self.sim
+
+
+class MemSPMIntegratorCache:
+    param_names = ["max_entries"]
+    params = [None, 20]
+
+    def setup(self, max_entries):
+        sim = pybamm.Simulation(pybamm.lithium_ion.SPM())
+        sim.build()
+        self.model = sim.built_model
+        self.solver = pybamm.CasadiSolver(mode="safe")
+        self.solver.integrator_cache = pybamm.IntegratorCache(max_entries=max_entries)
+
+    def solve_many_durations(self):
+        # Each duration gives different time grids, hence new integrators
+        for t_end in np.linspace(600, 3600, 50):
+            self.solver.solve(self.model, np.linspace(0, t_end, 100))
+
+    def peakmem_solve_many_durations(self, max_entries):
+        self.solve_many_durations()
+
+    def track_integrator_cache_entries(self, max_entries):
+        self.solve_many_durations()
+        return len(self.solver.integrator_cache)
+
+    def track_integrator_cache_nbytes(self, max_entries):
+        self.solve_many_durations()
+        return self.solver.integrator_cache.nbytes
@@ -0,0 +1,105 @@
+import pybamm
+import numpy as np
+
+output_variables = [
+    "Terminal voltage [V]",
+    "Current [A]",
+    "Discharge capacity [A.h]",
+    "Electrolyte concentration [mol.m-3]",
+    "Negative particle concentration [mol.m-3]",
+    "Positive particle surface concentration [mol.m-3]",
+]
+
+
+def process_variables_loop(solution, names):
+    """
+    Reference post-processing that evaluates each variable one time point at a time,
+    as ProcessedVariable did before evaluation was batched over time points
+    """
+    for name in names:
+        var_casadi = solution[name].base_variables_casadi
+        for ts, ys, inputs, func in zip(
+            solution.all_ts, solution.all_ys, solution.all_inputs_casadi, var_casadi
+        ):
+            for idx, t in enumerate(ts):
+                func(t, ys[:, idx], inputs).full()
+
+
+def process_variables_batched(solution, names):
+    for name in names:
+        pybamm.ProcessedVariable(
+            solution[name].base_variables,
+            solution[name].base_variables_casadi,
+            solution,
+        )
+
+
+class TimePostProcessDFN:
+    param_names = ["method"]
+    params = ["loop", "batched"]
+
+    def setup(self, method):
+        model = pybamm.lithium_ion.DFN()
+        sim = pybamm.Simulation(model)
+        self.solution = sim.solve(np.linspace(0, 3600, 5000))
+        # create the casadi functions once, so that only evaluation is timed
+        for name in output_variables:
+            self.solution[name]
+        if method == "loop":
+            self.process = process_variables_loop
+        else:
+            self.process = process_variables_batched
+
+    def time_post_process(self, method):
+        self.process(self.solution, output_variables)
+
+    def peakmem_post_process(self, method):
+        self.process(self.solution, output_variables)
+
+
+class TimeESOH:
+    param_names = ["method"]
+    params = ["simulation", "compiled"]
+
+    def setup(self, method):
+        parameter_values = pybamm.ParameterValues("Mohtat2020")
+        param = pybamm.LithiumIonParameters()
+        self.inputs = {
+            "V_min": 3,
+            "V_max": 4.2,
+            "C_n": parameter_values.evaluate(param.n.cap_init),
+            "C_p": parameter_values.evaluate(param.p.cap_init),
+            "n_Li": parameter_values.evaluate(param.n_Li_particles_init),
+        }
+        if method == "simulation":
+            self.esoh_sim = pybamm.Simulation(
+                pybamm.lithium_ion.ElectrodeSOH(), parameter_values=parameter_values
+            )
+            self.esoh_sim.solve([0], inputs=self.inputs)
+        else:
+            self.esoh_solver = pybamm.lithium_ion.ElectrodeSOHSolver(parameter_values)
+            self.esoh_solver.solve(self.inputs)
+        # inputs of 100 cycles with a small loss of capacity and lithium each cycle
+        fade = np.linspace(1, 0.9, 100)
+        self.batch_inputs = {
+            **self.inputs,
+            "C_n": self.inputs["C_n"] * fade,
+            "n_Li": self.inputs["n_Li"] * fade,
+        }
+
+    def time_solve(self, method):
+        if method == "simulation":
+            self.esoh_sim.solve([0], inputs=self.inputs)
+        else:
+            self.esoh_solver.solve(self.inputs)
+
+    def time_solve_100_cycles(self, method):
+        if method == "simulation":
+            for i in range(100):
+                inputs = {
+                    name: np.asarray(value).flat[i % np.size(value)]
+                    for name, value in self.batch_inputs.items()
+                }
+                self.esoh_sim.solve([0], inputs=inputs)
+        else:
+            self.esoh_solver.solve_batch(self.batch_inputs)
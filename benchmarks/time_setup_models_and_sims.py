@@ -63,6 +63,36 @@ class TimeBuildDFN:
         compute_discretisation(self.model, self.param).process_model(self.model)
 
 
+class TimeBuildSizeDistribution:
+    param_names = ["model", "operator matrices cached"]
+    params = (["MPM", "DFN"], [False, True])
+
+    def setup(self, model, cached):
+        if model == "MPM":
+            self.model = pybamm.lithium_ion.MPM()
+        else:
+            self.model = pybamm.lithium_ion.DFN({"particle size": "distribution"})
+        self.param = self.model.default_parameter_values
+        if model == "DFN":
+            self.param = pybamm.get_size_distribution_parameters(self.param)
+        self.param.process_model(self.model)
+        geometry = self.model.default_geometry
+        self.param.process_geometry(geometry)
+        self.mesh = pybamm.Mesh(
+            geometry, self.model.default_submesh_types, self.model.default_var_pts
+        )
+        pybamm.operator_matrix_cache.clear()
+        if cached:
+            # e.g. a previous operating condition of an experiment
+            self.time_discretise_size_distribution(model, False)
+
+    def time_discretise_size_distribution(self, model, cached):
+        if not cached:
+            pybamm.operator_matrix_cache.clear()
+        disc = pybamm.Discretisation(self.mesh, self.model.default_spatial_methods)
+        disc.process_model(self.model, inplace=False)
+
+
 class TimeBuildSPMSimulation:
     param_names = ["with experiment", "parameter"]
     params = ([False, True], parameters)
@@ -115,3 +145,35 @@ class TimeBuildDFNSimulation:
             pybamm.Simulation(self.model, parameter_values=self.param, experiment=exp)
         else:
             pybamm.Simulation(self.model, parameter_values=self.param, C_rate=1)
+
+
+class TimeBuildExperimentModes:
+    param_names = ["model", "experiment mode"]
+    params = (
+        [pybamm.lithium_ion.SPM, pybamm.lithium_ion.DFN],
+        ["multiple models", "single model"],
+    )
+
+    def setup(self, model, experiment_mode):
+        self.experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C until 3.3 V",
+                    "Rest for 1 hour",
+                    "Charge at 1 A until 4.1 V",
+                    "Hold at 4.1 V until 50 mA",
+                    "Discharge at 2 W for 10 minutes",
+                    "Rest for 1 hour",
+                )
+            ]
+        )
+
+    def time_setup_experiment(self, model, experiment_mode):
+        sim = pybamm.Simulation(
+            model(), experiment=self.experiment, experiment_mode=experiment_mode
+        )
+        sim.build_for_experiment()
+        # set up all the built models in the solver
+        inputs = {**sim._experiment_inputs[0], "start time": 0}
+        for built_model in set(sim.op_conds_to_built_models.values()):
+            sim.solver.set_up(built_model, inputs=inputs)
@@ -65,3 +65,31 @@ class TimeDFNSimulationGITT:
             [("Discharge at C/20 for 1 hour", "Rest for 1 hour")] * 20
         )
         pybamm.Simulation(self.model, parameter_values=self.param, experiment=exp)
+
+
+class TimeSolveSPMSimulationCycles:
+    # Time per cycle should be independent of the number of cycles
+    param_names = ["number of cycles"]
+    params = [10, 50, 100]
+
+    def setup(self, num_cycles):
+        self.param = pybamm.ParameterValues("Marquis2019")
+        self.model = pybamm.lithium_ion.SPM()
+        exp = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C for 1 minute",
+                    "Rest for 1 minute",
+                    "Charge at 1C for 1 minute",
+                    "Rest for 1 minute",
+                )
+            ]
+            * num_cycles
+        )
+        self.sim = pybamm.Simulation(
+            self.model, parameter_values=self.param, experiment=exp
+        )
+        self.sim.build_for_experiment()
+
+    def time_solve_SPM_simulation(self, num_cycles):
+        self.sim.solve(calc_esoh=False)
@@ -3,6 +3,7 @@
 
 import pybamm
 import numpy as np
+import pandas as pd
 
 
 def solve_model_once(model, solver, t_eval):
@@ -169,3 +170,40 @@ class TimeSolveDFN:
 
     def time_solve_model(self, solve_first, parameters):
         TimeSolveDFN.solver.solve(self.model, t_eval=self.t_eval)
+
+
+class TimeSolveDFNSafeModes:
+    # Includes the solver set-up (creating the integrators), since the model is only
+    # built in setup. "safe" mode creates an integrator for each distinct grid of the
+    # global steps, "safe with dense output" and "safe without grid" a single one
+    param_names = ["mode", "protocol"]
+    params = (
+        ["safe", "safe with dense output", "safe without grid"],
+        ["1C discharge", "1C discharge, irregular t_eval", "UDDS"],
+    )
+
+    def setup(self, mode, protocol):
+        model = pybamm.lithium_ion.DFN()
+        param = model.default_parameter_values
+        if protocol == "UDDS":
+            drive_cycle = pd.read_csv(
+                pybamm.get_parameters_filepath("input/drive_cycles/UDDS.csv"),
+                comment="#",
+                header=None,
+            ).to_numpy()
+            timescale = param.evaluate(model.timescale)
+            param["Current function [A]"] = pybamm.Interpolant(
+                drive_cycle[:, 0], drive_cycle[:, 1], timescale * pybamm.t
+            )
+            self.t_eval = drive_cycle[:, 0]
+        elif protocol == "1C discharge":
+            self.t_eval = np.linspace(0, 3600, 100)
+        else:
+            # a different grid in each global step
+            self.t_eval = 3600 * np.linspace(0, 1, 100) ** 2
+        solver = pybamm.CasadiSolver(mode=mode)
+        self.sim = pybamm.Simulation(model, parameter_values=param, solver=solver)
+        self.sim.build()
+
+    def time_setup_and_solve(self, mode, protocol):
+        self.sim.solve(self.t_eval)
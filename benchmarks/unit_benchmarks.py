@@ -1,5 +1,6 @@
 import pybamm
 import numpy as np
+import casadi
 
 
 class TimeCreateExpression:
@@ -83,3 +84,68 @@ class TimeSolveModel:
         solver = pybamm.ScipySolver()
         t = np.linspace(0, 3600, 600)
         solver.solve(self.model, t)
+
+
+class TimeEvaluateDFNRhs:
+    param_names = ["number of states"]
+    params = [1, 100]
+
+    def setup(self, n_states):
+        model = pybamm.lithium_ion.DFN()
+        sim = pybamm.Simulation(model)
+        sim.build()
+        self.rhs = pybamm.EvaluatorPython(sim.built_model.concatenated_rhs)
+        y0 = sim.built_model.concatenated_initial_conditions.evaluate()
+        self.t = np.linspace(0, 0.1, n_states)
+        self.y = np.tile(y0, (1, n_states))
+
+    def time_evaluate_loop(self, n_states):
+        for i in range(n_states):
+            self.rhs(self.t[i], self.y[:, i])
+
+    def time_evaluate_batch(self, n_states):
+        self.rhs(self.t, self.y)
+
+
+class TimeEvaluateInterpolant:
+    param_names = ["dimensions", "evaluation", "number of points"]
+    params = (
+        [2, 3],
+        ["interp2d (previous 2D path)", "python", "casadi", "casadi jacobian"],
+        [10, 1000],
+    )
+
+    def setup(self, dimensions, evaluation, n_points):
+        x = [np.linspace(0, 1, 50 + 10 * i) for i in range(dimensions)]
+        grid = np.meshgrid(*x, indexing="ij")
+        data = np.sin(sum((i + 1) * xx for i, xx in enumerate(grid)))
+        children = [
+            pybamm.StateVector(slice(i * n_points, (i + 1) * n_points))
+            for i in range(dimensions)
+        ]
+        self.y = np.random.default_rng(0).random(dimensions * n_points)
+        if evaluation == "interp2d (previous 2D path)":
+            if dimensions != 2:
+                raise NotImplementedError
+            from scipy import interpolate
+
+            # evaluates on the outer grid of the points, then takes the diagonal
+            function = interpolate.interp2d(x[0], x[1], data.T)
+            self.evaluate = lambda y: np.diagonal(
+                function(y[:n_points], y[n_points:])
+            )
+            return
+        interp = pybamm.Interpolant(x, data, children)
+        if evaluation == "python":
+            evaluator = pybamm.EvaluatorPython(interp)
+            self.evaluate = lambda y: evaluator(y=y)
+        else:
+            casadi_y = casadi.MX.sym("y", self.y.shape[0])
+            out = interp.to_casadi(y=casadi_y)
+            if evaluation == "casadi jacobian":
+                out = casadi.jacobian(out, casadi_y)
+            function = casadi.Function("f", [casadi_y], [out])
+            self.evaluate = lambda y: function(y)
+
+    def time_evaluate(self, dimensions, evaluation, n_points):
+        self.evaluate(self.y)
@@ -81,6 +81,7 @@ from .expression_tree.operations.evaluate_python import (
     id_to_python_variable,
     to_python,
     EvaluatorPython,
+    EvaluatorPythonSparseJacobian,
 )
 
 from .expression_tree.operations.evaluate_python import EvaluatorJax
@@ -90,6 +91,9 @@ from .expression_tree.operations.jacobian import Jacobian
 from .expression_tree.operations.convert_to_casadi import CasadiConverter
 from .expression_tree.operations.unpack_symbols import SymbolUnpacker
 from .expression_tree.operations.replace_symbols import SymbolReplacer
+from .expression_tree.operations.eliminate_common_subexpressions import (
+    CommonSubexpressionEliminator,
+)
 from .expression_tree.operations.evaluate_julia import (
     get_julia_function,
     get_julia_mtk_model,
@@ -189,6 +193,10 @@ from .meshes.scikit_fem_submeshes import (
 #
 # Spatial Methods
 #
+from .spatial_methods.operator_matrix_cache import (
+    OperatorMatrixCache,
+    operator_matrix_cache,
+)
 from .spatial_methods.spatial_method import SpatialMethod
 from .spatial_methods.zero_dimensional_method import ZeroDimensionalSpatialMethod
 from .spatial_methods.finite_volume import FiniteVolume
@@ -202,8 +210,22 @@ from .solvers.solution import Solution, make_cycle_solution
 from .solvers.processed_variable import ProcessedVariable
 from .solvers.processed_symbolic_variable import ProcessedSymbolicVariable
 from .solvers.base_solver import BaseSolver
+from .solvers.consistent_state_cache import ConsistentStateCache
 from .solvers.dummy_solver import DummySolver
 from .solvers.algebraic_solver import AlgebraicSolver
+from .solvers.integrator_cache import IntegratorCache
+from .solvers.memory_mapped_storage import MemoryMappedStorage
+from .solvers.summary_reductions import (
+    BaseReduction,
+    MinimumReduction,
+    MaximumReduction,
+    RangeReduction,
+    FirstReduction,
+    LastReduction,
+    ChangeReduction,
+    IntegralReduction,
+    SummaryVariableReducer,
+)
 from .solvers.casadi_solver import CasadiSolver
 from .solvers.casadi_algebraic_solver import CasadiAlgebraicSolver
 from .solvers.scikits_dae_solver import ScikitsDaeSolver
@@ -219,6 +241,12 @@ from .solvers.idaklu_solver import IDAKLUSolver, have_idaklu
 # Experiments
 #
 from .experiments.experiment import Experiment
+from .experiments.output_policies import (
+    BaseOutputPolicy,
+    FixedPeriodOutput,
+    AdaptiveOutput,
+    StepEndpointsOutput,
+)
 from . import experiments
 
 #
@@ -235,6 +263,7 @@ from .plotting.dynamic_plot import dynamic_plot
 # Simulation
 #
 from .simulation import Simulation, load_sim, is_notebook
+from .build_cache import BuildCache
 
 #
 # Batch Study
@@ -1,9 +1,15 @@
 #
 # BatchStudy class
 #
-import pybamm
+import multiprocessing as mp
+import pickle
+import time
+import traceback
+from collections import deque
 from itertools import product
 
+import pybamm
+
 
 class BatchStudy:
     """
@@ -44,6 +50,33 @@ class BatchStudy:
         and second model with second solver, second experiment etc.
         If True runs a cartesian product of models, solvers and experiments.
         Default is False
+    processes : int (optional)
+        If given, the simulations are solved in parallel in a pool of this many
+        worker processes, and an error in one simulation does not stop the others
+        (see :meth:`solve_iter`). Default is None (solve the simulations one after
+        the other in this process)
+    chunksize : int (optional)
+        The number of simulations sent to a worker process at a time. Default is 1
+    timeout : float (optional)
+        The maximum time, in seconds, for each simulation (including all repeats),
+        only used if `processes` is given. A worker process that runs out of time
+        is terminated, even if it is in the middle of a solve, and the simulations
+        it was solving fail with a TimeoutError (for chunks of several simulations,
+        the time limit is the sum of the limits of the simulations in the chunk).
+        Default is None (no time limit)
+
+    Attributes
+    ----------
+    sims : list of :class:`pybamm.Simulation`
+        The simulations that have been solved, in the order of the combinations of
+        models, solvers, experiments etc.
+    failures : dict
+        The errors raised by simulations that failed, keyed by the index of the
+        simulation among the combinations (only in parallel)
+    timings : dict
+        Timing statistics of the last call to :meth:`solve`: the number of
+        simulations and failures, the total wall-clock time, and the mean and
+        maximum time taken by a simulation (all in seconds)
     """
 
     INPUT_LIST = [
@@ -72,6 +105,9 @@ class BatchStudy:
         C_rates=None,
         repeats=1,
         permutations=False,
+        processes=None,
+        chunksize=1,
+        timeout=None,
     ):
         self.models = models
         self.experiments = experiments
@@ -85,7 +121,13 @@ class BatchStudy:
         self.C_rates = C_rates
         self.repeats = repeats
         self.permutations = permutations
+        self.processes = processes
+        self.chunksize = chunksize
+        self.timeout = timeout
         self.quick_plot = None
+        self.sims = []
+        self.failures = {}
+        self.timings = {}
 
         if not self.permutations:
             for name in self.INPUT_LIST:
@@ -110,10 +152,184 @@ class BatchStudy:
         **kwargs,
     ):
         """
+        Solve all the simulations, storing them in `self.sims`.
         For more information on the parameters used in the solve,
         See :meth:`pybamm.Simulation.solve`
         """
-        self.sims = []
+        sims = {}
+        for index, sim, _ in self.solve_iter(
+            t_eval,
+            solver,
+            check_model,
+            save_at_cycles,
+            calc_esoh,
+            starting_solution,
+            initial_soc,
+            **kwargs,
+        ):
+            if sim is not None:
+                sims[index] = sim
+        self.sims = [sims[index] for index in sorted(sims)]
+
+    def solve_iter(
+        self,
+        t_eval=None,
+        solver=None,
+        check_model=True,
+        save_at_cycles=None,
+        calc_esoh=True,
+        starting_solution=None,
+        initial_soc=None,
+        **kwargs,
+    ):
+        """
+        Solve all the simulations, yielding each one as soon as it has been solved.
+        If `self.processes` is given, the simulations are solved in parallel and may
+        be yielded in any order, and errors are caught and stored in
+        `self.failures` instead of being raised. Timing statistics are stored in
+        `self.timings` once all the simulations have been solved.
+        For more information on the parameters used in the solve,
+        See :meth:`pybamm.Simulation.solve`
+
+        Yields
+        ------
+        index : int
+            The index of the simulation among the combinations of models, solvers,
+            experiments etc.
+        sim : :class:`pybamm.Simulation`
+            The solved simulation, or None if it failed
+        error : Exception
+            The error raised by the simulation if it failed, otherwise None
+        """
+        solve_args = (
+            t_eval,
+            solver,
+            check_model,
+            save_at_cycles,
+            calc_esoh,
+            starting_solution,
+            initial_soc,
+        )
+        tasks = [
+            (index, sim_kwargs, solve_args, kwargs, self.repeats)
+            for index, sim_kwargs in enumerate(self._simulation_kwargs())
+        ]
+
+        self.failures = {}
+        task_times = []
+        timer = pybamm.Timer()
+        if self.processes is None:
+            results = map(_solve_task, tasks, [False] * len(tasks))
+        else:
+            results = self._solve_in_pool(tasks)
+        for index, sim, error, task_time in results:
+            task_times.append(task_time)
+            if isinstance(sim, bytes):
+                sim = pickle.loads(sim)
+            if error is not None:
+                pybamm.logger.warning(
+                    f"Simulation {index} of the batch study failed: {error}"
+                )
+                self.failures[index] = error
+            yield index, sim, error
+
+        self.timings = {
+            "number of simulations": len(tasks),
+            "number of failures": len(self.failures),
+            "total time": timer.time().value,
+            "mean simulation time": sum(task_times) / max(len(task_times), 1),
+            "max simulation time": max(task_times, default=0),
+        }
+
+    def _solve_in_pool(self, tasks):
+        """
+        Solve the tasks in a pool of `self.processes` worker processes, in chunks of
+        `self.chunksize` tasks, yielding the result of each task as soon as its
+        chunk has been solved. Each task gets a fresh copy of its solvers, so that
+        solvers that have already been set up (which cannot always be pickled) can
+        be used. The time limit is enforced here rather than in the workers, since
+        a worker cannot interrupt a solve that is running in compiled code: when a
+        chunk runs out of time, the pool is terminated and the other chunks that
+        were running are restarted in a new pool.
+        """
+        tasks = [
+            (
+                index,
+                {**sim_kwargs, "solver": _fresh_solver(sim_kwargs["solver"])},
+                (solve_args[0], _fresh_solver(solve_args[1])) + solve_args[2:],
+                solve_kwargs,
+                repeats,
+            )
+            for index, sim_kwargs, solve_args, solve_kwargs, repeats in tasks
+        ]
+        pending = deque(
+            tasks[start : start + self.chunksize]
+            for start in range(0, len(tasks), self.chunksize)
+        )
+        # chunks that have been sent to the pool: (chunk, result, start, deadline)
+        running = []
+        pool = mp.Pool(processes=self.processes)
+        try:
+            while pending or running:
+                # Only send as many chunks as there are workers, so that each chunk
+                # starts as soon as it is sent and its time limit can be checked
+                while pending and len(running) < self.processes:
+                    chunk = pending.popleft()
+                    result = pool.apply_async(_solve_tasks_isolated, (chunk,))
+                    start = time.monotonic()
+                    if self.timeout is None:
+                        deadline = float("inf")
+                    else:
+                        deadline = start + self.timeout * len(chunk)
+                    running.append((chunk, result, start, deadline))
+
+                # Wait (briefly, so that other chunks are not held up) for the chunk
+                # that runs out of time first
+                _, result, _, deadline = min(running, key=lambda entry: entry[3])
+                wait = min(deadline - time.monotonic(), 0.1)
+                try:
+                    result.get(max(wait, 0))
+                except Exception:
+                    # time out, or an error that is dealt with below
+                    pass
+
+                now = time.monotonic()
+                timed_out = False
+                for entry in list(running):
+                    chunk, result, start, deadline = entry
+                    if result.ready():
+                        running.remove(entry)
+                        try:
+                            chunk_results = result.get()
+                        except Exception as error:
+                            # e.g. the tasks or the results could not be pickled
+                            chunk_results = [
+                                (task[0], None, error, 0) for task in chunk
+                            ]
+                        yield from chunk_results
+                    elif now >= deadline:
+                        running.remove(entry)
+                        timed_out = True
+                        for task in chunk:
+                            error = TimeoutError(
+                                f"Simulation did not finish within {self.timeout} s"
+                            )
+                            yield task[0], None, error, now - start
+                if timed_out:
+                    # A worker cannot be stopped on its own, so stop them all and
+                    # restart the chunks that were still running
+                    pool.terminate()
+                    pool = mp.Pool(processes=self.processes)
+                    pending.extendleft(chunk for chunk, *_ in reversed(running))
+                    running = []
+        finally:
+            pool.terminate()
+
+    def _simulation_kwargs(self):
+        """
+        Return the keyword arguments of :class:`pybamm.Simulation` for each
+        combination of models, solvers, experiments etc.
+        """
         iter_func = product if self.permutations else zip
 
         # Instantiate items in INPUT_LIST based on the value of self.permutations
@@ -127,49 +343,32 @@ class BatchStudy:
                 inp_value = [None] * len(self.models)
             inp_values.append(inp_value)
 
-        for (
-            model,
-            experiment,
-            geometry,
-            parameter_value,
-            submesh_type,
-            var_pt,
-            spatial_method,
-            solver,
-            output_variable,
-            C_rate,
-        ) in iter_func(self.models.values(), *inp_values):
-            sim = pybamm.Simulation(
+        return [
+            {
+                "model": model,
+                "experiment": experiment,
+                "geometry": geometry,
+                "parameter_values": parameter_value,
+                "submesh_types": submesh_type,
+                "var_pts": var_pt,
+                "spatial_methods": spatial_method,
+                "solver": solver,
+                "output_variables": output_variable,
+                "C_rate": C_rate,
+            }
+            for (
                 model,
-                experiment=experiment,
-                geometry=geometry,
-                parameter_values=parameter_value,
-                submesh_types=submesh_type,
-                var_pts=var_pt,
-                spatial_methods=spatial_method,
-                solver=solver,
-                output_variables=output_variable,
-                C_rate=C_rate,
-            )
-            # Repeat to get average solve time and integration time
-            solve_time = 0
-            integration_time = 0
-            for _ in range(self.repeats):
-                sol = sim.solve(
-                    t_eval,
-                    solver,
-                    check_model,
-                    save_at_cycles,
-                    calc_esoh,
-                    starting_solution,
-                    initial_soc,
-                    **kwargs,
-                )
-                solve_time += sol.solve_time
-                integration_time += sol.integration_time
-            sim.solution.solve_time = solve_time / self.repeats
-            sim.solution.integration_time = integration_time / self.repeats
-            self.sims.append(sim)
+                experiment,
+                geometry,
+                parameter_value,
+                submesh_type,
+                var_pt,
+                spatial_method,
+                solver,
+                output_variable,
+                C_rate,
+            ) in iter_func(self.models.values(), *inp_values)
+        ]
 
     def plot(self, output_variables=None, **kwargs):
         """
@@ -205,3 +404,56 @@ class BatchStudy:
             duration=duration,
             output_filename=output_filename,
         )
+
+
+def _fresh_solver(solver):
+    """
+    Return a copy of `solver` without any set-up, which can be sent to a worker
+    process, or None if `solver` is None
+    """
+    if solver is None:
+        return None
+    return solver.copy()
+
+
+def _solve_task(task, isolated):
+    """
+    Create and solve the simulation of one combination of a batch study, repeating
+    the solve to get the average solve time and integration time. If `isolated`,
+    errors are returned instead of raised, and the simulation is returned pickled
+    (without the solver set-up, which cannot always be pickled), so that it can be
+    sent back from a worker process and errors when pickling it are caught too.
+    """
+    index, sim_kwargs, solve_args, solve_kwargs, repeats = task
+    timer = pybamm.Timer()
+    try:
+        sim = pybamm.Simulation(**sim_kwargs)
+        solve_time = 0
+        integration_time = 0
+        for _ in range(repeats):
+            sol = sim.solve(*solve_args, **solve_kwargs)
+            solve_time += sol.solve_time
+            integration_time += sol.integration_time
+        sim.solution.solve_time = solve_time / repeats
+        sim.solution.integration_time = integration_time / repeats
+        if isolated:
+            sim.solver.clear_set_up()
+            if isinstance(sim.solver, pybamm.CasadiSolver):
+                sim.solver.integrator_cache.clear()
+            sim = pickle.dumps(sim, pickle.HIGHEST_PROTOCOL)
+    except Exception as error:
+        if not isolated:
+            raise
+        # The traceback is lost when the error is sent back to the main process
+        error.formatted_traceback = traceback.format_exc()
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(repr(error))
+            error.formatted_traceback = traceback.format_exc()
+        return index, None, error, timer.time().value
+    return index, sim, None, timer.time().value
+
+
+def _solve_tasks_isolated(tasks):
+    return [_solve_task(task, True) for task in tasks]
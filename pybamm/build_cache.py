@@ -0,0 +1,356 @@
+#
+# On-disk cache of built models
+#
+import hashlib
+import inspect
+import marshal
+import numbers
+import os
+import pickle
+import time
+import types
+
+import numpy as np
+from scipy.sparse import issparse
+
+import pybamm
+
+
+class BuildCache:
+    """
+    A content-addressed cache of built (discretised) models, stored on disk so that
+    it can be shared between processes. Entries are keyed on the model (class, name
+    and options), parameter values, geometry, mesh, discretisation points, spatial
+    methods and PyBaMM version. Once a model has been solved, its entry also stores
+    the CasADi functions created by the solver set-up (rhs, algebraic, jacobians and
+    events), so that a simulation that loads the entry can skip straight to solving.
+
+    Only models converted to CasADi format are cached, as models in other formats
+    cannot be pickled.
+
+    Parameters
+    ----------
+    directory : str
+        The directory in which to store the cache. Created if it doesn't exist.
+    max_size : int, optional
+        The maximum total size of the cache, in bytes. When the cache gets larger
+        than this, the least recently used entries are removed. Default is None
+        (no limit).
+    max_age : float, optional
+        The maximum time, in seconds, since an entry was last used before it is
+        removed. Default is None (no limit).
+
+    Attributes
+    ----------
+    hits : int
+        The number of times an entry has been loaded from the cache
+    misses : int
+        The number of times an entry has been looked up but not found
+
+    Notes
+    -----
+    Models are identified by their class, name and options, not by their equations,
+    so a model whose equations are changed after it has been created should be given
+    a new name before being used with the cache. Functions (e.g. in parameter
+    values) are identified by their name, source code, default arguments, and the
+    values of the variables they close over and of the global variables they use.
+    """
+
+    extension = ".pkl"
+
+    def __init__(self, directory, max_size=None, max_age=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, *objects):
+        """
+        Return the key of the cache entry for a set of objects (e.g. a model and
+        the parameter values, mesh and spatial methods used to build it).
+        """
+        hasher = hashlib.sha256()
+        _update_fingerprint(hasher, (pybamm.__version__,) + objects)
+        return hasher.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def load(self, key):
+        """
+        Load an entry from the cache.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry (see :meth:`key`)
+
+        Returns
+        -------
+        dict or None
+            The entry, with keys "model" (the built model) and "set up" (the
+            signature of the solver set-up stored in the model, or None if the
+            model has not been set up), or None if there is no entry for `key`
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            # e.g. a truncated file or an entry from an incompatible version of a
+            # dependency: remove it so that it gets rebuilt
+            pybamm.logger.warning(
+                "Removing unreadable cache entry {}: {}".format(key, e)
+            )
+            self._remove(path)
+            self.misses += 1
+            return None
+        # Mark the entry as recently used
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def save(self, key, model, set_up=None):
+        """
+        Save a built model to the cache, then evict old entries.
+
+        Parameters
+        ----------
+        key : str
+            The key of the entry (see :meth:`key`)
+        model : :class:`pybamm.BaseModel`
+            The built model
+        set_up : str, optional
+            The signature of the solver set-up stored in the model, if the model
+            has been set up by a solver
+        """
+        if model.convert_to_format != "casadi":
+            pybamm.logger.info(
+                "Not caching model '{}' with format '{}'".format(
+                    model.name, model.convert_to_format
+                )
+            )
+            return
+        path = self._path(key)
+        # Write to a temporary file first so that other processes never read a
+        # partially written entry
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"model": model, "set up": set_up}, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.extension):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    # removed by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """
+        Remove the entries that are older than `max_age`, then the least recently
+        used entries until the cache is no larger than `max_size`.
+        """
+        entries = self._entries()
+        if self.max_age is not None:
+            now = time.time()
+            for mtime, _, path in entries:
+                if now - mtime > self.max_age:
+                    self._remove(path)
+            entries = [entry for entry in entries if now - entry[0] <= self.max_age]
+        if self.max_size is not None:
+            total_size = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total_size <= self.max_size:
+                    break
+                self._remove(path)
+                total_size -= size
+
+    def clear(self):
+        """Remove all the entries in the cache."""
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    @property
+    def size(self):
+        """The total size of the entries in the cache, in bytes"""
+        return sum(size for _, size, _ in self._entries())
+
+
+def _update_fingerprint(hasher, obj, _functions=(), _symbols=None):
+    """
+    Update `hasher` with a description of `obj` that is the same in every process
+    (unlike `hash`, which is randomised for strings).
+
+    `_functions` holds the functions whose fingerprint is being calculated, so that
+    recursive references (e.g. a function that calls itself) terminate.
+    `_symbols` maps the ids of the symbols that have already been fingerprinted to
+    their fingerprints, so that subtrees shared between expressions are only
+    traversed once.
+    """
+    update = hasher.update
+    if _symbols is None:
+        _symbols = {}
+
+    def update_item(item):
+        _update_fingerprint(hasher, item, _functions, _symbols)
+
+    if obj is None or isinstance(obj, (bool, numbers.Number, str, bytes)):
+        update("{}:{!r};".format(type(obj).__name__, obj).encode())
+    elif isinstance(obj, np.ndarray):
+        update("array{}{};".format(obj.dtype, obj.shape).encode())
+        update(np.ascontiguousarray(obj).tobytes())
+    elif issparse(obj):
+        obj = obj.tocsr()
+        update("sparse{};".format(obj.shape).encode())
+        for array in [obj.data, obj.indices, obj.indptr]:
+            update_item(array)
+    elif isinstance(obj, dict):
+        # Order-independent, as keys might not be sortable
+        item_fingerprints = []
+        for key, value in obj.items():
+            item_hasher = hashlib.sha256()
+            _update_fingerprint(item_hasher, (key, value), _functions, _symbols)
+            item_fingerprints.append(item_hasher.digest())
+        update("dict{};".format(type(obj).__name__).encode())
+        for item_fingerprint in sorted(item_fingerprints):
+            update(item_fingerprint)
+    elif isinstance(obj, (list, tuple)):
+        update("{}{};".format(type(obj).__name__, len(obj)).encode())
+        for item in obj:
+            update_item(item)
+    elif isinstance(obj, pybamm.Symbol):
+        update(_symbol_fingerprint(obj, _functions, _symbols))
+    elif isinstance(obj, pybamm.ParameterValues):
+        update_item(dict(obj._dict_items))
+    elif isinstance(obj, pybamm.BaseModel):
+        # custom models can share a name and options, so include their equations
+        update_item((type(obj), obj.name, getattr(obj, "options", None)))
+        for attr in [
+            "rhs",
+            "algebraic",
+            "initial_conditions",
+            "boundary_conditions",
+            "variables",
+        ]:
+            update_item((attr, dict(getattr(obj, attr))))
+        update_item(
+            (
+                "events",
+                [
+                    (event.name, event.expression, event.event_type.name)
+                    for event in obj.events
+                ],
+            )
+        )
+    elif isinstance(obj, type):
+        update("class:{}.{};".format(obj.__module__, obj.__qualname__).encode())
+    elif isinstance(obj, types.ModuleType):
+        update("module:{};".format(obj.__name__).encode())
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        # functions: identify by name and source code
+        update(
+            "function:{}.{};".format(
+                getattr(obj, "__module__", None), obj.__qualname__
+            ).encode()
+        )
+        code = getattr(obj, "__code__", None)
+        try:
+            update(inspect.getsource(obj).encode())
+        except (OSError, TypeError):
+            # no source code, e.g. functions created by exec
+            if isinstance(code, types.CodeType):
+                update(marshal.dumps(code))
+        # Python functions also depend on their default arguments, the variables
+        # they close over and the global variables they use, which the source code
+        # doesn't show
+        if isinstance(code, types.CodeType) and not any(
+            obj is function for function in _functions
+        ):
+            _functions = _functions + (obj,)
+            update_item(("defaults", obj.__defaults__, obj.__kwdefaults__))
+            cells = obj.__closure__ or ()
+            closure = []
+            for name, cell in zip(code.co_freevars, cells):
+                try:
+                    closure.append((name, cell.cell_contents))
+                except ValueError:
+                    # empty cell
+                    closure.append((name, None))
+            update_item(("closure", closure))
+            func_globals = getattr(obj, "__globals__", {})
+            update_item(
+                (
+                    "globals",
+                    {
+                        name: func_globals[name]
+                        for name in _global_names(code)
+                        if name in func_globals
+                    },
+                )
+            )
+    elif hasattr(obj, "__dict__"):
+        # e.g. mesh generators and spatial methods: identify by class and public
+        # attributes (private attributes are set during discretisation)
+        update_item(type(obj))
+        update_item({k: v for k, v in vars(obj).items() if not k.startswith("_")})
+    else:
+        update(repr(obj).encode())
+
+
+def _symbol_fingerprint(symbol, _functions, _symbols):
+    """
+    Fingerprint of an expression tree, calculated from the fingerprints of its
+    children (without recursion, as trees can be deep).
+    """
+    stack = [symbol]
+    while stack:
+        node = stack[-1]
+        if id(node) in _symbols:
+            stack.pop()
+            continue
+        children = [child for child in node.children if id(child) not in _symbols]
+        if children:
+            stack.extend(children)
+            continue
+        stack.pop()
+        hasher = hashlib.sha256()
+        items = [(type(node).__name__, node.name, node.domains, len(node.children))]
+        for attr in ["value", "entries", "x", "y", "interpolator", "function"]:
+            if hasattr(node, attr):
+                items.append((attr, getattr(node, attr)))
+        _update_fingerprint(hasher, items, _functions, _symbols)
+        for child in node.children:
+            hasher.update(_symbols[id(child)])
+        _symbols[id(node)] = hasher.digest()
+    return _symbols[id(symbol)]
+
+
+def _global_names(code):
+    """
+    Names that a code object (or the code objects nested in it, e.g. lambdas and
+    comprehensions) might look up in the global namespace.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_global_names(const))
+    return sorted(names)
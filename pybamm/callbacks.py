@@ -7,7 +7,10 @@
 #
 import pybamm
 import numpy as np
+import pandas as pd
+import importlib
 import inspect
+import os
 
 
 def setup_callbacks(callbacks):
@@ -241,3 +244,205 @@ class LoggingCallback(Callback):
             "Try reducing the current, shortening the time interval, or reducing the "
             "period.\n\n"
         )
+
+
+class SolutionWriter(Callback):
+    """
+    Callback that writes the solution of an experiment to a file while the
+    experiment is being solved, step by step, so that the full solution doesn't need
+    to be kept in memory. For each step, the times, the states (optional) and the
+    requested output variables are written, along with the cycle and step numbers.
+    The summary variables of each cycle are written at the end of the cycle.
+
+    Combine with `save_at_cycles` or `keep_in_memory=False` in
+    :meth:`pybamm.Simulation.solve` to reduce the memory used by long experiments.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file to write to. The file is overwritten at the start of
+        the experiment
+    variables : list of str, optional
+        The output variables to write at each time. Default is None (no variables)
+    to_format : str, optional
+        The format to write to. Options are:
+
+        - 'hdf5': one group per step (`cycle <i>/step <j>`), with datasets for the
+          times ("t"), states ("y") and variables, and a "summary variables" group
+          with one dataset per summary variable. Requires `h5py`
+        - 'parquet': one row per time, with columns for the cycle and step numbers,
+          times, states (as a list column) and variables. Requires `pyarrow`
+        - 'csv': one row per time, as for 'parquet'. Only 0D variables can be
+          written and `save_states` must be False
+
+        For 'parquet' and 'csv', the summary variables are written to a separate
+        file, with "_summary" added to the file name. If None (default), the format
+        is inferred from the extension of `filename`.
+    save_states : bool, optional
+        Whether to write the states ("y") of the model. Default is True.
+
+    **Extends:** :class:`pybamm.callbacks.Callback`
+    """
+
+    _extensions = {
+        ".h5": "hdf5",
+        ".hdf5": "hdf5",
+        ".parquet": "parquet",
+        ".csv": "csv",
+    }
+
+    def __init__(self, filename, variables=None, to_format=None, save_states=True):
+        if to_format is None:
+            extension = os.path.splitext(filename)[1]
+            try:
+                to_format = self._extensions[extension]
+            except KeyError:
+                raise ValueError(
+                    "Could not infer format from extension '{}', please provide "
+                    "'to_format'".format(extension)
+                )
+        if to_format == "hdf5":
+            self._check_installed("h5py")
+        elif to_format == "parquet":
+            self._check_installed("pyarrow")
+        elif to_format == "csv":
+            if save_states:
+                raise ValueError(
+                    "States can't be written to csv, set 'save_states=False'"
+                )
+        else:
+            raise ValueError("format '{}' not recognised".format(to_format))
+
+        self.filename = filename
+        self.variables = variables or []
+        self.to_format = to_format
+        self.save_states = save_states
+        root, extension = os.path.splitext(filename)
+        self.summary_filename = root + "_summary" + extension
+        self._file = None
+        self._summary_file = None
+
+    @staticmethod
+    def _check_installed(module):
+        if importlib.util.find_spec(module) is None:
+            raise ModuleNotFoundError(
+                "{} is required to write this format. Please install it with "
+                "`pip install {}`".format(module, module)
+            )
+
+    def on_experiment_start(self, logs):
+        self.close()
+        if self.to_format == "hdf5":
+            import h5py
+
+            self._file = h5py.File(self.filename, "w")
+        else:
+            # opened when the first rows are written, since the schema (parquet)
+            # and header (csv) depend on the data
+            for filename in [self.filename, self.summary_filename]:
+                if os.path.exists(filename):
+                    os.remove(filename)
+
+    def on_step_end(self, logs):
+        solution = logs["step solution"]
+        cycle_num = logs["cycle number"][0]
+        step_num = logs["step number"][0]
+        data = {name: solution[name].entries for name in self.variables}
+
+        if self.to_format == "hdf5":
+            group = self._file.create_group(
+                "cycle {}/step {}".format(cycle_num, step_num)
+            )
+            group.attrs["operating conditions"] = logs["step operating conditions"]
+            group.create_dataset("t", data=solution.t)
+            if self.save_states:
+                group.create_dataset("y", data=solution.y)
+            for name, entries in data.items():
+                group.create_dataset(name, data=entries)
+        else:
+            n_t = len(solution.t)
+            columns = {
+                "Cycle": np.full(n_t, cycle_num),
+                "Step": np.full(n_t, step_num),
+                "t": solution.t,
+            }
+            for name, entries in data.items():
+                if entries.ndim > 1:
+                    raise ValueError(
+                        "only 0D variables can be written to {}, but '{}' is "
+                        "{}D".format(self.to_format, name, entries.ndim - 1)
+                    )
+                columns[name] = entries
+            if self.save_states:
+                columns["y"] = list(np.asarray(solution.y).T)
+            self._file = self._write_rows(self._file, self.filename, columns)
+        self.flush()
+
+    def on_cycle_end(self, logs):
+        if "summary variables" not in logs:
+            return
+        cycle_num = logs["cycle number"][0]
+        summary_variables = {"Cycle number": cycle_num, **logs["summary variables"]}
+
+        if self.to_format == "hdf5":
+            group = self._file.require_group("summary variables")
+            for name, value in summary_variables.items():
+                if name in group:
+                    dataset = group[name]
+                    dataset.resize((dataset.shape[0] + 1,))
+                else:
+                    dataset = group.create_dataset(
+                        name, shape=(1,), maxshape=(None,), dtype=float
+                    )
+                dataset[-1] = value
+        else:
+            columns = {name: [value] for name, value in summary_variables.items()}
+            self._summary_file = self._write_rows(
+                self._summary_file, self.summary_filename, columns
+            )
+        self.flush()
+
+    def on_experiment_end(self, logs):
+        self.close()
+
+    def on_experiment_infeasible(self, logs):
+        self.flush()
+
+    def on_experiment_error(self, logs):
+        self.flush()
+
+    def _write_rows(self, writer, filename, columns):
+        """
+        Append rows to a parquet or csv file, creating the writer if it doesn't
+        exist yet, and return the writer.
+        """
+        if self.to_format == "parquet":
+            import pyarrow
+            import pyarrow.parquet
+
+            table = pyarrow.table(columns)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(filename, table.schema)
+            writer.write_table(table)
+        else:
+            if writer is None:
+                writer = open(filename, "w", newline="")
+                header = True
+            else:
+                header = False
+            pd.DataFrame(columns).to_csv(writer, header=header, index=False)
+        return writer
+
+    def flush(self):
+        """Write any buffered data to disk."""
+        for f in [self._file, self._summary_file]:
+            if f is not None and hasattr(f, "flush"):
+                f.flush()
+
+    def close(self):
+        """Close the files."""
+        for f in [self._file, self._summary_file]:
+            if f is not None:
+                f.close()
+        self._file = None
+        self._summary_file = None
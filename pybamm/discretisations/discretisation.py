@@ -94,7 +94,13 @@ class Discretisation(object):
         # reset discretised_symbols
         self._discretised_symbols = {}
 
-    def process_model(self, model, inplace=True, check_model=True):
+    def process_model(
+        self,
+        model,
+        inplace=True,
+        check_model=True,
+        eliminate_common_subexpressions=False,
+    ):
         """Discretise a model.
         Currently inplace, could be changed to return a new model.
 
@@ -112,6 +118,12 @@ class Discretisation(object):
             option to False. When developing, testing or debugging it is recommened
             to leave this option as True as it may help to identify any errors.
             Default is True.
+        eliminate_common_subexpressions : bool, optional
+            If True, equal subexpressions in the discretised model are replaced by a
+            single shared node (see :class:`pybamm.CommonSubexpressionEliminator`),
+            so that they are only processed once by code that walks the trees node by
+            node. The python evaluator and the conversion to CasADi already do this,
+            so this is not needed for the default solvers. Default is False.
 
         Returns
         -------
@@ -246,12 +258,18 @@ class Discretisation(object):
             new_length_scales[domain] = new_scale
         model_disc._length_scales = new_length_scales
 
+        if eliminate_common_subexpressions:
+            pybamm.CommonSubexpressionEliminator().process_model(model_disc)
+
         # Check that resulting model makes sense
         if check_model:
             pybamm.logger.verbose("Performing model checks for {}".format(model.name))
             self.check_model(model_disc)
 
         pybamm.logger.info("Finish discretising {}".format(model.name))
+        pybamm.logger.debug(
+            "Operator matrix cache: {}".format(pybamm.operator_matrix_cache.stats)
+        )
 
         # Record that the model has been discretised
         model_disc.is_discretised = True
@@ -0,0 +1,206 @@
+#
+# Policies deciding which points of each experiment step are stored
+#
+import casadi
+import numpy as np
+import pybamm
+
+
+class BaseOutputPolicy:
+    """
+    Base class for output policies, which decide at which times the solution of each
+    step of an experiment is stored (see :meth:`pybamm.Simulation.solve`).
+
+    The solver is asked for `get_npts` equally spaced points in the step, and the
+    step solution is then passed to `decimate`, which may drop some of them. The
+    first and last point of the step (e.g. the event that ended the step) are
+    always kept, so step boundaries and events are exact.
+    """
+
+    def get_npts(self, dt, period):
+        """
+        Return the number of points to ask the solver for.
+
+        Parameters
+        ----------
+        dt : float
+            The duration of the step, in seconds
+        period : float
+            The period of the step, in seconds
+        """
+        # Make sure we take at least 2 timesteps
+        return max(int(round(dt / period)) + 1, 2)
+
+    def decimate(self, solution):
+        """
+        Return the solution of a step with only the points that should be stored.
+
+        Parameters
+        ----------
+        solution : :class:`pybamm.Solution`
+            The solution of the step
+        """
+        return solution
+
+    def _select_points(self, solution, keep):
+        """
+        Return a copy of `solution` with only the points where `keep` is True,
+        together with its first and last point. Sub-solutions (e.g. the global steps
+        of the solver) without any of these points are dropped.
+        """
+        keep = keep.copy()
+        keep[[0, -1]] = True
+        if np.all(keep):
+            return solution
+        all_ts = []
+        all_ys = []
+        all_models = []
+        all_inputs = []
+        idx = 0
+        for ts, ys, model, inputs in zip(
+            solution.all_ts, solution.all_ys, solution.all_models, solution.all_inputs
+        ):
+            keep_sub = keep[idx : idx + len(ts)]
+            idx += len(ts)
+            if not np.any(keep_sub):
+                continue
+            if not np.all(keep_sub):
+                if isinstance(ys, casadi.DM):
+                    ys = ys.full()
+                ts = ts[keep_sub]
+                ys = ys[:, keep_sub]
+            all_ts.append(ts)
+            all_ys.append(ys)
+            all_models.append(model)
+            all_inputs.append(inputs)
+
+        new_solution = pybamm.Solution(
+            all_ts,
+            all_ys,
+            all_models,
+            all_inputs,
+            solution.t_event,
+            solution.y_event,
+            solution.termination,
+            check_solution=False,
+            output_variables=solution.output_variables,
+        )
+        new_solution.closest_event_idx = solution.closest_event_idx
+        for attr in ["set_up_time", "solve_time", "integration_time"]:
+            setattr(new_solution, attr, getattr(solution, attr))
+        if hasattr(solution, "root_iterations"):
+            new_solution.root_iterations = solution.root_iterations
+        return new_solution
+
+
+class FixedPeriodOutput(BaseOutputPolicy):
+    """
+    Store the solution at every period of the step. This is the default.
+    """
+
+
+class AdaptiveOutput(BaseOutputPolicy):
+    """
+    Solve each step at every period, but only store the points needed to
+    reconstruct the chosen variables by linear interpolation between the stored
+    points, e.g. to store few points during long rests.
+
+    A point is dropped if, for all of the variables, the linear interpolation
+    between the stored points on either side of it differs from its value by at
+    most `atol + rtol * abs(value)` (at every point in space, for spatially-varying
+    variables). The first two points of each step are always stored, since the
+    first one is replaced by the end of the previous step when the steps are
+    added together. Points are chosen greedily: each stored point is followed by as many
+    dropped points as possible, checking all of them at once by keeping track of the
+    range of slopes of the lines from the stored point that pass within the
+    tolerance of each of them.
+
+    Parameters
+    ----------
+    variables : list of str
+        The variables that must be reconstructed from the stored points, e.g.
+        ["Terminal voltage [V]"]
+    rtol : float, optional
+        The relative interpolation error above which a point is stored. Default is
+        1e-3.
+    atol : float, optional
+        The absolute interpolation error above which a point is stored. Default is
+        1e-6.
+    max_period : float, optional
+        If given, a point is also stored whenever at least `max_period` seconds have
+        passed since the last stored point. Default is None.
+    """
+
+    def __init__(self, variables, rtol=1e-3, atol=1e-6, max_period=None):
+        if isinstance(variables, str):
+            variables = [variables]
+        self.variables = variables
+        self.rtol = rtol
+        self.atol = atol
+        self.max_period = max_period
+
+    def decimate(self, solution):
+        if solution.sensitivities:
+            # the sensitivities are stored for every point of the step
+            return solution
+        t = solution.t * solution.timescale_eval
+        # one row per variable (and point in space), one column per time point
+        values = np.vstack(
+            [
+                np.reshape(solution[name].entries, (-1, len(t)))
+                for name in self.variables
+            ]
+        )
+        tols = self.atol + self.rtol * np.abs(values)
+
+        keep = np.zeros(len(t), dtype=bool)
+        # The first point of a step repeats the last point of the previous step and
+        # is dropped when the steps are added together (see `Solution.__add__`), so
+        # the stored solution is interpolated from the previous step's value, which
+        # may differ (e.g. the voltage jumps when the current changes). Also store
+        # the second point, so that the start of the step is within the tolerance
+        keep[:2] = True
+        last = min(1, len(t) - 1)
+        # range of the slopes of the lines from the last stored point that pass
+        # within the tolerance of all the points dropped since then
+        min_slope = np.full(values.shape[0], -np.inf)
+        max_slope = np.full(values.shape[0], np.inf)
+        for i in range(last + 1, len(t)):
+            dt = t[i] - t[last]
+            if i - last > 1 and dt > 0:
+                slope = (values[:, i] - values[:, last]) / dt
+                if np.any(slope < min_slope) or np.any(slope > max_slope):
+                    # the points since the last stored point cannot all be dropped
+                    # if this point is stored next, so store the previous point
+                    last = i - 1
+                    keep[last] = True
+                    min_slope[:] = -np.inf
+                    max_slope[:] = np.inf
+                    dt = t[i] - t[last]
+            if dt == 0:
+                # e.g. a discontinuity at the start of a sub-solution
+                store = np.any(np.abs(values[:, i] - values[:, last]) > tols[:, i])
+            else:
+                store = self.max_period is not None and dt >= self.max_period
+            if store:
+                last = i
+                keep[last] = True
+                min_slope[:] = -np.inf
+                max_slope[:] = np.inf
+            elif dt > 0:
+                # lines that can replace this point must pass within its tolerance
+                diff = values[:, i] - values[:, last]
+                min_slope = np.maximum(min_slope, (diff - tols[:, i]) / dt)
+                max_slope = np.minimum(max_slope, (diff + tols[:, i]) / dt)
+        return self._select_points(solution, keep)
+
+
+class StepEndpointsOutput(BaseOutputPolicy):
+    """
+    Only store the start and end of each step (and the event that ended the step,
+    if any). The solver is only asked for these points, so the step is integrated
+    without intermediate outputs.
+    """
+
+    def get_npts(self, dt, period):
+        return 2
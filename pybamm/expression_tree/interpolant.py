@@ -9,14 +9,18 @@ import pybamm
 
 class Interpolant(pybamm.Function):
     """
-    Interpolate data in 1D.
+    Interpolate data in 1D, or on a regular grid in N dimensions.
 
     Parameters
     ----------
     x : iterable of :class:`numpy.ndarray`
-        1-D array(s) of real values defining the data point coordinates.
+        1-D array(s) of real values defining the data point coordinates. If there is
+        more than one array, the data points are the regular grid of all their
+        combinations.
     y : :class:`numpy.ndarray`
-        The values of the function to interpolate at the data points.
+        The values of the function to interpolate at the data points. If there is
+        more than one array in x, y must have one dimension per array, with
+        `y[i, j, ...]` the value at `(x[0][i], x[1][j], ...)`.
     children : iterable of :class:`pybamm.Symbol`
         Node(s) to use when evaluating the interpolant. Each child corresponds to an
         entry of x
@@ -24,10 +28,16 @@ class Interpolant(pybamm.Function):
         Name of the interpolant. Default is None, in which case the name "interpolating
         function" is given.
     interpolator : str, optional
-        Which interpolator to use ("linear", "pchip", or "cubic spline").
+        Which interpolator to use ("linear", "pchip", or "cubic spline"). Only
+        "linear" is available if there is more than one array in x.
     extrapolate : bool, optional
         Whether to extrapolate for points that are outside of the parametrisation
         range, or return NaN (following default behaviour from scipy). Default is True.
+    derivative_dimension : int, optional
+        If not None, the interpolant evaluates the partial derivative of the
+        interpolated function with respect to `x[derivative_dimension]` (only for
+        more than one array in x). Used to differentiate multi-dimensional
+        interpolants. Default is None.
 
     **Extends**: :class:`pybamm.Function`
     """
@@ -41,43 +51,39 @@ class Interpolant(pybamm.Function):
         interpolator=None,
         extrapolate=True,
         entries_string=None,
+        derivative_dimension=None,
     ):
-
-        # set default dimension value
-        self.dimension = 1
-
-        if isinstance(x, (tuple, list)) and len(x) == 2:
+        if isinstance(x, (tuple, list)) and len(x) > 1:
             interpolator = interpolator or "linear"
             if interpolator != "linear":
                 raise ValueError(
-                    "interpolator should be 'linear' if x is two-dimensional"
+                    "interpolator should be 'linear' if x is multi-dimensional"
+                )
+            if y.ndim != len(x):
+                raise ValueError(
+                    "y should be {0}-dimensional if len(x)={0}".format(len(x))
                 )
-            x1, x2 = x
-            if y.ndim != 2:
-                raise ValueError("y should be two-dimensional if len(x)=2")
         else:
             interpolator = interpolator or "cubic spline"
-            if isinstance(x, (tuple, list)):
-                x1 = x[0]
-            else:
-                x1 = x
+            if not isinstance(x, (tuple, list)):
                 x = [x]
-            x2 = None
+            if derivative_dimension is not None:
+                raise ValueError(
+                    "derivative_dimension can only be given if x is multi-dimensional"
+                )
 
-        if x1.shape[0] != y.shape[0]:
-            raise ValueError(
-                "len(x1) should equal y=shape[0], "
-                "but x1.shape={} and y.shape={}".format(x1.shape, y.shape)
-            )
-        if x2 is not None and x2.shape[0] != y.shape[1]:
-            raise ValueError(
-                "len(x2) should equal y=shape[1], "
-                "but x2.shape={} and y.shape={}".format(x2.shape, y.shape)
-            )
+        for i, x_i in enumerate(x):
+            if x_i.shape[0] != y.shape[i]:
+                raise ValueError(
+                    "len(x{0}) should equal y=shape[{1}], "
+                    "but x{0}.shape={2} and y.shape={3}".format(
+                        i + 1, i, x_i.shape, y.shape
+                    )
+                )
         if isinstance(children, pybamm.Symbol):
             children = [children]
         # Either a single x is provided and there is one child
-        # or x is a 2-tuple and there are two children
+        # or x is a tuple and there is one child per entry of x
         if len(x) != len(children):
             raise ValueError("len(x) should equal len(children)")
         # if there is only one x, y can be 2-dimensional but the child must have
@@ -87,29 +93,27 @@ class Interpolant(pybamm.Function):
                 "child should have size 1 if y is two-dimensional and len(x)==1"
             )
 
-        if interpolator == "linear":
-            if len(x) == 1:
-                self.dimension = 1
-                if extrapolate is False:
-                    interpolating_function = interpolate.interp1d(
-                        x1, y.T, bounds_error=False, fill_value=np.nan
-                    )
-                elif extrapolate is True:
-                    interpolating_function = interpolate.interp1d(
-                        x1, y.T, bounds_error=False, fill_value="extrapolate"
-                    )
-            elif len(x) == 2:
-                self.dimension = 2
-                interpolating_function = interpolate.interp2d(x1, x2, y)
-            else:
-                raise ValueError("Invalid dimension of x: {0}".format(len(x)))
+        self.dimension = len(x)
+        if self.dimension > 1:
+            interpolating_function = RegularGridInterpolant(
+                x, y, extrapolate, derivative_dimension
+            )
+        elif interpolator == "linear":
+            if extrapolate is False:
+                interpolating_function = interpolate.interp1d(
+                    x[0], y.T, bounds_error=False, fill_value=np.nan
+                )
+            elif extrapolate is True:
+                interpolating_function = interpolate.interp1d(
+                    x[0], y.T, bounds_error=False, fill_value="extrapolate"
+                )
         elif interpolator == "pchip":
             interpolating_function = interpolate.PchipInterpolator(
-                x1, y, extrapolate=extrapolate
+                x[0], y, extrapolate=extrapolate
             )
         elif interpolator == "cubic spline":
             interpolating_function = interpolate.CubicSpline(
-                x1, y, extrapolate=extrapolate
+                x[0], y, extrapolate=extrapolate
             )
         else:
             raise ValueError("interpolator '{}' not recognised".format(interpolator))
@@ -119,6 +123,7 @@ class Interpolant(pybamm.Function):
         self.x = x
         self.y = y
         self.entries_string = entries_string
+        self.derivative_dimension = derivative_dimension
         super().__init__(
             interpolating_function, *children, name=name, derivative="derivative"
         )
@@ -146,11 +151,31 @@ class Interpolant(pybamm.Function):
     def set_id(self):
         """See :meth:`pybamm.Symbol.set_id()`."""
         self._id = hash(
-            (self.__class__, self.name, self.entries_string)
+            (self.__class__, self.name, self.entries_string, self.derivative_dimension)
             + tuple([child.id for child in self.children])
             + tuple(self.domain)
         )
 
+    def _function_diff(self, children, idx):
+        """See :meth:`Function._function_diff()`"""
+        if self.dimension == 1:
+            return super()._function_diff(children, idx)
+        if self.derivative_dimension is not None:
+            raise NotImplementedError(
+                "Second derivatives of multi-dimensional interpolants are not "
+                "implemented"
+            )
+        return pybamm.Interpolant(
+            self.x,
+            self.y,
+            children,
+            name="d({})/dx{}".format(self.name, idx + 1),
+            interpolator=self.interpolator,
+            extrapolate=self.extrapolate,
+            entries_string=self.entries_string,
+            derivative_dimension=idx,
+        )
+
     def _function_new_copy(self, children):
         """See :meth:`Function._function_new_copy()`"""
         return pybamm.Interpolant(
@@ -161,23 +186,83 @@ class Interpolant(pybamm.Function):
             interpolator=self.interpolator,
             extrapolate=self.extrapolate,
             entries_string=self.entries_string,
+            derivative_dimension=self.derivative_dimension,
         )
 
     def _function_evaluate(self, evaluated_children):
-        children_eval_flat = []
-        for child in evaluated_children:
-            if isinstance(child, np.ndarray):
-                children_eval_flat.append(child.flatten())
-            else:
-                children_eval_flat.append(child)
         if self.dimension == 1:
+            children_eval_flat = []
+            for child in evaluated_children:
+                if isinstance(child, np.ndarray):
+                    children_eval_flat.append(child.flatten())
+                else:
+                    children_eval_flat.append(child)
             return self.function(*children_eval_flat).flatten()[:, np.newaxis]
-        elif self.dimension == 2:
-            res = self.function(*children_eval_flat)
-            if res.ndim > 1:
-                return np.diagonal(res)[:, np.newaxis]
+        else:
+            return np.reshape(self.function(*evaluated_children), (-1, 1))
+
+
+class RegularGridInterpolant:
+    """
+    Linear interpolant of data on a regular grid in N dimensions, using
+    :class:`scipy.interpolate.RegularGridInterpolator`, called with one array of
+    coordinates per dimension (like the functions of other interpolants). The
+    coordinates are broadcast against each other, and the values have the broadcast
+    shape.
+
+    Parameters
+    ----------
+    x : iterable of :class:`numpy.ndarray`
+        1-D arrays of the coordinates of the grid in each dimension
+    y : :class:`numpy.ndarray`
+        The values on the grid, with one dimension per array in x
+    extrapolate : bool, optional
+        Whether to extrapolate linearly outside of the grid, or return NaN. Default
+        is True.
+    derivative_dimension : int, optional
+        If not None, evaluate the partial derivative of the interpolant with respect
+        to the coordinate in this dimension instead. Default is None.
+    """
+
+    def __init__(self, x, y, extrapolate=True, derivative_dimension=None):
+        self.x = x
+        self.extrapolate = extrapolate
+        self.derivative_dimension = derivative_dimension
+        self.interpolator = interpolate.RegularGridInterpolator(
+            x,
+            y,
+            method="linear",
+            bounds_error=False,
+            fill_value=None if extrapolate else np.nan,
+        )
+
+    def __call__(self, *children):
+        children = np.broadcast_arrays(
+            *[np.asarray(child, dtype=float) for child in children]
+        )
+        points = np.stack([child.ravel() for child in children], axis=-1)
+        if self.derivative_dimension is None:
+            values = self.interpolator(points)
+        else:
+            # The interpolant is linear in each dimension within a grid cell, so its
+            # partial derivative is the slope across the cell that contains the point
+            # (the first or last cell when extrapolating)
+            k = self.derivative_dimension
+            x_k = self.x[k]
+            points_k = points[:, k]
+            idx = np.clip(
+                np.searchsorted(x_k, points_k, side="right") - 1, 0, len(x_k) - 2
+            )
+            left = points.copy()
+            left[:, k] = x_k[idx]
+            right = points.copy()
+            right[:, k] = x_k[idx + 1]
+            values = (self.interpolator(right) - self.interpolator(left)) / (
+                x_k[idx + 1] - x_k[idx]
+            )
+            if self.extrapolate:
+                outside = np.isnan(points_k)
             else:
-                # raise ValueError("Invalid children dimension: {0}".format(res.ndim))
-                return res[:, np.newaxis]
-        else:  # pragma: no cover
-            raise ValueError("Invalid dimension: {0}".format(self.dimension))
+                outside = ~((x_k[0] <= points_k) & (points_k <= x_k[-1]))
+            values[outside] = np.nan
+        return values.reshape(children[0].shape)
@@ -152,18 +152,26 @@ class CasadiConverter(object):
                     return casadi.interpolant(
                         "LUT", solver, symbol.x, symbol.y.flatten()
                     )(*converted_children)
-                elif len(converted_children) == 2:
+                else:
+                    # Regular grid lookup table, with the first dimension varying
+                    # fastest in the flattened values
                     LUT = casadi.interpolant(
                         "LUT", solver, symbol.x, symbol.y.ravel(order="F")
                     )
-                    res = LUT(casadi.hcat(converted_children).T).T
-                    return res
-                else:  # pragma: no cover
-                    raise ValueError(
-                        "Invalid converted_children count: {0}".format(
-                            len(converted_children)
+                    if symbol.derivative_dimension is not None:
+                        x = casadi.MX.sym("x", len(converted_children))
+                        jac = casadi.jacobian(LUT(x), x)
+                        LUT = casadi.Function(
+                            "LUT_jac", [x], [jac[0, symbol.derivative_dimension]]
                         )
-                    )
+                    # Broadcast scalar children, then evaluate the lookup table at
+                    # each point (one column per point)
+                    size = max(child.shape[0] for child in converted_children)
+                    converted_children = [
+                        casadi.repmat(child, size, 1) if child.shape[0] == 1 else child
+                        for child in converted_children
+                    ]
+                    return LUT(casadi.hcat(converted_children).T).T
 
             elif symbol.function.__name__.startswith("elementwise_grad_of_"):
                 differentiating_child_idx = int(symbol.function.__name__[-1])
@@ -0,0 +1,186 @@
+#
+# Eliminate common subexpressions in an expression tree
+#
+import copy
+
+import pybamm
+
+
+class CommonSubexpressionEliminator(object):
+    """
+    Helper class to rewrite expression trees so that equal subtrees (i.e. subtrees
+    with the same id) are represented by a single shared node. The expression trees
+    become directed acyclic graphs, so that each distinct subexpression only needs to
+    be processed once by code that walks the trees node by node. Note that the
+    python evaluator and the conversion to CasADi already process equal subtrees
+    once (they identify subtrees by id), so this pass does not save evaluations
+    there.
+
+    The ids, and hence the values, of the processed symbols are the same as those of
+    the original symbols, and the original symbols are not modified.
+
+    Parameters
+    ----------
+    processed_symbols: dict {int -> :class:`pybamm.Symbol`}, optional
+        cached shared symbols, keyed by id
+
+    Attributes
+    ----------
+    n_nodes : int
+        The number of nodes in the processed trees, counting each node as many times
+        as it appears
+    n_unique_nodes : int
+        The number of distinct nodes in the processed trees
+    """
+
+    def __init__(self, processed_symbols=None):
+        self._processed_symbols = processed_symbols or {}
+        self._tree_sizes = {}
+        self._counted = set()
+        self.n_nodes = 0
+        self.n_unique_nodes = 0
+
+    @property
+    def n_duplicate_nodes(self):
+        """
+        The number of tree nodes that are replaced by shared nodes. This is not the
+        number of evaluations saved, which depends on how the trees are evaluated.
+        """
+        return self.n_nodes - self.n_unique_nodes
+
+    def process_model(self, model):
+        """
+        Eliminate common subexpressions in the equations, variables and events of a
+        discretised model, in place. Subexpressions are shared between all the
+        expressions of the model.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model to process
+
+        Returns
+        -------
+        :class:`pybamm.BaseModel`
+            The processed model (the same object as `model`)
+        """
+        pybamm.logger.verbose(
+            "Eliminate common subexpressions in {}".format(model.name)
+        )
+        # Only the values are processed: the keys of rhs, algebraic and initial
+        # conditions are the original (undiscretised) variables
+        model.rhs = self.process_dict(model.rhs)
+        model.algebraic = self.process_dict(model.algebraic)
+        model.initial_conditions = self.process_dict(model.initial_conditions)
+        for attr in [
+            "concatenated_rhs",
+            "concatenated_algebraic",
+            "concatenated_initial_conditions",
+        ]:
+            symbol = getattr(model, attr)
+            if isinstance(symbol, pybamm.Symbol):
+                setattr(model, attr, self.process_symbol(symbol))
+        model.variables = self.process_dict(model.variables)
+        model.events = [
+            pybamm.Event(
+                event.name, self.process_symbol(event.expression), event.event_type
+            )
+            for event in model.events
+        ]
+
+        pybamm.logger.info(
+            "Shared {} duplicate nodes of {} tree nodes in {}".format(
+                self.n_duplicate_nodes, self.n_nodes, model.name
+            )
+        )
+        return model
+
+    def process_dict(self, var_eqn_dict):
+        """
+        Eliminate common subexpressions in the values of a dictionary.
+
+        Parameters
+        ----------
+        var_eqn_dict : dict
+            Equations ({variable: equation} dict) to process
+
+        Returns
+        -------
+        dict
+            The processed equations, with the same keys
+        """
+        return {
+            key: self.process_symbol(value) for key, value in var_eqn_dict.items()
+        }
+
+    def process_symbol(self, symbol):
+        """
+        Eliminate common subexpressions in an expression tree. Subexpressions are also
+        shared with the symbols processed previously by this object.
+
+        Parameters
+        ----------
+        symbol : :class:`pybamm.Symbol`
+            The expression tree to process
+
+        Returns
+        -------
+        :class:`pybamm.Symbol`
+            Expression tree with the same id as `symbol`, in which equal subtrees are
+            the same object
+        """
+        new_symbol = self._share(symbol)
+        self.n_nodes += self._tree_size(new_symbol)
+        self._count_unique(new_symbol)
+        return new_symbol
+
+    def _share(self, symbol):
+        """
+        Return the shared node with the same id as `symbol`, creating it from
+        `symbol` if there is none yet.
+        """
+        try:
+            return self._processed_symbols[symbol.id]
+        except KeyError:
+            pass
+
+        children = symbol.children
+        new_children = [self._share(child) for child in children]
+        if all(new is old for new, old in zip(new_children, children)):
+            new_symbol = symbol
+        else:
+            # Copy the node with the shared children. Its id is unchanged since the
+            # children have the same ids. A shallow copy is used (rather than
+            # `new_copy`, which can simplify the expression and change its id), and
+            # the attributes pointing to the old children (e.g. `left` and `right`)
+            # are updated
+            new_symbol = copy.copy(symbol)
+            replacements = {id(old): new for old, new in zip(children, new_children)}
+            for attr, value in vars(new_symbol).items():
+                if id(value) in replacements:
+                    setattr(new_symbol, attr, replacements[id(value)])
+            new_symbol._children = new_children
+            new_symbol._orphans = new_children
+            new_symbol._saved_evaluates_on_edges = {}
+
+        self._processed_symbols[symbol.id] = new_symbol
+        return new_symbol
+
+    def _tree_size(self, symbol):
+        """Number of nodes in the tree, counting shared nodes as many times as they
+        appear"""
+        try:
+            return self._tree_sizes[symbol.id]
+        except KeyError:
+            size = 1 + sum(self._tree_size(child) for child in symbol.children)
+            self._tree_sizes[symbol.id] = size
+            return size
+
+    def _count_unique(self, symbol):
+        """Count the nodes of the tree that haven't been counted yet"""
+        if symbol.id in self._counted:
+            return
+        self._counted.add(symbol.id)
+        self.n_unique_nodes += 1
+        for child in symbol.children:
+            self._count_unique(child)
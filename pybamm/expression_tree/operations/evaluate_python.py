@@ -130,6 +130,28 @@ def is_scalar(arg):
         return np.all(np.array(arg.shape) == 1)
 
 
+def concatenate_columns(*arrays):
+    """
+    Concatenate column vectors (or matrices whose columns are evaluations at different
+    times), broadcasting those with a single column (e.g. constants) to the number of
+    columns of the others.
+    """
+    n_columns = max(np.shape(array)[1] for array in arrays)
+    return np.concatenate(
+        [np.broadcast_to(array, (np.shape(array)[0], n_columns)) for array in arrays]
+    )
+
+
+def reduce_columns(function, array):
+    """
+    Apply a reduction (e.g. `np.max`) to each column of `array` separately, if it
+    has several columns (i.e. evaluations at different times).
+    """
+    if np.ndim(array) == 2 and array.shape[1] > 1:
+        return function(array, axis=0, keepdims=True)
+    return function(array)
+
+
 def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
     """
     This function converts an expression tree to a dictionary of node id's and strings
@@ -301,6 +323,10 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
         if isinstance(symbol.function, np.ufunc):
             # write any numpy functions directly
             symbol_str = "np.{}({})".format(symbol.function.__name__, children_str)
+        elif isinstance(symbol, (pybamm.Max, pybamm.Min)) and not output_jax:
+            symbol_str = "reduce_columns(np.{}, {})".format(
+                symbol.function.__name__, children_str
+            )
         else:
             # unknown function, store it as a constant and call this in the
             # generated code
@@ -309,13 +335,24 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
             symbol_str = "{}({})".format(funct_var, children_str)
 
     elif isinstance(symbol, pybamm.Concatenation):
+        # When evaluating at several times (y with several columns), children that
+        # don't depend on t or y only have one column, and must be broadcast
+        if not output_jax and any(
+            not child.has_symbol_of_classes(
+                (pybamm.StateVector, pybamm.StateVectorDot, pybamm.Time)
+            )
+            for child in symbol.children
+        ):
+            concatenate = "concatenate_columns({})"
+        else:
+            concatenate = "np.concatenate(({}))"
 
         # no need to concatenate if there is only a single child
         if isinstance(symbol, pybamm.NumpyConcatenation):
             if len(children_vars) == 1:
                 symbol_str = children_vars[0]
             else:
-                symbol_str = "np.concatenate(({}))".format(",".join(children_vars))
+                symbol_str = concatenate.format(",".join(children_vars))
 
         elif isinstance(symbol, pybamm.SparseStack):
             if len(children_vars) == 1:
@@ -347,7 +384,7 @@ def find_symbols(symbol, constant_symbols, variable_symbols, output_jax=False):
                     [v for _, v in sorted(zip(slice_starts, child_vectors))]
                 )
             if len(children_vars) > 1 or symbol.secondary_dimensions_npts > 1:
-                symbol_str = "np.concatenate(({}))".format(",".join(all_child_vectors))
+                symbol_str = concatenate.format(",".join(all_child_vectors))
             else:
                 symbol_str = "{}".format(",".join(children_vars))
         else:
@@ -438,6 +475,10 @@ class EvaluatorPython:
     Converts a pybamm expression tree into pure python code that will calculate the
     result of calling `evaluate(t, y)` on the given expression tree.
 
+    The generated function can evaluate the expression at several states at once: if
+    `y` has shape (n_states, n_times) and `t` is a vector of length n_times (or a
+    scalar), the result has one column per state.
+
     Parameters
     ----------
 
@@ -494,9 +535,13 @@ class EvaluatorPython:
         """
         evaluate function
         """
-        # generated code assumes y is a column vector
+        # generated code assumes y is a column vector, or a matrix with one column
+        # per time
         if y is not None and y.ndim == 1:
             y = y.reshape(-1, 1)
+        # a vector of times is a row, so that it broadcasts against the columns of y
+        if isinstance(t, np.ndarray) and t.size > 1:
+            t = t.reshape(1, -1)
 
         result = self._evaluate(self._constants, t, y, inputs)
 
@@ -520,6 +565,347 @@ class EvaluatorPython:
         exec(compiled_function)
 
 
+class EvaluatorPythonSparseJacobian:
+    """
+    Evaluates a Jacobian expression tree (as created by :class:`pybamm.Jacobian`),
+    computing only its structurally non-zero entries.
+
+    The sparsity pattern of the Jacobian is found once, from the structure of the
+    constant matrices in the tree and of the operations combining them (sums,
+    products with vectors, matrix products, stacks and row indexing). Each call then
+    evaluates the vectors that scale these matrices with a single
+    :class:`pybamm.EvaluatorPython`, and combines them into the non-zero values of
+    the Jacobian with fixed index arrays. The result is a `csr_matrix` with the
+    same structure at every call. If the tree contains operations on matrices that
+    are not supported, the Jacobian is evaluated with
+    :class:`pybamm.EvaluatorPython` instead (and converted to `csr_matrix`).
+
+    Parameters
+    ----------
+    jacobian : :class:`pybamm.Symbol`
+        The Jacobian to evaluate
+    """
+
+    def __init__(self, jacobian):
+        self._shape = _shape(jacobian)
+        # Data arrays of the matrices, and operations computing them
+        self._slots = []
+        self._operations = []
+        # Values of the (vector or scalar) symbols scaling the matrices. Constant
+        # values are computed once, the others at each call
+        self._values = []
+        self._leaves = []
+        self._leaf_values = []
+        # Identical sub-trees are only processed once
+        self._processed_matrices = {}
+        self._processed_values = {}
+        try:
+            pattern, self._result = self._matrix(jacobian)
+        except NotImplementedError as e:
+            pybamm.logger.debug(
+                "Evaluating Jacobian without sparse structure ({})".format(e)
+            )
+            self._fallback = EvaluatorPython(jacobian)
+            return
+        self._fallback = None
+        del self._processed_matrices, self._processed_values
+        self._indices = pattern.indices
+        self._indptr = pattern.indptr
+        if self._leaves:
+            self._leaves_evaluator = EvaluatorPython(
+                pybamm.NumpyConcatenation(*self._leaves)
+            )
+            self._leaf_offsets = np.cumsum(
+                [0] + [np.size(leaf.evaluate_for_shape()) for leaf in self._leaves]
+            )
+        if self._operations:
+            self._constant_result = None
+        else:
+            # The jacobian doesn't depend on t, y or inputs
+            self._constant_result = self._result_matrix(self._slots)
+
+    @property
+    def shape(self):
+        return self._shape
+
+    def _new_slot(self, data=None):
+        self._slots.append(data)
+        return len(self._slots) - 1
+
+    def _value(self, symbol):
+        """
+        Return the index in `self._values` of the value of a vector or scalar symbol.
+        """
+        try:
+            return self._processed_values[symbol.id]
+        except KeyError:
+            pass
+        if symbol.is_constant():
+            value = symbol.evaluate()
+            if scipy.sparse.issparse(value):
+                value = value.toarray()
+            self._values.append(np.asarray(value, dtype=float))
+        else:
+            self._values.append(None)
+            self._leaves.append(symbol)
+            self._leaf_values.append(len(self._values) - 1)
+        self._processed_values[symbol.id] = len(self._values) - 1
+        return len(self._values) - 1
+
+    def _matrix(self, symbol):
+        """
+        Return the (canonical csr) sparsity pattern of a matrix-valued symbol, and the
+        slot containing the values of the non-zero entries in that pattern.
+        """
+        try:
+            return self._processed_matrices[symbol.id]
+        except KeyError:
+            pattern, slot = self._process_matrix(symbol)
+            self._processed_matrices[symbol.id] = (pattern, slot)
+            return pattern, slot
+
+    def _process_matrix(self, symbol):
+        """See :meth:`EvaluatorPythonSparseJacobian._matrix`"""
+        if symbol.is_constant():
+            matrix = scipy.sparse.csr_matrix(symbol.evaluate())
+            matrix.sum_duplicates()
+            matrix.sort_indices()
+            return matrix, self._new_slot(matrix.data.astype(float))
+
+        if isinstance(symbol, pybamm.Negate):
+            pattern, child = self._matrix(symbol.child)
+            out = self._new_slot()
+            self._operations.append(("negate", out, child))
+            return pattern, out
+
+        if isinstance(symbol, (pybamm.Addition, pybamm.Subtraction)):
+            left_pattern, left = self._matrix(symbol.left)
+            right_pattern, right = self._matrix(symbol.right)
+            pattern = _canonical_pattern(_ones(left_pattern) + _ones(right_pattern))
+            out = self._new_slot()
+            self._operations.append(
+                (
+                    "add",
+                    out,
+                    pattern.nnz,
+                    left,
+                    _positions(pattern, left_pattern),
+                    right,
+                    _positions(pattern, right_pattern),
+                    -1.0 if isinstance(symbol, pybamm.Subtraction) else 1.0,
+                )
+            )
+            return pattern, out
+
+        if isinstance(symbol, (pybamm.Multiplication, pybamm.Division)):
+            left, right = symbol.children
+            if _is_vector(right, symbol):
+                # matrix * vector, or matrix / vector
+                matrix, vector = left, right
+            elif _is_vector(left, symbol) and isinstance(symbol, pybamm.Multiplication):
+                matrix, vector = right, left
+            else:
+                raise NotImplementedError(
+                    "elementwise {} of two matrices".format(symbol.name)
+                )
+            pattern, matrix_slot = self._matrix(matrix)
+            out = self._new_slot()
+            n_rows = _shape(symbol)[0]
+            if pattern.shape[0] == 1 and n_rows > 1:
+                # column vector times a row of the jacobian, broadcast to n_rows rows
+                if isinstance(symbol, pybamm.Division):
+                    raise NotImplementedError("broadcast division")
+                pattern = scipy.sparse.vstack([pattern] * n_rows, format="csr")
+                self._operations.append(
+                    ("outer", out, matrix_slot, self._value(vector))
+                )
+                return pattern, out
+            if len(_shape(vector)) < 2 or _shape(vector)[0] == 1:
+                # scalar
+                rows = None
+            else:
+                rows = np.repeat(np.arange(n_rows), np.diff(pattern.indptr))
+            self._operations.append(
+                (
+                    "scale",
+                    out,
+                    matrix_slot,
+                    self._value(vector),
+                    rows,
+                    isinstance(symbol, pybamm.Division),
+                )
+            )
+            return pattern, out
+
+        if isinstance(symbol, pybamm.MatrixMultiplication):
+            left_pattern, left = self._matrix(symbol.left)
+            right_pattern, right = self._matrix(symbol.right)
+            left_coo = left_pattern.tocoo()
+            # For each non-zero A[i, k] of the left matrix, the non-zeros B[k, j] of
+            # row k of the right matrix contribute to C[i, j]
+            counts = np.diff(right_pattern.indptr)[left_coo.col]
+            left_idx = np.repeat(np.arange(left_pattern.nnz), counts)
+            starts = np.repeat(right_pattern.indptr[left_coo.col], counts)
+            offsets = np.arange(counts.sum()) - np.repeat(
+                np.cumsum(counts) - counts, counts
+            )
+            right_idx = starts + offsets
+            rows = left_coo.row[left_idx]
+            cols = right_pattern.indices[right_idx]
+            pattern = _canonical_pattern(
+                scipy.sparse.csr_matrix(
+                    (np.ones(len(rows)), (rows, cols)),
+                    shape=(left_pattern.shape[0], right_pattern.shape[1]),
+                )
+            )
+            out = self._new_slot()
+            self._operations.append(
+                (
+                    "matmul",
+                    out,
+                    pattern.nnz,
+                    left,
+                    left_idx,
+                    right,
+                    right_idx,
+                    _lookup(pattern, rows, cols),
+                )
+            )
+            return pattern, out
+
+        if isinstance(symbol, pybamm.SparseStack):
+            patterns, children = zip(
+                *[self._matrix(child) for child in symbol.children]
+            )
+            pattern = scipy.sparse.vstack(patterns, format="csr")
+            out = self._new_slot()
+            self._operations.append(("stack", out, children))
+            return pattern, out
+
+        if isinstance(symbol, pybamm.Index):
+            child_pattern, child = self._matrix(symbol.child)
+            rows = np.arange(child_pattern.shape[0])[symbol.slice]
+            pattern = child_pattern[rows]
+            # positions of the non-zeros of the selected rows in the child
+            indptr = child_pattern.indptr
+            positions = np.concatenate(
+                [np.arange(indptr[i], indptr[i + 1]) for i in rows]
+                + [np.array([], dtype=int)]
+            )
+            out = self._new_slot()
+            self._operations.append(("gather", out, child, positions))
+            return pattern, out
+
+        raise NotImplementedError(
+            "matrix-valued symbol of type '{}'".format(type(symbol).__name__)
+        )
+
+    def __call__(self, t=None, y=None, inputs=None):
+        """
+        evaluate function
+        """
+        if self._fallback is not None:
+            return scipy.sparse.csr_matrix(self._fallback(t, y, inputs))
+        if self._constant_result is not None:
+            return self._constant_result
+
+        values = list(self._values)
+        if self._leaves:
+            leaves = self._leaves_evaluator(t, y, inputs)
+            offsets = self._leaf_offsets
+            for i, value_idx in enumerate(self._leaf_values):
+                values[value_idx] = leaves[offsets[i] : offsets[i + 1]]
+
+        slots = list(self._slots)
+        for operation in self._operations:
+            kind, out = operation[:2]
+            if kind == "negate":
+                slots[out] = -slots[operation[2]]
+            elif kind == "add":
+                nnz, left, left_pos, right, right_pos, sign = operation[2:]
+                data = np.zeros(nnz)
+                data[left_pos] = slots[left]
+                data[right_pos] += sign * slots[right]
+                slots[out] = data
+            elif kind == "scale":
+                matrix, vector, rows, divide = operation[2:]
+                vector = values[vector]
+                if rows is None:
+                    vector = np.ravel(vector)[0]
+                else:
+                    vector = np.ravel(vector)[rows]
+                if divide:
+                    slots[out] = slots[matrix] / vector
+                else:
+                    slots[out] = slots[matrix] * vector
+            elif kind == "outer":
+                matrix, vector = operation[2:]
+                slots[out] = np.outer(values[vector], slots[matrix]).ravel()
+            elif kind == "matmul":
+                nnz, left, left_idx, right, right_idx, out_idx = operation[2:]
+                slots[out] = np.bincount(
+                    out_idx,
+                    weights=slots[left][left_idx] * slots[right][right_idx],
+                    minlength=nnz,
+                )
+            elif kind == "stack":
+                slots[out] = np.concatenate([slots[i] for i in operation[2]])
+            elif kind == "gather":
+                slots[out] = slots[operation[2]][operation[3]]
+
+        return self._result_matrix(slots)
+
+    def _result_matrix(self, slots):
+        return scipy.sparse.csr_matrix(
+            (slots[self._result], self._indices, self._indptr), shape=self._shape
+        )
+
+
+def _shape(symbol):
+    # faster than `symbol.shape` for nodes of a large tree, as the values used to
+    # find the shape are saved for each node
+    return np.shape(symbol.evaluate_for_shape())
+
+
+def _is_vector(child, parent):
+    """Whether `child` is a (column) vector or scalar factor of the matrix `parent`"""
+    shape = _shape(child)
+    return len(shape) < 2 or (shape[1] == 1 and _shape(parent)[1] != 1)
+
+
+def _ones(pattern):
+    """Matrix with ones at the (structurally) non-zero entries of `pattern`."""
+    return scipy.sparse.csr_matrix(
+        (np.ones(pattern.nnz), pattern.indices, pattern.indptr), shape=pattern.shape
+    )
+
+
+def _canonical_pattern(matrix):
+    """
+    Sparsity pattern of a matrix with positive entries, with sorted indices and
+    without duplicates.
+    """
+    pattern = scipy.sparse.csr_matrix(matrix)
+    pattern.sum_duplicates()
+    pattern.sort_indices()
+    return pattern
+
+
+def _lookup(pattern, rows, cols):
+    """Positions of the entries (rows, cols) in the data array of `pattern`."""
+    positions = scipy.sparse.csr_matrix(
+        (np.arange(1, pattern.nnz + 1), pattern.indices, pattern.indptr),
+        shape=pattern.shape,
+    )
+    return np.asarray(positions[rows, cols]).ravel().astype(int) - 1
+
+
+def _positions(pattern, sub_pattern):
+    """Positions of the non-zeros of `sub_pattern` in the data array of `pattern`."""
+    coo = sub_pattern.tocoo()
+    return _lookup(pattern, coo.row, coo.col)
+
+
 class EvaluatorJax:
     """
     Converts a pybamm expression tree into pure python code that will calculate the
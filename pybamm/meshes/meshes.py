@@ -1,9 +1,14 @@
 #
 # Native PyBaMM Meshes
 #
+import hashlib
 import numbers
 import numpy as np
 import pybamm
+from pybamm.build_cache import _update_fingerprint
+
+# Types of submesh attributes included in the fingerprint of a mesh
+_fingerprint_types = (np.ndarray, numbers.Number, str, list, tuple, dict, type(None))
 
 
 class Mesh(dict):
@@ -26,6 +31,7 @@ class Mesh(dict):
 
     def __init__(self, geometry, submesh_types, var_pts):
         super().__init__()
+        self._clear_memos()
 
         # Preprocess var_pts
         var_pts_input = var_pts
@@ -117,11 +123,63 @@ class Mesh(dict):
         # add ghost meshes
         self.add_ghost_meshes()
 
+    def __setitem__(self, domain, submesh):
+        super().__setitem__(domain, submesh)
+        self._clear_memos()
+
+    def __delitem__(self, domain):
+        super().__delitem__(domain)
+        self._clear_memos()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._clear_memos()
+
+    def _clear_memos(self):
+        # Combined submeshes and the fingerprint may be out of date
+        self._combined_submeshes = {}
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        """
+        A hash of the submeshes (their class, edges, coordinate system and other
+        attributes) that is the same for any two meshes with the same submeshes, used
+        as part of the key of matrices in the :class:`pybamm.OperatorMatrixCache`.
+        Like combined submeshes, it is only recomputed when a submesh is replaced.
+        """
+        if self._fingerprint is None:
+            hasher = hashlib.sha256()
+            _update_fingerprint(
+                hasher,
+                {
+                    domain: (
+                        type(submesh),
+                        {
+                            k: v
+                            for k, v in vars(submesh).items()
+                            # skip e.g. scikit-fem objects, which are described by
+                            # the edges, and attributes set by spatial methods
+                            if isinstance(v, _fingerprint_types)
+                            and k != "npts_for_broadcast_to_nodes"
+                        },
+                    )
+                    for domain, submesh in self.items()
+                },
+            )
+            self._fingerprint = hasher.hexdigest()
+        return self._fingerprint
+
     def combine_submeshes(self, *submeshnames):
         """Combine submeshes into a new submesh, using self.submeshclass
         Raises pybamm.DomainError if submeshes to be combined do not match up (edges are
         not aligned).
 
+        Combined submeshes are memoised, so that combining the same submeshes again
+        returns the same submesh object without checking and concatenating the edges
+        again. The memo is cleared whenever a submesh of the mesh is replaced (but not
+        if the edges of a submesh are modified in place).
+
         Parameters
         ----------
         submeshnames: list of str
@@ -137,6 +195,10 @@ class Mesh(dict):
         # If there is just a single submesh, we can return it directly
         if len(submeshnames) == 1:
             return self[submeshnames[0]]
+        try:
+            return self._combined_submeshes[submeshnames]
+        except KeyError:
+            pass
         # Check that the final edge of each submesh is the same as the first edge of the
         # next submesh
         for i in range(len(submeshnames) - 1):
@@ -160,6 +222,7 @@ class Mesh(dict):
             self[submeshname].edges[0] for submeshname in submeshnames[1:]
         ]
 
+        self._combined_submeshes[submeshnames] = submesh
         return submesh
 
     def add_ghost_meshes(self):
@@ -76,6 +76,11 @@ class BaseModel:
         solver set up.
     use_jacobian : bool
         Whether to use the Jacobian when solving the model (default is True).
+    use_sparse_jacobian : bool
+        Whether to evaluate the Jacobian (if used) by computing only its structurally
+        non-zero entries, with a sparsity pattern that is found once from the
+        expression tree (see :class:`pybamm.EvaluatorPythonSparseJacobian`). Only
+        used if `convert_to_format` is "python" or None. Default is False.
     convert_to_format : str
         Whether to convert the expression trees representing the rhs and
         algebraic equations, Jacobain (if using) and events into a different format:
@@ -118,6 +123,7 @@ class BaseModel:
 
         # Default behaviour is to use the jacobian
         self.use_jacobian = True
+        self.use_sparse_jacobian = False
         self.convert_to_format = "casadi"
 
         # Model is not initially discretised
@@ -368,6 +368,7 @@ class BasicDFNHalfCell(BaseModel):
     def new_copy(self, build=False):
         new_model = self.__class__(name=self.name, options=self.options)
         new_model.use_jacobian = self.use_jacobian
+        new_model.use_sparse_jacobian = self.use_sparse_jacobian
         new_model.convert_to_format = self.convert_to_format
         new_model._timescale = self.timescale
         new_model._length_scales = self.length_scales
@@ -2,6 +2,7 @@
 # A model to calculate electrode-specific SOH
 #
 import pybamm
+import casadi
 import numpy as np
 
 
@@ -94,6 +95,225 @@ class ElectrodeSOH(pybamm.BaseModel):
         return pybamm.AlgebraicSolver()
 
 
+class ElectrodeSOHSolver:
+    """
+    A compiled, reusable solver for the :class:`ElectrodeSOH` model. The model is
+    parameterised, discretised and converted to a CasADi Newton root-finder (and
+    functions for its initial guess and variables) once, the first time it is
+    needed, so that each solve is a single call to the root-finder rather than a
+    call to :meth:`pybamm.Simulation.solve`. By default, each solve is warm-started
+    from the previous solution, e.g. the previous cycle of an experiment.
+
+    Parameters
+    ----------
+    parameter_values : :class:`pybamm.ParameterValues`
+        The parameter values to use (the inputs of the model, "V_min", "V_max",
+        "C_n", "C_p" and "n_Li", are given to each solve)
+    tol : float, optional
+        The tolerance on the residuals of the solution. Default is 1e-6.
+    extra_options : dict, optional
+        Any options to pass to the CasADi root-finder
+    stoichiometry_tol : float, optional
+        Solutions are only accepted if all the stoichiometries are at least this far
+        from 0 and 1 (and within the data of the open-circuit potentials, if they
+        are given as data), as the open-circuit potentials can be steep enough near
+        the limits for the residuals to be small far from the solution. Default is
+        1e-6.
+    """
+
+    input_names = ["V_min", "V_max", "C_n", "C_p", "n_Li"]
+
+    def __init__(
+        self, parameter_values, tol=1e-6, extra_options=None, stoichiometry_tol=1e-6
+    ):
+        self.parameter_values = parameter_values
+        self.tol = tol
+        self.extra_options = extra_options or {}
+        self.stoichiometry_tol = stoichiometry_tol
+        self.last_solution = None
+        self._rootfinder = None
+
+    def _set_up(self):
+        sim = pybamm.Simulation(ElectrodeSOH(), parameter_values=self.parameter_values)
+        sim.build()
+        model = sim.built_model
+
+        t = casadi.MX.sym("t")
+        y = casadi.MX.sym("y", model.concatenated_algebraic.size)
+        inputs_dict = {name: casadi.MX.sym(name) for name in self.input_names}
+        p = casadi.vertcat(*inputs_dict.values())
+
+        alg = model.concatenated_algebraic.to_casadi(t, y, inputs=inputs_dict)
+        self._algebraic = casadi.Function("esoh_algebraic", [y, p], [alg])
+        y0 = model.concatenated_initial_conditions.to_casadi(t, y, inputs=inputs_dict)
+        self._initial_guess = casadi.Function("esoh_initial_guess", [p], [y0])
+        self.variable_names = list(model.variables.keys())
+        variables = casadi.vertcat(
+            *[
+                model.variables[name].to_casadi(t, y, inputs=inputs_dict)
+                for name in self.variable_names
+            ]
+        )
+        self._variables = casadi.Function("esoh_variables", [y, p], [variables])
+        # Index of each unknown ("x_100" and "C") in the vector of unknowns
+        self._unknowns = {
+            name: model.variables[name].y_slices[0].start for name in ["x_100", "C"]
+        }
+
+        # Range of each stoichiometry in which solutions are accepted
+        limits = {}
+        for electrode, stoichiometries in [
+            ("Negative", ["x_100", "x_0"]),
+            ("Positive", ["y_100", "y_0"]),
+        ]:
+            lower = self.stoichiometry_tol
+            upper = 1 - self.stoichiometry_tol
+            ocp = self.parameter_values[f"{electrode} electrode OCP [V]"]
+            if isinstance(ocp, tuple):
+                # data for an interpolant
+                sto_data = ocp[1][0][0]
+                lower = max(lower, np.min(sto_data))
+                upper = min(upper, np.max(sto_data))
+            for name in stoichiometries:
+                limits[name] = (lower, upper)
+        self._stoichiometry_limits = limits
+
+        # Constrain the unknowns in the same way as pybamm.CasadiAlgebraicSolver
+        constraints = np.zeros_like(model.bounds[0], dtype=int)
+        constraints[model.bounds[0] >= 0] = 1
+        constraints[model.bounds[1] <= 0] = -1
+        self._rootfinder = casadi.rootfinder(
+            "esoh",
+            "newton",
+            dict(x=y, p=p, g=alg),
+            {
+                **self.extra_options,
+                "abstol": self.tol,
+                "constraints": list(constraints),
+            },
+        )
+
+    def _inputs_vector(self, inputs, size=None):
+        try:
+            values = [
+                np.asarray(inputs[name], dtype=float) for name in self.input_names
+            ]
+        except KeyError as error:
+            raise KeyError(
+                f"Missing input {error} for the eSOH solver, the inputs must be "
+                f"{self.input_names}"
+            )
+        if size is None:
+            return casadi.DM(np.array(values))
+        return np.vstack([np.broadcast_to(value, (size,)) for value in values])
+
+    def _is_solution(self, y, p):
+        """
+        Check which columns of `y` are solutions, i.e. have small residuals and all
+        the stoichiometries within their limits
+        """
+        algebraic = self._algebraic
+        variables = self._variables
+        if y.shape[1] > 1:
+            algebraic = algebraic.map(y.shape[1])
+            variables = variables.map(y.shape[1])
+        residuals = algebraic(y, p).full()
+        is_solution = np.all(np.abs(residuals) < self.tol, axis=0)
+        values = dict(zip(self.variable_names, variables(y, p).full()))
+        for name, (lower, upper) in self._stoichiometry_limits.items():
+            # NaN values (failed solves) are never within the limits
+            is_solution &= (values[name] >= lower) & (values[name] <= upper)
+        return is_solution
+
+    def solve(self, inputs, initial_guess=None):
+        """
+        Solve the eSOH model for one set of inputs
+
+        Parameters
+        ----------
+        inputs : dict
+            The values of "V_min", "V_max", "C_n", "C_p" and "n_Li"
+        initial_guess : dict, optional
+            An initial guess for the unknowns, "x_100" and "C". If None (default),
+            the previous solution is used, or the initial conditions of the model if
+            there is no previous solution. The initial conditions of the model are
+            also tried if the solve fails from the initial guess.
+
+        Returns
+        -------
+        dict
+            The values of the variables of :class:`ElectrodeSOH`
+        """
+        if self._rootfinder is None:
+            self._set_up()
+        p = self._inputs_vector(inputs)
+
+        initial_guesses = []
+        if initial_guess is not None:
+            y0 = np.zeros(len(self._unknowns))
+            for name, idx in self._unknowns.items():
+                y0[idx] = initial_guess[name]
+            initial_guesses.append(casadi.DM(y0))
+        elif self.last_solution is not None:
+            initial_guesses.append(self.last_solution)
+        initial_guesses.append(self._initial_guess(p))
+
+        message = "solver returned a residual above tolerance"
+        for y0 in initial_guesses:
+            try:
+                y = self._rootfinder(y0, p)
+            except RuntimeError as error:
+                message = error.args[0]
+                continue
+            if self._is_solution(y, p)[0]:
+                self.last_solution = y
+                values = self._variables(y, p).full()[:, 0]
+                return dict(zip(self.variable_names, values))
+        raise pybamm.SolverError(
+            "Could not find acceptable solution to the eSOH model: {}".format(message)
+        )
+
+    def solve_batch(self, inputs):
+        """
+        Solve the eSOH model for many sets of inputs at once (e.g. the capacities and
+        lithium inventory of each cycle of an experiment, for post-hoc analysis),
+        from the initial conditions of the model. The previous solution is not used
+        or changed.
+
+        Parameters
+        ----------
+        inputs : dict
+            The values of "V_min", "V_max", "C_n", "C_p" and "n_Li", as arrays of the
+            same length or scalars (which are used for all the sets of inputs)
+
+        Returns
+        -------
+        dict
+            The values of the variables of :class:`ElectrodeSOH` for each set of
+            inputs, as arrays. Sets of inputs for which the solve failed give NaN.
+        """
+        if self._rootfinder is None:
+            self._set_up()
+        size = max(np.size(inputs.get(name, 0)) for name in self.input_names)
+        p = self._inputs_vector(inputs, size)
+        y0 = self._initial_guess.map(size)(p)
+        try:
+            y = self._rootfinder.map(size)(y0, p)
+        except RuntimeError:
+            # Solve each set of inputs separately, so that one failure does not
+            # lose all the others
+            y = np.full(y0.shape, np.nan)
+            for i in range(size):
+                try:
+                    y[:, i] = self._rootfinder(y0[:, i], p[:, i]).full()[:, 0]
+                except RuntimeError:
+                    pass
+            y = casadi.DM(y)
+        values = self._variables.map(size)(y, p).full()
+        values[:, ~self._is_solution(y, p)] = np.nan
+        return dict(zip(self.variable_names, values))
+
+
 def get_initial_stoichiometries(initial_soc, parameter_values):
     """
     Calculate initial stoichiometries to start off the simulation at a particular
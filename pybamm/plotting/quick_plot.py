@@ -31,6 +31,21 @@ def ax_max(data):
     return data_min + 1.05 * (data_max - data_min)
 
 
+def eval_for_limits(var, t, spatial_vars):
+    """
+    Evaluate a variable at times t to calculate its axis limits. Lazy variables are
+    evaluated one time at a time, keeping only the minimum and maximum values, so
+    that their values at all times are never in memory at once
+    """
+    if not getattr(var, "lazy", False):
+        return var(t, **spatial_vars, warn=False)
+    data = []
+    for t_i in t:
+        data_i = var(t_i, **spatial_vars, warn=False)
+        data.extend([np.nanmin(data_i), np.nanmax(data_i)])
+    return np.array(data)
+
+
 def split_long_string(title, max_words=None):
     """Get title in a nice format"""
     max_words = max_words or pybamm.settings.max_words_in_line
@@ -262,8 +277,10 @@ class QuickPlot(object):
                 variables[i] = []
                 for var in variable_tuple:
                     sol = solution[var]
-                    # Check variable isn't all-nan
-                    if np.all(np.isnan(sol.entries)):
+                    # Check variable isn't all-nan (not for lazy variables, to avoid
+                    # evaluating them at all times)
+                    lazy = getattr(sol, "lazy", False)
+                    if not lazy and np.all(np.isnan(sol.entries)):
                         raise ValueError("All-NaN variable '{}' provided".format(var))
                     # If ok, add to the list of solutions
                     else:
@@ -408,14 +425,14 @@ class QuickPlot(object):
                 spatial_vars = self.spatial_variable_dict[key]
                 var_min = np.min(
                     [
-                        ax_min(var(self.ts_seconds[i], **spatial_vars, warn=False))
+                        ax_min(eval_for_limits(var, self.ts_seconds[i], spatial_vars))
                         for i, variable_list in enumerate(variable_lists)
                         for var in variable_list
                     ]
                 )
                 var_max = np.max(
                     [
-                        ax_max(var(self.ts_seconds[i], **spatial_vars, warn=False))
+                        ax_max(eval_for_limits(var, self.ts_seconds[i], spatial_vars))
                         for i, variable_list in enumerate(variable_lists)
                         for var in variable_list
                     ]
@@ -12,6 +12,8 @@ class Settings(object):
     _abs_smoothing = "exact"
     max_words_in_line = 4
     max_y_value = 1e5
+    memmap_chunk_size = 1000
+    lazy_2D_variables = False
 
     @property
     def debug_mode(self):
@@ -53,6 +53,20 @@ class Simulation:
         A list of variables to plot automatically
     C_rate: float (optional)
         The C-rate at which you would like to run a constant current (dis)charge.
+    build_cache: :class:`pybamm.BuildCache` or str (optional)
+        A cache of built models on disk (or the directory to keep one in). If given,
+        :meth:`build` loads the built model from the cache if the same model has
+        already been built with the same parameters, mesh and spatial methods,
+        possibly by another process, and skips the solver set-up too if the cached
+        model has been set up by the same kind of solver. Only used for simulations
+        without an experiment.
+    experiment_mode: str (optional)
+        How the model is set up for an experiment. Can be "multiple models" (default),
+        where a model is created for each kind of operating conditions, or "single
+        model", where all steps at constant current, voltage or power share one model
+        in which the operating mode is selected by input parameters, so that it is
+        only parameterised, discretised and set up by the solver once. Steps with
+        CCCV control or a drive cycle still get their own model.
     """
 
     def __init__(
@@ -67,8 +81,16 @@ class Simulation:
         solver=None,
         output_variables=None,
         C_rate=None,
+        build_cache=None,
+        experiment_mode="multiple models",
     ):
         self.parameter_values = parameter_values or model.default_parameter_values
+        if experiment_mode not in ["multiple models", "single model"]:
+            raise ValueError(
+                "experiment_mode must be 'multiple models' or 'single model', "
+                f"not '{experiment_mode}'"
+            )
+        self.experiment_mode = experiment_mode
 
         if isinstance(model, pybamm.lithium_ion.BasicDFNHalfCell):
             if experiment is not None:
@@ -108,11 +130,16 @@ class Simulation:
         self.spatial_methods = spatial_methods or self.model.default_spatial_methods
         self.solver = solver or self.model.default_solver
         self.output_variables = output_variables
+        if isinstance(build_cache, str):
+            build_cache = pybamm.BuildCache(build_cache)
+        self.build_cache = build_cache
 
         # Initialize empty built states
         self._model_with_set_params = None
         self._built_model = None
         self._built_initial_soc = None
+        self._build_cache_key = None
+        self._cached_set_up = None
         self.op_conds_to_built_models = None
         self._mesh = None
         self._disc = None
@@ -272,14 +299,33 @@ class Simulation:
 
         This increases set-up time since several models to be processed, but
         reduces simulation time since the model formulation is efficient.
+
+        With `experiment_mode="single model"`, the steps at constant current, voltage
+        or power instead share the model created by
+        :meth:`set_up_single_model_for_experiment`.
         """
         self.op_conds_to_model_and_param = {}
+        single_model_and_param = None
         for op_cond, op_inputs in zip(
             self.experiment.operating_conditions, self._experiment_inputs
         ):
             # Create model for this operating condition if it has not already been seen
             # before
             if op_cond["electric"] not in self.op_conds_to_model_and_param:
+                if (
+                    self.experiment_mode == "single model"
+                    and op_cond["dc_data"] is None
+                    and op_inputs["CCCV switch"] == 0
+                ):
+                    if single_model_and_param is None:
+                        single_model_and_param = (
+                            self.set_up_single_model_for_experiment(model)
+                        )
+                    self.op_conds_to_model_and_param[
+                        op_cond["electric"]
+                    ] = single_model_and_param
+                    continue
+
                 if op_inputs["Current switch"] == 1:
                     # Current control
                     # Make a new copy of the model (we will update events later))
@@ -404,18 +450,7 @@ class Simulation:
                         )
                     )
 
-                # Keep the min and max voltages as safeguards but add some tolerances
-                # so that they are not triggered before the voltage limits in the
-                # experiment
-                for i, event in enumerate(new_model.events):
-                    if event.name == "Minimum voltage":
-                        new_model.events[i] = pybamm.Event(
-                            event.name, event.expression + 1, event.event_type
-                        )
-                    elif event.name == "Maximum voltage":
-                        new_model.events[i] = pybamm.Event(
-                            event.name, event.expression - 1, event.event_type
-                        )
+                self._relax_voltage_limits(new_model)
 
                 # Update parameter values
                 new_parameter_values = self.parameter_values.copy()
@@ -452,6 +487,104 @@ class Simulation:
                 )
         self.model = model
 
+    def set_up_single_model_for_experiment(self, model):
+        """
+        Create a single model that can run any step at constant current, voltage or
+        power, the operating mode being selected by the "Current switch", "Voltage
+        switch" and "Power switch" inputs, and the value by the "Current input [A]",
+        "Voltage input [V]" and "Power input [W]" inputs.
+
+        This reduces set-up time since only one model needs to be built (and set up
+        by the solver), but increases simulation time since the current is always
+        an algebraic variable, even for steps at constant current.
+
+        Returns
+        -------
+        tuple
+            The model and the parameter values to process it with
+        """
+        # Replace the current density in the model with a current density variable,
+        # as for voltage or power control (see set_up_model_for_experiment)
+        external_circuit_variables = pybamm.external_circuit.FunctionControl(
+            model.param, None, model.options, control="algebraic"
+        ).get_fundamental_variables()
+        symbol_replacement_map = {
+            model.variables[name]: variable
+            for name, variable in external_circuit_variables.items()
+        }
+        replacer = pybamm.SymbolReplacer(
+            symbol_replacement_map, process_initial_conditions=False
+        )
+        new_model = replacer.process_model(model, inplace=False)
+
+        # The algebraic equation for the current is a combination of the equations
+        # for current, voltage and power control, weighted by the switches
+        i_cell = new_model.variables["Current density variable"]
+        new_model.initial_conditions[i_cell] = new_model.param.current_with_time
+        new_model.algebraic[i_cell] = (
+            pybamm.InputParameter("Current switch")
+            * (i_cell - new_model.param.current_with_time)
+            + pybamm.InputParameter("Voltage switch")
+            * pybamm.external_circuit.VoltageFunctionControl(
+                new_model.param, model.options
+            ).constant_voltage(new_model.variables)
+            + pybamm.InputParameter("Power switch")
+            * pybamm.external_circuit.PowerFunctionControl(
+                new_model.param, new_model.options, control="algebraic"
+            ).constant_power(new_model.variables)
+        )
+
+        # Add all the current and voltage events: the cut-offs that should not be
+        # hit in a step are set to values that won't be hit
+        new_model.events.extend(
+            [
+                pybamm.Event(
+                    "Current cut-off (positive) [A] [experiment]",
+                    new_model.variables["Current [A]"]
+                    - abs(pybamm.InputParameter("Current cut-off [A]")),
+                ),
+                pybamm.Event(
+                    "Current cut-off (negative) [A] [experiment]",
+                    new_model.variables["Current [A]"]
+                    + abs(pybamm.InputParameter("Current cut-off [A]")),
+                ),
+                pybamm.Event(
+                    "Voltage cut-off [V] [experiment]",
+                    new_model.variables["Battery voltage [V]"]
+                    - pybamm.InputParameter("Voltage cut-off [V]"),
+                ),
+            ]
+        )
+        self._relax_voltage_limits(new_model)
+
+        new_parameter_values = self.parameter_values.copy()
+        new_parameter_values.update(
+            {
+                "Current function [A]": pybamm.InputParameter("Current input [A]"),
+                "Voltage function [V]": pybamm.InputParameter("Voltage input [V]")
+                / model.param.n_cells,
+                "Power function [W]": pybamm.InputParameter("Power input [W]"),
+            },
+            check_already_exists=False,
+        )
+        return new_model, new_parameter_values
+
+    @staticmethod
+    def _relax_voltage_limits(model):
+        """
+        Keep the min and max voltages as safeguards but add some tolerances so that
+        they are not triggered before the voltage limits in the experiment
+        """
+        for i, event in enumerate(model.events):
+            if event.name == "Minimum voltage":
+                model.events[i] = pybamm.Event(
+                    event.name, event.expression + 1, event.event_type
+                )
+            elif event.name == "Maximum voltage":
+                model.events[i] = pybamm.Event(
+                    event.name, event.expression - 1, event.event_type
+                )
+
     def set_parameters(self):
         """
         A method to set the parameters in the model and the associated geometry.
@@ -491,12 +624,32 @@ class Simulation:
             self._model_with_set_params = self.model
             self._built_model = self.model
         else:
+            if self.build_cache is not None:
+                # The key must be computed before building, as building processes
+                # the geometry and adds default spatial methods in place
+                self._build_cache_key = self.build_cache.key(
+                    self._unprocessed_model,
+                    self._parameter_values,
+                    self._geometry,
+                    self._submesh_types,
+                    self._var_pts,
+                    self._spatial_methods,
+                )
+                entry = self.build_cache.load(self._build_cache_key)
+                if entry is not None:
+                    pybamm.logger.info("Loaded built model from cache")
+                    self._built_model = entry["model"]
+                    self._cached_set_up = entry["set up"]
+                    return
             self.set_parameters()
             self._mesh = pybamm.Mesh(self._geometry, self._submesh_types, self._var_pts)
             self._disc = pybamm.Discretisation(self._mesh, self._spatial_methods)
             self._built_model = self._disc.process_model(
                 self._model_with_set_params, inplace=False, check_model=check_model
             )
+            if self.build_cache is not None:
+                self.build_cache.save(self._build_cache_key, self._built_model)
+                self._cached_set_up = None
 
     def build_for_experiment(self, check_model=True):
         """
@@ -519,6 +672,13 @@ class Simulation:
                 unbuilt_model,
                 parameter_values,
             ) in self.op_conds_to_model_and_param.items():
+                # Operating conditions sharing a model (see `experiment_mode`) also
+                # share the built model
+                if unbuilt_model in processed_models:
+                    self.op_conds_to_built_models[op_cond] = processed_models[
+                        unbuilt_model
+                    ]
+                    continue
                 model_with_set_params = parameter_values.process_model(
                     unbuilt_model, inplace=False
                 )
@@ -541,6 +701,10 @@ class Simulation:
         starting_solution=None,
         initial_soc=None,
         callbacks=None,
+        keep_in_memory=True,
+        output_policy=None,
+        storage=None,
+        summary_reductions=None,
         **kwargs,
     ):
         """
@@ -588,6 +752,34 @@ class Simulation:
         callbacks : list of callbacks, optional
             A list of callbacks to be called at each time step. Each callback must
             implement all the methods defined in :class:`pybamm.callbacks.BaseCallback`.
+            Use a :class:`pybamm.callbacks.SolutionWriter` to write the solution of an
+            experiment to a file while it is being solved.
+        keep_in_memory : bool, optional
+            Whether to keep the solution of the experiment in memory. If False, the
+            returned solution only contains the final state of the experiment and the
+            summary variables of each cycle (overriding `save_at_cycles`). Default is
+            True.
+        output_policy : :class:`pybamm.BaseOutputPolicy` or dict, optional
+            Which points of each experiment step to store, e.g.
+            :class:`pybamm.AdaptiveOutput` to store fewer points when chosen
+            variables change slowly. Can be a dict of {operating conditions string:
+            policy} to use a different policy for some steps. Default is
+            :class:`pybamm.FixedPeriodOutput` (store every period of each step). The
+            number of points stored for each step is given to the callbacks as
+            `logs["stored points"]`.
+        storage : :class:`pybamm.MemoryMappedStorage` or str, optional
+            If given, the states of the solution are moved to memory-mapped files in
+            this storage (or in a new storage in this directory), and read lazily
+            when processing variables. When simulating an experiment, the states of
+            each step are moved as soon as the step has been solved, so that the
+            states of the whole experiment are never all in memory. Default is None.
+        summary_reductions : dict, optional
+            Extra summary variables to calculate for each cycle of an experiment, as
+            a dict of {name: (variable name, reduction)}, e.g.
+            `{"Throughput [A.s]": ("Current [A]", "integral")}`. See
+            :class:`pybamm.SummaryVariableReducer`. Summary variables are updated
+            from the states of each step as soon as it has been solved (before the
+            output policy is applied). Default is None.
         **kwargs
             Additional key-word arguments passed to `solver.solve`.
             See :meth:`pybamm.BaseSolver.solve`.
@@ -651,6 +843,16 @@ class Simulation:
                 raise ValueError(
                     "starting_solution can only be provided if simulating an Experiment"
                 )
+            if not keep_in_memory:
+                raise ValueError(
+                    "'keep_in_memory' option can only be used if simulating an "
+                    "Experiment "
+                )
+            if output_policy is not None:
+                raise ValueError(
+                    "'output_policy' option can only be used if simulating an "
+                    "Experiment "
+                )
             if self.operating_mode == "without experiment" or isinstance(
                 self.model, pybamm.lithium_ion.ElectrodeSOH
             ):
@@ -711,7 +913,12 @@ class Simulation:
                             pybamm.SolverWarning,
                         )
 
-            self._solution = solver.solve(self.built_model, t_eval, **kwargs)
+            if self.build_cache is not None:
+                self._solve_with_build_cache(solver, t_eval, **kwargs)
+            else:
+                self._solution = solver.solve(self.built_model, t_eval, **kwargs)
+            if storage is not None:
+                self._solution.move_to_storage(storage)
 
         elif self.operating_mode == "with experiment":
             callbacks.on_experiment_start(logs)
@@ -729,10 +936,7 @@ class Simulation:
 
             # Set up eSOH model (for summary variables)
             if calc_esoh is True:
-                esoh_model = pybamm.lithium_ion.ElectrodeSOH()
-                esoh_sim = pybamm.Simulation(
-                    esoh_model, parameter_values=self.parameter_values
-                )
+                esoh_sim = pybamm.lithium_ion.ElectrodeSOHSolver(self.parameter_values)
             else:
                 esoh_sim = None
 
@@ -745,7 +949,14 @@ class Simulation:
                     cycle_solution,
                     cycle_sum_vars,
                     cycle_first_state,
-                ) = pybamm.make_cycle_solution(starting_solution.steps, esoh_sim, True)
+                ) = pybamm.make_cycle_solution(
+                    starting_solution.steps,
+                    esoh_sim,
+                    True,
+                    self._update_summary_reducer(
+                        None, starting_solution, summary_reductions
+                    ),
+                )
                 starting_solution_cycles = [cycle_solution]
                 starting_solution_summary_variables = [cycle_sum_vars]
                 starting_solution_first_states = [cycle_first_state]
@@ -764,9 +975,19 @@ class Simulation:
             all_first_states = starting_solution_first_states
             current_solution = starting_solution
 
+            if not isinstance(output_policy, dict):
+                output_policy = {None: output_policy}
+            default_output_policy = (
+                output_policy.get(None) or pybamm.FixedPeriodOutput()
+            )
+
+            if isinstance(storage, str):
+                storage = pybamm.MemoryMappedStorage(storage)
+
             voltage_stop = self.experiment.termination.get("voltage")
             logs["stopping conditions"] = {"voltage": voltage_stop}
 
+            summary_reducer = None
             idx = 0
             num_cycles = len(self.experiment.cycle_lengths)
             feasible = True  # simulation will stop if experiment is infeasible
@@ -782,9 +1003,11 @@ class Simulation:
 
                 steps = []
                 cycle_solution = None
+                if summary_reducer is not None:
+                    summary_reducer.reset()
 
                 # Decide whether we should save this cycle
-                save_this_cycle = (
+                save_this_cycle = keep_in_memory and (
                     # always save cycle 1
                     cycle_num == 1
                     # None: save all cycles
@@ -822,8 +1045,10 @@ class Simulation:
                         start_time = current_solution.t[-1]
                     inputs.update({"start time": start_time})
                     kwargs["inputs"] = inputs
-                    # Make sure we take at least 2 timesteps
-                    npts = max(int(round(dt / exp_inputs["period"])) + 1, 2)
+                    step_output_policy = output_policy.get(
+                        op_conds_str, default_output_policy
+                    )
+                    npts = step_output_policy.get_npts(dt, exp_inputs["period"])
                     try:
                         step_solution = solver.step(
                             current_solution,
@@ -843,11 +1068,19 @@ class Simulation:
                         # Otherwise, just stop this cycle
                         break
 
+                    summary_reducer = self._update_summary_reducer(
+                        summary_reducer, step_solution, summary_reductions
+                    )
+                    step_solution = step_output_policy.decimate(step_solution)
+                    if storage is not None:
+                        step_solution.move_to_storage(storage)
                     steps.append(step_solution)
                     current_solution = step_solution
 
                     cycle_solution = cycle_solution + step_solution
 
+                    logs["step solution"] = step_solution
+                    logs["stored points"] = len(step_solution.t)
                     callbacks.on_step_end(logs)
 
                     logs["termination"] = step_solution.termination
@@ -863,7 +1096,7 @@ class Simulation:
                     # Increment index for next iteration
                     idx += 1
 
-                if save_this_cycle or feasible is False:
+                if save_this_cycle or (feasible is False and keep_in_memory):
                     self._solution = self._solution + cycle_solution
 
                 # At the final step of the inner loop we save the cycle
@@ -872,6 +1105,7 @@ class Simulation:
                         steps,
                         esoh_sim,
                         save_this_cycle=save_this_cycle,
+                        summary_reducer=summary_reducer,
                     )
                     cycle_solution, cycle_sum_vars, cycle_first_state = cycle_sol
                     all_cycle_solutions.append(cycle_solution)
@@ -915,6 +1149,9 @@ class Simulation:
                     callbacks.on_experiment_infeasible(logs)
                     break
 
+            if not keep_in_memory and current_solution is not None:
+                self._solution = current_solution.last_state
+
             if self.solution is not None and len(all_cycle_solutions) > 0:
                 self.solution.cycles = all_cycle_solutions
                 self.solution.set_summary_variables(all_summary_variables)
@@ -933,6 +1170,52 @@ class Simulation:
 
         return self.solution
 
+    def _solve_with_build_cache(self, solver, t_eval, **kwargs):
+        """
+        Solve the built model, reusing the solver set-up stored in the build cache if
+        it matches `solver` and the inputs, and storing the set-up in the cache
+        otherwise.
+        """
+        model = self.built_model
+        # Solvers that keep set-up data of their own (rather than in the model)
+        # can't reuse a set-up from the cache
+        cacheable = type(solver).set_up is pybamm.BaseSolver.set_up
+        if cacheable:
+            inputs = kwargs.get("inputs") or {}
+            if isinstance(inputs, list):
+                inputs = inputs[0]
+            set_up = self.build_cache.key(
+                type(solver),
+                solver.name,
+                getattr(solver.root_method, "name", solver.root_method),
+                {name: np.shape(value) for name, value in inputs.items()},
+                kwargs.get("calculate_sensitivities", False),
+            )
+            if self._cached_set_up == set_up and model not in solver.models_set_up:
+                pybamm.logger.info("Using solver set-up from cache")
+                solver.models_set_up[model] = {
+                    "initial conditions": model.concatenated_initial_conditions
+                }
+
+        self._solution = solver.solve(model, t_eval, **kwargs)
+
+        if cacheable and self._cached_set_up != set_up:
+            self.build_cache.save(self._build_cache_key, model, set_up=set_up)
+            self._cached_set_up = set_up
+
+    @staticmethod
+    def _update_summary_reducer(summary_reducer, solution, summary_reductions):
+        """
+        Update the summary variables of the current cycle with a solution, creating
+        the reducer from the model of the solution if there is none yet
+        """
+        if summary_reducer is None:
+            summary_reducer = pybamm.SummaryVariableReducer.from_model(
+                solution.all_models[0], summary_reductions
+            )
+        summary_reducer.update(solution)
+        return summary_reducer
+
     def step(
         self, dt, solver=None, npts=2, save=True, starting_solution=None, **kwargs
     ):
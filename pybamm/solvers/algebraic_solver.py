@@ -96,6 +96,7 @@ class AlgebraicSolver(pybamm.BaseSolver):
 
         timer = pybamm.Timer()
         integration_time = 0
+        root_iterations = 0
         for idx, t in enumerate(t_eval):
 
             def root_fun(y_alg):
@@ -205,6 +206,10 @@ class AlgebraicSolver(pybamm.BaseSolver):
                     )
                     integration_time += timer.time()
 
+                # Use the number of function evaluations for methods that don't
+                # report the number of iterations
+                root_iterations += sol.get("nit", sol.get("nfev", 0))
+
                 if sol.success and np.all(abs(sol.fun) < self.tol):
                     # update initial guess for the next iteration
                     y0_alg = sol.x
@@ -233,4 +238,5 @@ class AlgebraicSolver(pybamm.BaseSolver):
         # Return solution object (no events, so pass None to t_event, y_event)
         sol = pybamm.Solution(t_eval, y_sol, model, inputs_dict, termination="success")
         sol.integration_time = integration_time
+        sol.root_iterations = root_iterations
         return sol
@@ -5,9 +5,13 @@ import copy
 import itertools
 from scipy.sparse import block_diag
 import multiprocessing as mp
+import multiprocessing.pool
 import numbers
+import pickle
 import sys
+import threading
 import warnings
+import weakref
 
 import casadi
 import numpy as np
@@ -38,8 +42,39 @@ class BaseSolver(object):
         The tolerance for the initial-condition solver (default is 1e-6).
     extrap_tol : float, optional
         The tolerance to assert whether extrapolation occurs or not. Default is 0.
+
+    Attributes
+    ----------
+    parallel_backend : str or pool
+        How to solve for a list of input parameter sets (see :meth:`solve`):
+
+            - "processes" (default): use a pool of worker processes that is owned \
+            by the solver. A snapshot of the solver's options and the model is \
+            sent to each worker once, when the pool is created. The pool is kept \
+            between calls to `solve` (and the steps of an experiment) until the \
+            solver options or the model change, :meth:`close_pool` is called or \
+            the solver is garbage collected. Using the solver as a context manager \
+            (`with solver: ...`) shuts the pool down at the end of the block.
+            - "threads": as "processes", with a pool of threads, which is only \
+            faster for solvers that release the GIL while integrating (e.g. \
+            CasADi, IDAKLU). Each thread has its own copy of the solver and model.
+            - a pool object with a `starmap` method (e.g. a user-managed \
+            `multiprocessing.Pool`), to which chunks of input parameter sets are \
+            submitted.
+    consistent_state_cache : :class:`pybamm.ConsistentStateCache`
+        If not None (default), a cache of converged algebraic states used as initial
+        guesses when calculating consistent initial conditions
+    root_iterations : int
+        The total number of root-finder iterations used to calculate consistent
+        initial conditions (if reported by the root method). The number used for
+        each call to :meth:`step` is also stored in the returned solution, as
+        `solution.root_iterations`
     """
 
+    # Options for `parallel_backend` (other than a user-supplied pool), extended by
+    # solvers that have their own way of solving for several inputs at once
+    _parallel_backends = ["processes", "threads"]
+
     def __init__(
         self,
         method=None,
@@ -57,6 +92,16 @@ class BaseSolver(object):
         self.extrap_tol = extrap_tol
         self.models_set_up = {}
 
+        # Pool used to solve for lists of inputs, created when first needed
+        self._pool = None
+        self._pool_key = None
+        self._pool_finalizer = None
+        self._pool_context_depth = 0
+        self._parallel_backend = "processes"
+
+        self.consistent_state_cache = None
+        self.root_iterations = 0
+
         # Defaults, can be overwritten by specific solver
         self.name = "Base solver"
         self.ode_solver = False
@@ -82,13 +127,171 @@ class BaseSolver(object):
             raise pybamm.SolverError("Root method must be an algebraic solver")
         self._root_method = method
 
+    @property
+    def parallel_backend(self):
+        return self._parallel_backend
+
+    @parallel_backend.setter
+    def parallel_backend(self, backend):
+        if not (backend in self._parallel_backends or hasattr(backend, "starmap")):
+            raise pybamm.SolverError(
+                "parallel_backend must be one of {} or a pool object with a "
+                "'starmap' method".format(self._parallel_backends)
+            )
+        self.close_pool()
+        self._parallel_backend = backend
+
     def copy(self):
         """Returns a copy of the solver"""
         new_solver = copy.copy(self)
         # clear models_set_up
         new_solver.models_set_up = {}
+        # the pool belongs to the original solver
+        new_solver._pool = None
+        new_solver._pool_key = None
+        new_solver._pool_finalizer = None
+        new_solver._pool_context_depth = 0
         return new_solver
 
+    def __getstate__(self):
+        # Pools cannot be pickled (and are specific to this process)
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_pool_key"] = None
+        state["_pool_finalizer"] = None
+        state["_pool_context_depth"] = 0
+        if not isinstance(self._parallel_backend, str):
+            state["_parallel_backend"] = "processes"
+        return state
+
+    def __enter__(self):
+        """
+        Shut down the pool of workers used to solve for lists of inputs at the end of
+        the `with` block
+        """
+        self._pool_context_depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._pool_context_depth -= 1
+        if self._pool_context_depth == 0:
+            self.close_pool()
+
+    def close_pool(self):
+        """
+        Shut down the pool of workers used to solve for lists of inputs, if the solver
+        has created one. A new pool is created the next time it is needed. The pool
+        is also shut down when the solver is garbage collected.
+        """
+        if self._pool is not None:
+            self._pool_finalizer()
+        self._pool = None
+        self._pool_key = None
+
+    def _pool_snapshot(self):
+        """
+        Return a pickled copy of the solver for the workers of its pool, with its
+        options but without any set-up or results of previous solves, so that the
+        workers do not refer back to this solver and the pickle only changes when
+        the options do
+        """
+        solver = self.copy()
+        solver.consistent_state_cache = None
+        solver.root_iterations = 0
+        return pickle.dumps(solver, pickle.HIGHEST_PROTOCOL)
+
+    def _set_up_worker(self, model, inputs):
+        """
+        Prepare a worker's copy of the solver (see :meth:`_pool_snapshot`) to
+        integrate its copy of `model`. The CasADi (or python) functions created when
+        the model was set up are pickled with the model, so nothing needs to be done
+        unless the solver keeps its own set-up.
+        """
+
+    def _get_pool(self, model, ext_and_inputs, nproc):
+        """
+        Return the solver's pool of workers for solving `model`, creating it if the
+        current pool was set up for a different model, number of processes or
+        solver options.
+        """
+        backend = self.parallel_backend
+        if hasattr(backend, "starmap"):
+            return backend
+        snapshot = self._pool_snapshot()
+        key = (model, nproc, snapshot)
+        if self._pool is None or self._pool_key != key:
+            self.close_pool()
+            # Send the snapshot of the solver and the (set up) model to each worker
+            # only once. The workers do not refer to the solver, so that it can be
+            # garbage collected (which shuts down the pool)
+            initargs = (
+                snapshot,
+                pickle.dumps((model, ext_and_inputs), pickle.HIGHEST_PROTOCOL),
+            )
+            if backend == "threads":
+                pool_class = mp.pool.ThreadPool
+            else:
+                pool_class = mp.Pool
+            self._pool = pool_class(
+                processes=nproc, initializer=_initialise_worker, initargs=initargs
+            )
+            self._pool_key = key
+            self._pool_finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+
+    def _integrate_in_parallel(self, model, t_eval, ext_and_inputs_list, nproc):
+        """
+        Integrate `model` for each set of inputs in `ext_and_inputs_list`, using the
+        pool of workers given by `self.parallel_backend`. Inputs are submitted in
+        one chunk per worker, and workers return the solution data as plain arrays,
+        so that the model is not pickled with every task and every solution. The
+        solver's own pool is kept for the next call, unless a task fails.
+        """
+        pool = self._get_pool(model, ext_and_inputs_list[0], nproc)
+        ninputs = len(ext_and_inputs_list)
+        nworkers = nproc or mp.cpu_count()
+        chunksize = max(ninputs // nworkers + (ninputs % nworkers > 0), 1)
+
+        try:
+            if self.parallel_backend in ["processes", "threads"]:
+                # The workers' copies of the model may have a different y0
+                tasks = [(t_eval, inputs, model.y0) for inputs in ext_and_inputs_list]
+                compact_solutions = pool.starmap(
+                    _integrate_in_worker, tasks, chunksize=chunksize
+                )
+            else:
+                # User-supplied pool: the model has to be sent with the tasks, but is
+                # only pickled once per chunk
+                tasks = [
+                    (self, model, t_eval, inputs) for inputs in ext_and_inputs_list
+                ]
+                compact_solutions = pool.starmap(
+                    _integrate_compact, tasks, chunksize=chunksize
+                )
+        except BaseException:
+            # The workers might still be busy with the other tasks
+            self.close_pool()
+            raise
+        return [
+            _solution_from_compact(model, compact) for compact in compact_solutions
+        ]
+
+    def clear_set_up(self, model=None):
+        """
+        Remove the set-up of a model, so that it is set up again the next time it is
+        solved (e.g. after it has been modified in place).
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`, optional
+            The model whose set-up to remove. If None (default), the set-up of all
+            the models is removed.
+        """
+        if model is None:
+            self.models_set_up.clear()
+        else:
+            self.models_set_up.pop(model, None)
+
     def set_up(self, model, inputs=None, t_eval=None, ics_only=False):
         """Unpack model, perform checks, and calculate jacobian.
 
@@ -390,8 +593,15 @@ class BaseSolver(object):
                 if use_jacobian:
                     report(f"Calculating jacobian for {name}")
                     jac = jacobian.jac(symbol, y)
-                    report(f"Converting jacobian for {name} to python")
-                    jac = pybamm.EvaluatorPython(jac)
+                    if model.use_sparse_jacobian:
+                        report(
+                            f"Converting jacobian for {name} to python, computing "
+                            "only structural non-zeros"
+                        )
+                        jac = pybamm.EvaluatorPythonSparseJacobian(jac)
+                    else:
+                        report(f"Converting jacobian for {name} to python")
+                        jac = pybamm.EvaluatorPython(jac)
                     # cannot do jacobian action efficiently for now
                     jac_action = None
                 else:
@@ -814,6 +1024,12 @@ class BaseSolver(object):
         pybamm.logger.debug("Start calculating consistent states")
         if self.root_method is None:
             return model.y0
+        cache = self.consistent_state_cache
+        if cache is not None:
+            y0_guess = cache.get(model, inputs, model.y0)
+            if y0_guess is not None:
+                pybamm.logger.debug("Using cached algebraic states as initial guess")
+                model.y0 = y0_guess
         try:
             root_sol = self.root_method._integrate(model, np.array([time]), inputs)
         except pybamm.SolverError as e:
@@ -821,8 +1037,11 @@ class BaseSolver(object):
                 "Could not find consistent states: {}".format(e.args[0])
             )
         pybamm.logger.debug("Found consistent states")
+        self.root_iterations += getattr(root_sol, "root_iterations", 0)
 
         y0 = root_sol.all_ys[0]
+        if cache is not None:
+            cache.put(model, inputs, y0)
         return y0
 
     def solve(
@@ -857,8 +1076,9 @@ class BaseSolver(object):
             `model.concatenated_initial_conditions` is used. Otherwise, must be a symbol
             of size `len(model.rhs) + len(model.algebraic)`.
         nproc : int, optional
-            Number of processes to use when solving for more than one set of input
-            parameters. Defaults to value returned by "os.cpu_count()".
+            Number of processes (or threads) to use when solving for more than one set
+            of input parameters. Defaults to value returned by "os.cpu_count()". See
+            `parallel_backend` for how the inputs are distributed.
         calculate_sensitivites : list of str or bool
             If true, solver calculates sensitivities of all input parameters.
             If only a subset of sensitivities are required, can also pass a
@@ -948,10 +1168,7 @@ class BaseSolver(object):
             model.calculate_sensitivities = []
         model.calculate_sensitivities.sort()
         if calculate_sensitivities_list != model.calculate_sensitivities:
-            self.models_set_up.pop(model, None)
-            # CasadiSolver caches its integrators using model, so delete this too
-            if isinstance(self, pybamm.CasadiSolver):
-                self.integrators.pop(model, None)
+            self.clear_set_up(model)
 
         # save sensitivity parameters so we can identify them later on
         # (FYI: this is used in the Solution class)
@@ -969,12 +1186,15 @@ class BaseSolver(object):
             self.models_set_up.update(
                 {model: {"initial conditions": model.concatenated_initial_conditions}}
             )
+            # Workers have an out-of-date copy of the model
+            self.close_pool()
         else:
             ics_set_up = self.models_set_up[model]["initial conditions"]
             # Check that initial conditions have not been updated
             if ics_set_up != model.concatenated_initial_conditions:
                 # If the new initial conditions are different, set up again
                 self.set_up(model, ext_and_inputs_list[0], t_eval, ics_only=True)
+                self.close_pool()
                 self.models_set_up[model][
                     "initial conditions"
                 ] = model.concatenated_initial_conditions
@@ -1087,17 +1307,12 @@ class BaseSolver(object):
                 )
                 new_solutions = [new_solution]
             else:
-                with mp.Pool(processes=nproc) as p:
-                    new_solutions = p.starmap(
-                        self._integrate,
-                        zip(
-                            [model] * ninputs,
-                            [t_eval_dimensionless[start_index:end_index]] * ninputs,
-                            ext_and_inputs_list,
-                        ),
-                    )
-                    p.close()
-                    p.join()
+                new_solutions = self._integrate_in_parallel(
+                    model,
+                    t_eval_dimensionless[start_index:end_index],
+                    ext_and_inputs_list,
+                    nproc,
+                )
             # Setting the solve time for each segment.
             # pybamm.Solution.__add__ assumes attribute solve_time.
             solve_time = timer.time()
@@ -1114,7 +1329,7 @@ class BaseSolver(object):
 
             if end_index != len(t_eval_dimensionless):
                 # setup for next integration subsection
-                last_state = solutions[0].y[:, -1]
+                last_state = solutions[0].final_state
                 # update y0 (for DAE solvers, this updates the initial guess for the
                 # rootfinder)
                 model.y0 = last_state
@@ -1294,7 +1509,7 @@ class BaseSolver(object):
             t = old_solution.all_ts[-1][-1]
             if old_solution.all_models[-1] == model:
                 # initialize with old solution
-                model.y0 = old_solution.all_ys[-1][:, -1]
+                model.y0 = old_solution.final_state
             else:
                 model.y0 = model.set_initial_conditions_from(
                     old_solution
@@ -1302,7 +1517,9 @@ class BaseSolver(object):
         set_up_time = timer.time()
 
         # (Re-)calculate consistent initial conditions
+        root_iterations = self.root_iterations
         self._set_initial_conditions(model, ext_and_inputs, update_rhs=False)
+        root_iterations = self.root_iterations - root_iterations
 
         # Non-dimensionalise dt
         dt_dimensionless = dt / model.timescale_eval
@@ -1335,6 +1552,7 @@ class BaseSolver(object):
 
         # Assign setup time
         solution.set_up_time = set_up_time
+        solution.root_iterations = root_iterations
 
         # Report times
         pybamm.logger.verbose("Finish stepping {} ({})".format(model.name, termination))
@@ -1354,7 +1572,10 @@ class BaseSolver(object):
         if save is False:
             return solution
         else:
-            return old_solution + solution
+            solution = old_solution + solution
+            # root-finder iterations of the latest step only
+            solution.root_iterations = root_iterations
+            return solution
 
     def get_termination_reason(self, solution, events):
         """
@@ -1447,6 +1668,10 @@ class BaseSolver(object):
         """
         extrap_events = {}
 
+        # The events can only be evaluated if the solution contains the states
+        if solution.output_variables is not None:
+            events = []
+
         for event in events:
             if event.event_type == pybamm.EventType.INTERPOLANT_EXTRAPOLATION:
                 # First set to False, then loop through and change to True if any
@@ -1501,3 +1726,70 @@ class BaseSolver(object):
 
         ext_and_inputs = {**external_variables, **ordered_inputs}
         return ext_and_inputs
+
+
+# Solver and model used by each worker (process or thread) of a solver's pool. These
+# are sent to each worker once, when the pool is created, rather than with every task
+_worker = threading.local()
+
+
+def _initialise_worker(snapshot, pickled_model_and_inputs):
+    solver = pickle.loads(snapshot)
+    model, inputs = pickle.loads(pickled_model_and_inputs)
+    solver._set_up_worker(model, inputs)
+    _worker.solver = solver
+    _worker.model = model
+
+
+def _integrate_in_worker(t_eval, inputs, y0):
+    _worker.model.y0 = y0
+    return _integrate_compact(_worker.solver, _worker.model, t_eval, inputs)
+
+
+def _integrate_compact(solver, model, t_eval, inputs):
+    """
+    Integrate the model and return the solution data as arrays, without the model
+    """
+    solution = solver._integrate(model, t_eval, inputs)
+    return (
+        solution.all_ts,
+        solution.all_ys,
+        solution.all_inputs,
+        solution.t_event,
+        solution.y_event,
+        solution.termination,
+        solution._sensitivities,
+        solution.integration_time,
+        solution.closest_event_idx,
+        solution.output_variables,
+    )
+
+
+def _solution_from_compact(model, compact):
+    """Create a Solution from the output of `_integrate_compact`"""
+    (
+        all_ts,
+        all_ys,
+        all_inputs,
+        t_event,
+        y_event,
+        termination,
+        sensitivities,
+        integration_time,
+        closest_event_idx,
+        output_variables,
+    ) = compact
+    solution = pybamm.Solution(
+        all_ts,
+        all_ys,
+        [model] * len(all_ts),
+        all_inputs,
+        t_event,
+        y_event,
+        termination,
+        sensitivities=sensitivities,
+        output_variables=output_variables,
+    )
+    solution.integration_time = integration_time
+    solution.closest_event_idx = closest_event_idx
+    return solution
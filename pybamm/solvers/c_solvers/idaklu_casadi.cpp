@@ -1,6 +1,14 @@
 #include "idaklu_casadi.hpp"
 #include "idaklu_python.hpp"
 
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <limits>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
 #include <vector>
 
 #include <iostream>
@@ -28,13 +36,24 @@ public:
     m_res.resize(sz_res);
     m_iw.resize(sz_iw);
     m_w.resize(sz_w);
+
+    // the memory objects of a Function are shared between threads, so check
+    // one out for the lifetime of this wrapper rather than at every call
+    std::lock_guard<std::mutex> lock(checkout_mutex);
+    m_mem = m_func.checkout();
+  }
+
+  ~CasadiFunction() {
+    std::lock_guard<std::mutex> lock(checkout_mutex);
+    m_func.release(m_mem);
   }
 
+  CasadiFunction(const CasadiFunction &) = delete;
+  CasadiFunction &operator=(const CasadiFunction &) = delete;
+
   // only call this once m_arg and m_res have been set appropriatelly
   void operator()() {
-    int mem = m_func.checkout();
-    m_func(m_arg.data(), m_res.data(), m_iw.data(), m_w.data(), mem);
-    m_func.release(mem);
+    m_func(m_arg.data(), m_res.data(), m_iw.data(), m_w.data(), m_mem);
   }
 
 public:
@@ -42,11 +61,15 @@ public:
   std::vector<double *> m_res;
 
 private:
+  static std::mutex checkout_mutex;
   const Function &m_func;
+  int m_mem;
   std::vector<casadi_int> m_iw;
   std::vector<double> m_w;
 };
 
+std::mutex CasadiFunction::checkout_mutex;
+
 
 class CasadiFunctions {
 public:
@@ -57,9 +80,9 @@ public:
   CasadiFunction rhs_alg;
   CasadiFunction sens;
   CasadiFunction jac_times_cjmass;
-  const np_array_int &jac_times_cjmass_rowvals;
-  const np_array_int &jac_times_cjmass_colptrs;
-  const np_array_dense &inputs;
+  const int64_t *jac_times_cjmass_rowvals;
+  const int64_t *jac_times_cjmass_colptrs;
+  const realtype *inputs;
   CasadiFunction jac_action;
   CasadiFunction mass_action;
   CasadiFunction events;
@@ -67,9 +90,9 @@ public:
   CasadiFunctions(const Function &rhs_alg, 
                   const Function &jac_times_cjmass,
                   const int jac_times_cjmass_nnz,
-                  const np_array_int &jac_times_cjmass_rowvals,
-                  const np_array_int &jac_times_cjmass_colptrs,
-                  const np_array_dense &inputs,
+                  const int64_t *jac_times_cjmass_rowvals,
+                  const int64_t *jac_times_cjmass_colptrs,
+                  const realtype *inputs,
                   const Function &jac_action,
                   const Function &mass_action,
                   const Function &sens,
@@ -115,10 +138,9 @@ int residual_casadi(realtype tres, N_Vector yy, N_Vector yp, N_Vector rr,
   //std::cout << "]" << std::endl;
   // args are t, y, put result in rr
   
-  py::buffer_info input_buf = p_python_functions->inputs.request();
   p_python_functions->rhs_alg.m_arg[0] = &tres;
   p_python_functions->rhs_alg.m_arg[1] = NV_DATA_S(yy);
-  p_python_functions->rhs_alg.m_arg[2] = static_cast<realtype *>(input_buf.ptr);
+  p_python_functions->rhs_alg.m_arg[2] = p_python_functions->inputs;
   p_python_functions->rhs_alg.m_res[0] = NV_DATA_S(rr);
   p_python_functions->rhs_alg();
 
@@ -183,10 +205,9 @@ int jtimes_casadi(realtype tt, N_Vector yy, N_Vector yp, N_Vector rr,
       static_cast<CasadiFunctions *>(user_data);
 
   // rr has ∂F/∂y v
-  py::buffer_info input_buf = p_python_functions->inputs.request();
   p_python_functions->jac_action.m_arg[0] = &tt;
   p_python_functions->jac_action.m_arg[1] = NV_DATA_S(yy);
-  p_python_functions->jac_action.m_arg[2] = static_cast<realtype *>(input_buf.ptr);
+  p_python_functions->jac_action.m_arg[2] = p_python_functions->inputs;
   p_python_functions->jac_action.m_arg[3] = NV_DATA_S(v);
   p_python_functions->jac_action.m_res[0] = NV_DATA_S(rr);
   p_python_functions->jac_action();
@@ -233,18 +254,16 @@ int jacobian_casadi(realtype tt, realtype cj, N_Vector yy, N_Vector yp,
   realtype *jac_data = SUNSparseMatrix_Data(JJ);
 
   // args are t, y, cj, put result in jacobian data matrix
-  py::buffer_info input_buf = p_python_functions->inputs.request();
   p_python_functions->jac_times_cjmass.m_arg[0] = &tt;
   p_python_functions->jac_times_cjmass.m_arg[1] = NV_DATA_S(yy);
-  p_python_functions->jac_times_cjmass.m_arg[2] = static_cast<realtype *>(input_buf.ptr);
+  p_python_functions->jac_times_cjmass.m_arg[2] = p_python_functions->inputs;
   p_python_functions->jac_times_cjmass.m_arg[3] = &cj;
   p_python_functions->jac_times_cjmass.m_res[0] = jac_data; 
   p_python_functions->jac_times_cjmass();
 
   // row vals and col ptrs
-  const np_array &jac_times_cjmass_rowvals = p_python_functions->jac_times_cjmass_rowvals;
-  const int n_row_vals = jac_times_cjmass_rowvals.request().size;
-  auto p_jac_times_cjmass_rowvals = jac_times_cjmass_rowvals.unchecked<1>();
+  const int64_t *p_jac_times_cjmass_rowvals = p_python_functions->jac_times_cjmass_rowvals;
+  const int n_row_vals = p_python_functions->number_of_nnz;
 
   //std::cout << "jac_data = [";
   //for (int i = 0; i < p_python_functions->number_of_nnz; i++) {
@@ -259,9 +278,8 @@ int jacobian_casadi(realtype tt, realtype cj, N_Vector yy, N_Vector yp,
     jac_rowvals[i] = p_jac_times_cjmass_rowvals[i];
   }
 
-  const np_array &jac_times_cjmass_colptrs = p_python_functions->jac_times_cjmass_colptrs;
-  const int n_col_ptrs = jac_times_cjmass_colptrs.request().size;
-  auto p_jac_times_cjmass_colptrs = jac_times_cjmass_colptrs.unchecked<1>();
+  const int64_t *p_jac_times_cjmass_colptrs = p_python_functions->jac_times_cjmass_colptrs;
+  const int n_col_ptrs = p_python_functions->number_of_states + 1;
 
   // just copy across col ptrs (do I need to do this every time?)
   for (int i = 0; i < n_col_ptrs; i++) {
@@ -290,10 +308,9 @@ int events_casadi(realtype t, N_Vector yy, N_Vector yp, realtype *events_ptr,
   //std::cout << "]" << std::endl;
 
   // args are t, y, put result in events_ptr
-  py::buffer_info input_buf = p_python_functions->inputs.request();
   p_python_functions->events.m_arg[0] = &t;
   p_python_functions->events.m_arg[1] = NV_DATA_S(yy);
-  p_python_functions->events.m_arg[2] = static_cast<realtype *>(input_buf.ptr);
+  p_python_functions->events.m_arg[2] = p_python_functions->inputs;
   p_python_functions->events.m_res[0] = events_ptr; 
   p_python_functions->events();
 
@@ -363,10 +380,9 @@ int sensitivities_casadi(int Ns, realtype t, N_Vector yy, N_Vector yp,
   //}
 
   // args are t, y put result in rr
-  py::buffer_info input_buf = p_python_functions->inputs.request();
   p_python_functions->sens.m_arg[0] = &t;
   p_python_functions->sens.m_arg[1] = NV_DATA_S(yy);
-  p_python_functions->sens.m_arg[2] = static_cast<realtype *>(input_buf.ptr);
+  p_python_functions->sens.m_arg[2] = p_python_functions->inputs;
   for (int i = 0; i < np; i++) {
     p_python_functions->sens.m_res[i] = NV_DATA_S(resvalS[i]);
   }
@@ -385,7 +401,7 @@ int sensitivities_casadi(int Ns, realtype t, N_Vector yy, N_Vector yp,
     realtype *tmp = p_python_functions->get_tmp();
     p_python_functions->jac_action.m_arg[0] = &t;
     p_python_functions->jac_action.m_arg[1] = NV_DATA_S(yy);
-    p_python_functions->jac_action.m_arg[2] = static_cast<realtype *>(input_buf.ptr);
+    p_python_functions->jac_action.m_arg[2] = p_python_functions->inputs;
     p_python_functions->jac_action.m_arg[3] = NV_DATA_S(yS[i]);
     p_python_functions->jac_action.m_res[0] = tmp;
     p_python_functions->jac_action();
@@ -427,13 +443,75 @@ int sensitivities_casadi(int Ns, realtype t, N_Vector yy, N_Vector yp,
 
 
 
+// The arguments of solve_casadi that are the same for every set of inputs,
+// copied out of the numpy arrays so that they can be used without the GIL
+struct CasadiProblem
+{
+  CasadiProblem(np_array t_np, np_array y0_np, np_array yp0_np,
+                const np_array_int &jac_times_cjmass_colptrs_np,
+                const np_array_int &jac_times_cjmass_rowvals_np,
+                np_array rhs_alg_id_np, np_array atol_np)
+      : t(to_vector(t_np)), y0(to_vector(y0_np)), yp0(to_vector(yp0_np)),
+        jac_times_cjmass_colptrs(to_vector(jac_times_cjmass_colptrs_np)),
+        jac_times_cjmass_rowvals(to_vector(jac_times_cjmass_rowvals_np)),
+        rhs_alg_id(to_vector(rhs_alg_id_np)), atol(to_vector(atol_np))
+  {
+  }
+
+  template <typename T>
+  static std::vector<T> to_vector(const py::array_t<T> &array)
+  {
+    auto data = array.template unchecked<1>();
+    std::vector<T> vector(data.shape(0));
+    for (py::ssize_t i = 0; i < data.shape(0); i++)
+    {
+      vector[i] = data(i);
+    }
+    return vector;
+  }
+
+  std::vector<realtype> t;
+  std::vector<realtype> y0;
+  std::vector<realtype> yp0;
+  std::vector<int64_t> jac_times_cjmass_colptrs;
+  std::vector<int64_t> jac_times_cjmass_rowvals;
+  std::vector<realtype> rhs_alg_id;
+  std::vector<realtype> atol;
+};
+
+// The output of a single solve. y has shape (number of times, number of
+// states), or (number of times, total size of the outputs) if there are output
+// functions, and yS has shape (number of parameters, number of times, number
+// of states), both in row-major order. y_final is the state at the last time
+struct SolutionData
+{
+  int flag;
+  int number_of_timesteps;
+  std::vector<realtype> t;
+  std::vector<realtype> y;
+  std::vector<realtype> yS;
+  std::vector<realtype> y_final;
+};
+
+// Move a vector into a numpy array, without copying its data
+template <typename T>
+py::array_t<T> to_np_array(std::vector<T> &&vector,
+                           std::vector<ptrdiff_t> shape)
+{
+  auto *data = new std::vector<T>(std::move(vector));
+  py::capsule free_when_done(data, [](void *f) {
+    delete reinterpret_cast<std::vector<T> *>(f);
+  });
+  return py::array_t<T>(shape, data->data(), free_when_done);
+}
+
 /* main program */
-  
-Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
+
+// Solve the problem for one set of inputs. This does not use any Python
+// objects, so can be called without holding the GIL
+SolutionData solve_casadi_data(const CasadiProblem &problem,
                const Function &rhs_alg, 
                const Function &jac_times_cjmass, 
-               const np_array_int &jac_times_cjmass_colptrs, 
-               const np_array_int &jac_times_cjmass_rowvals, 
                const int jac_times_cjmass_nnz,
                const Function &jac_action, 
                const Function &mass_action, 
@@ -441,19 +519,18 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
                const Function &events, 
                const int number_of_events, 
                int use_jacobian, 
-               np_array rhs_alg_id,
-               np_array atol_np, double rel_tol, 
-               np_array_dense inputs,
-               int number_of_parameters)
+               double rel_tol, 
+               const realtype *inputs,
+               int number_of_parameters,
+               const std::vector<Function> &output_functions)
 {
-  
-  auto t = t_np.unchecked<1>();
-  auto y0 = y0_np.unchecked<1>();
-  auto yp0 = yp0_np.unchecked<1>();
-  auto atol = atol_np.unchecked<1>();
+  const std::vector<realtype> &t = problem.t;
+  const std::vector<realtype> &y0 = problem.y0;
+  const std::vector<realtype> &yp0 = problem.yp0;
+  const std::vector<realtype> &atol = problem.atol;
 
-  int number_of_states = y0_np.request().size;
-  int number_of_timesteps = t_np.request().size;
+  int number_of_states = y0.size();
+  int number_of_timesteps = t.size();
   void *ida_mem;          // pointer to memory
   N_Vector yy, yp, avtol; // y, y', and absolute tolerance
   N_Vector *yyS, *ypS;      // y, y' for sensitivities
@@ -496,7 +573,7 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
   ida_mem = IDACreate();
 
   // initialise solver
-  realtype t0 = RCONST(t(0));
+  realtype t0 = RCONST(t[0]);
   IDAInit(ida_mem, residual_casadi, t0, yy, yp);
 
   // set tolerances
@@ -508,12 +585,12 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
   IDARootInit(ida_mem, number_of_events, events_casadi);
 
   // set pybamm functions by passing pointer to it
-  CasadiFunctions pybamm_functions = CasadiFunctions(
+  CasadiFunctions pybamm_functions(
       rhs_alg, 
       jac_times_cjmass, 
       jac_times_cjmass_nnz,
-      jac_times_cjmass_rowvals,
-      jac_times_cjmass_colptrs, 
+      problem.jac_times_cjmass_rowvals.data(),
+      problem.jac_times_cjmass_colptrs.data(), 
       inputs,
       jac_action, mass_action, 
       sens, events,
@@ -547,65 +624,42 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
 
   SUNLinSolInitialize(LS);
 
-  //std::cout << "number of jacobian nz = " << jac_times_cjmass_nnz << std::endl;
-  //N_Vector rr, tmp1, tmp2, tmp3;
-  //rr = N_VNew_Serial(number_of_states);
-  //tmp1 = N_VNew_Serial(number_of_states);
-  //tmp2 = N_VNew_Serial(number_of_states);
-  //tmp3 = N_VNew_Serial(number_of_states);
-  //std::vector<realtype> events_vect(number_of_events);
-  //auto start = std::chrono::high_resolution_clock::now();
-  //for (int i = 0; i < 10; i++) {
-  //  residual_casadi(0, yy, yp, rr, user_data);
-  //}
-  //auto end = std::chrono::high_resolution_clock::now();
-  //std::chrono::duration<double> diff = end - start;
-  //std::cout << "Time to call residual " << diff.count() << " s\n";
-
-  //start = std::chrono::high_resolution_clock::now();
-  //for (int i = 0; i < 10; i++) {
-  //  events_casadi(0, yy, yp, events_vect.data(), user_data);
-  //}
-  //end = std::chrono::high_resolution_clock::now();
-  //diff = end - start;
-  //std::cout << "Time to call events " << diff.count() << " s\n";
-
-  //start = std::chrono::high_resolution_clock::now();
-  //for (int i = 0; i < 10; i++) {
-  //  jacobian_casadi(0, 1, yy, yp, rr, J, user_data, tmp1, tmp2, tmp3);
-  //}
-  //end = std::chrono::high_resolution_clock::now();
-  //diff = end - start;
-  //std::cout << "Time to call jacobian " << diff.count() << " s\n";
+  // output functions of (t, y, inputs), which are evaluated at each time step
+  // instead of storing the whole state
+  std::vector<std::unique_ptr<CasadiFunction>> outputs;
+  std::vector<int> output_offsets{0};
+  for (const Function &output_function : output_functions) {
+    outputs.emplace_back(new CasadiFunction(output_function));
+    output_offsets.push_back(output_offsets.back() + output_function.nnz_out(0));
+  }
+  const int number_of_outputs =
+      outputs.empty() ? number_of_states : output_offsets.back();
+  auto store_y = [&](realtype t_out, realtype *y_out) {
+    if (outputs.empty()) {
+      std::copy(yval, yval + number_of_states, y_out);
+      return;
+    }
+    for (size_t j = 0; j < outputs.size(); j++) {
+      outputs[j]->m_arg[0] = &t_out;
+      outputs[j]->m_arg[1] = yval;
+      outputs[j]->m_arg[2] = inputs;
+      outputs[j]->m_res[0] = y_out + output_offsets[j];
+      (*outputs[j])();
+    }
+  };
 
   int t_i = 1;
   realtype tret;
   realtype t_next;
-  realtype t_final = t(number_of_timesteps - 1);
+  realtype t_final = t[number_of_timesteps - 1];
 
   // set return vectors
-  realtype* t_return = new realtype[number_of_timesteps];
-  realtype* y_return = new realtype[number_of_timesteps * number_of_states];
-  realtype* yS_return = new realtype[number_of_parameters * number_of_timesteps * number_of_states];
-
-  py::capsule free_t_when_done(t_return, [](void *f) {
-            realtype *vect = reinterpret_cast<realtype *>(f);
-            delete[] vect;
-        });
-  py::capsule free_y_when_done(y_return, [](void *f) {
-            realtype *vect = reinterpret_cast<realtype *>(f);
-            delete[] vect;
-        });
-  py::capsule free_yS_when_done(yS_return, [](void *f) {
-            realtype *vect = reinterpret_cast<realtype *>(f);
-            delete[] vect;
-        });
-
-  t_return[0] = t(0);
-  for (int j = 0; j < number_of_states; j++)
-  {
-    y_return[j] = yval[j];
-  }
+  std::vector<realtype> t_return(number_of_timesteps);
+  std::vector<realtype> y_return(number_of_timesteps * number_of_outputs);
+  std::vector<realtype> yS_return(number_of_parameters * number_of_timesteps * number_of_states);
+
+  t_return[0] = t[0];
+  store_y(t[0], &y_return[0]);
   for (int j = 0; j < number_of_parameters; j++) {
     const int base_index = j * number_of_timesteps * number_of_states;
     for (int k = 0; k < number_of_states; k++) {
@@ -615,7 +669,6 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
 
   // calculate consistent initial conditions
   N_Vector id;
-  auto id_np_val = rhs_alg_id.unchecked<1>();
   id = N_VNew_Serial(number_of_states);
   realtype *id_val;
   id_val = N_VGetArrayPointer(id);
@@ -623,15 +676,15 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
   int ii;
   for (ii = 0; ii < number_of_states; ii++)
   {
-    id_val[ii] = id_np_val[ii];
+    id_val[ii] = problem.rhs_alg_id[ii];
   }
 
   IDASetId(ida_mem, id);
-  IDACalcIC(ida_mem, IDA_YA_YDP_INIT, t(1));
+  IDACalcIC(ida_mem, IDA_YA_YDP_INIT, t[1]);
 
   while (true)
   {
-    t_next = t(t_i);
+    t_next = t[t_i];
     IDASetStopTime(ida_mem, t_next);
     retval = IDASolve(ida_mem, t_final, &tret, yy, yp, IDA_NORMAL);
 
@@ -641,10 +694,7 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
       }
 
       t_return[t_i] = tret;
-      for (int j = 0; j < number_of_states; j++)
-      {
-        y_return[t_i * number_of_states + j] = yval[j];
-      }
+      store_y(tret, &y_return[t_i * number_of_outputs]);
       for (int j = 0; j < number_of_parameters; j++) {
         const int base_index = j * number_of_timesteps * number_of_states 
                                + t_i * number_of_states;
@@ -662,14 +712,21 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
     }
   }
 
-  np_array t_ret = np_array(t_i, &t_return[0], free_t_when_done);
-  np_array y_ret = np_array(t_i * number_of_states, &y_return[0], free_y_when_done);
-  np_array yS_ret = np_array(
-      std::vector<ptrdiff_t>{number_of_parameters, t_i, number_of_states},
-      &yS_return[0], free_yS_when_done 
-      );
+  // drop the unused time steps (if the solve stopped early), so that yS has
+  // shape (number_of_parameters, t_i, number_of_states)
+  t_return.resize(t_i);
+  y_return.resize(t_i * number_of_outputs);
+  for (int j = 1; j < number_of_parameters; j++) {
+    std::copy(
+        yS_return.begin() + j * number_of_timesteps * number_of_states,
+        yS_return.begin() + (j * number_of_timesteps + t_i) * number_of_states,
+        yS_return.begin() + j * t_i * number_of_states);
+  }
+  yS_return.resize(number_of_parameters * t_i * number_of_states);
 
-  Solution sol(retval, t_ret, y_ret, yS_ret);
+  SolutionData sol{retval, t_i, std::move(t_return), std::move(y_return),
+                   std::move(yS_return),
+                   std::vector<realtype>(yval, yval + number_of_states)};
 
   // TODO config input to choose stuff like this
   const bool print_stats = false;
@@ -729,10 +786,156 @@ Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
 
   IDAFree(&ida_mem);
 
-  //std::cout << "finished solving 9" << std::endl;
+  return sol;
+}
+
+Solution solve_casadi(np_array t_np, np_array y0_np, np_array yp0_np,
+               const Function &rhs_alg, 
+               const Function &jac_times_cjmass, 
+               const np_array_int &jac_times_cjmass_colptrs, 
+               const np_array_int &jac_times_cjmass_rowvals, 
+               const int jac_times_cjmass_nnz,
+               const Function &jac_action, 
+               const Function &mass_action, 
+               const Function &sens, 
+               const Function &events, 
+               const int number_of_events, 
+               int use_jacobian, 
+               np_array rhs_alg_id,
+               np_array atol_np, double rel_tol, 
+               np_array_dense inputs,
+               int number_of_parameters,
+               const std::vector<Function> &output_functions)
+{
+  const CasadiProblem problem(t_np, y0_np, yp0_np, jac_times_cjmass_colptrs,
+                              jac_times_cjmass_rowvals, rhs_alg_id, atol_np);
+  const int number_of_states = problem.y0.size();
+  const realtype *p_inputs = inputs.data();
+
+  SolutionData sol;
+  {
+    py::gil_scoped_release release;
+    sol = solve_casadi_data(problem, rhs_alg, jac_times_cjmass,
+                            jac_times_cjmass_nnz, jac_action, mass_action,
+                            sens, events, number_of_events, use_jacobian,
+                            rel_tol, p_inputs, number_of_parameters,
+                            output_functions);
+  }
 
-  //std::cout << "finished solving 10" << std::endl;
+  const int t_i = sol.number_of_timesteps;
+  const ptrdiff_t y_size = sol.y.size();
+  np_array t_ret = to_np_array(std::move(sol.t), {t_i});
+  np_array y_ret = to_np_array(std::move(sol.y), {y_size});
+  np_array yS_ret = to_np_array(
+      std::move(sol.yS),
+      std::vector<ptrdiff_t>{number_of_parameters, t_i, number_of_states});
+  np_array y_final_ret = to_np_array(std::move(sol.y_final), {number_of_states});
 
-  return sol;
+  return Solution(sol.flag, t_ret, y_ret, yS_ret, y_final_ret);
 }
 
+BatchSolution solve_casadi_batch(np_array t_np, np_array y0_np, np_array yp0_np,
+               const Function &rhs_alg, 
+               const Function &jac_times_cjmass, 
+               const np_array_int &jac_times_cjmass_colptrs, 
+               const np_array_int &jac_times_cjmass_rowvals, 
+               const int jac_times_cjmass_nnz,
+               const Function &jac_action, 
+               const Function &mass_action, 
+               const Function &sens, 
+               const Function &events, 
+               const int number_of_events, 
+               int use_jacobian, 
+               np_array rhs_alg_id,
+               np_array atol_np, double rel_tol, 
+               np_array_dense inputs,
+               int number_of_parameters,
+               int number_of_threads)
+{
+  if (inputs.ndim() != 2) {
+    throw std::invalid_argument(
+        "inputs must have shape (number of input sets, number of inputs)");
+  }
+  const CasadiProblem problem(t_np, y0_np, yp0_np, jac_times_cjmass_colptrs,
+                              jac_times_cjmass_rowvals, rhs_alg_id, atol_np);
+  const int number_of_states = problem.y0.size();
+  const int number_of_timesteps = problem.t.size();
+  const int number_of_sets = inputs.shape(0);
+  const int number_of_inputs = inputs.shape(1);
+  const realtype *p_inputs = inputs.data();
+
+  // each thread takes the next set of inputs that has not been solved yet, and
+  // solves it with its own IDA and KLU memory
+  std::vector<SolutionData> solutions(number_of_sets);
+  {
+    py::gil_scoped_release release;
+
+    std::atomic<int> next_set(0);
+    std::exception_ptr error = nullptr;
+    std::mutex error_mutex;
+    auto worker = [&]() {
+      try {
+        for (int i = next_set++; i < number_of_sets; i = next_set++) {
+          solutions[i] = solve_casadi_data(
+              problem, rhs_alg, jac_times_cjmass, jac_times_cjmass_nnz,
+              jac_action, mass_action, sens, events, number_of_events,
+              use_jacobian, rel_tol, p_inputs + i * number_of_inputs,
+              number_of_parameters, std::vector<Function>());
+        }
+      } catch (...) {
+        std::lock_guard<std::mutex> lock(error_mutex);
+        if (!error) {
+          error = std::current_exception();
+        }
+      }
+    };
+
+    number_of_threads =
+        std::max(1, std::min(number_of_threads, number_of_sets));
+    std::vector<std::thread> threads;
+    for (int i = 1; i < number_of_threads; i++) {
+      threads.emplace_back(worker);
+    }
+    worker();
+    for (auto &thread : threads) {
+      thread.join();
+    }
+    if (error) {
+      std::rethrow_exception(error);
+    }
+  }
+
+  // stack the solutions, padding those that stopped early with NaN
+  const realtype nan = std::numeric_limits<realtype>::quiet_NaN();
+  const int y_size = number_of_timesteps * number_of_states;
+  std::vector<int64_t> flags(number_of_sets);
+  std::vector<int64_t> lengths(number_of_sets);
+  std::vector<realtype> t_all(number_of_sets * number_of_timesteps, nan);
+  std::vector<realtype> y_all(number_of_sets * y_size, nan);
+  std::vector<realtype> yS_all(number_of_sets * number_of_parameters * y_size,
+                               nan);
+  for (int i = 0; i < number_of_sets; i++) {
+    const SolutionData &sol = solutions[i];
+    const int t_i = sol.number_of_timesteps;
+    flags[i] = sol.flag;
+    lengths[i] = t_i;
+    std::copy(sol.t.begin(), sol.t.end(),
+              t_all.begin() + i * number_of_timesteps);
+    std::copy(sol.y.begin(), sol.y.end(), y_all.begin() + i * y_size);
+    for (int j = 0; j < number_of_parameters; j++) {
+      std::copy(sol.yS.begin() + j * t_i * number_of_states,
+                sol.yS.begin() + (j + 1) * t_i * number_of_states,
+                yS_all.begin() + (i * number_of_parameters + j) * y_size);
+    }
+  }
+
+  return BatchSolution(
+      to_np_array(std::move(flags), {number_of_sets}),
+      to_np_array(std::move(lengths), {number_of_sets}),
+      to_np_array(std::move(t_all), {number_of_sets, number_of_timesteps}),
+      to_np_array(std::move(y_all),
+                  {number_of_sets, number_of_timesteps, number_of_states}),
+      to_np_array(std::move(yS_all),
+                  {number_of_sets, number_of_parameters, number_of_timesteps,
+                   number_of_states}));
+}
@@ -18,12 +18,14 @@ Function generate_function(const std::string& data) {
 namespace py = pybind11;
 
 PYBIND11_MAKE_OPAQUE(std::vector<np_array>);
+PYBIND11_MAKE_OPAQUE(std::vector<Function>);
 
 PYBIND11_MODULE(idaklu, m)
 {
   m.doc() = "sundials solvers"; // optional module docstring
 
   py::bind_vector<std::vector<np_array>>(m, "VectorNdArray");
+  py::bind_vector<std::vector<Function>>(m, "VectorFunction");
 
   m.def("solve_python", &solve_python, "The solve function for python evaluators", 
         py::arg("t"), py::arg("y0"),
@@ -50,6 +52,26 @@ PYBIND11_MODULE(idaklu, m)
         py::arg("rhs_alg_id"),
         py::arg("atol"), py::arg("rtol"), py::arg("inputs"),
         py::arg("number_of_sensitivity_parameters"),
+        py::arg("output_functions"),
+        py::return_value_policy::take_ownership);
+
+  m.def("solve_casadi_batch", &solve_casadi_batch,
+        "Solve for each row of inputs, using a pool of threads", 
+        py::arg("t"), py::arg("y0"), py::arg("yp0"), 
+        py::arg("rhs_alg"), 
+        py::arg("jac_times_cjmass"), 
+        py::arg("jac_times_cjmass_colptrs"), 
+        py::arg("jac_times_cjmass_rowvals"), 
+        py::arg("jac_times_cjmass_nnz"), 
+        py::arg("jac_action"), 
+        py::arg("mass_action"), 
+        py::arg("sens"), 
+        py::arg("events"), py::arg("number_of_events"), 
+        py::arg("use_jacobian"),
+        py::arg("rhs_alg_id"),
+        py::arg("atol"), py::arg("rtol"), py::arg("inputs"),
+        py::arg("number_of_sensitivity_parameters"),
+        py::arg("number_of_threads"),
         py::return_value_policy::take_ownership);
 
   m.def("generate_function", &generate_function, "Generate a casadi function", 
@@ -62,7 +84,15 @@ PYBIND11_MODULE(idaklu, m)
       .def_readwrite("t", &Solution::t)
       .def_readwrite("y", &Solution::y)
       .def_readwrite("yS", &Solution::yS)
-      .def_readwrite("flag", &Solution::flag);
+      .def_readwrite("flag", &Solution::flag)
+      .def_readwrite("y_final", &Solution::y_final);
+
+  py::class_<BatchSolution>(m, "batch_solution")
+      .def_readwrite("t", &BatchSolution::t)
+      .def_readwrite("y", &BatchSolution::y)
+      .def_readwrite("yS", &BatchSolution::yS)
+      .def_readwrite("flag", &BatchSolution::flag)
+      .def_readwrite("length", &BatchSolution::length);
 }
 
 
@@ -6,8 +6,9 @@
 class Solution
 {
 public:
-  Solution(int retval, np_array t_np, np_array y_np, np_array yS_np)
-      : flag(retval), t(t_np), y(y_np), yS(yS_np)
+  Solution(int retval, np_array t_np, np_array y_np, np_array yS_np,
+           np_array y_final_np = np_array())
+      : flag(retval), t(t_np), y(y_np), yS(yS_np), y_final(y_final_np)
   {
   }
 
@@ -15,6 +16,31 @@ public:
   np_array t;
   np_array y;
   np_array yS;
+  // the state at the last time (if y holds output variables rather than
+  // the state)
+  np_array y_final;
+};
+
+// The solutions for a batch of input sets, stacked along the first axis. t has
+// shape (number of sets, number of times), y has shape (number of sets, number
+// of times, number of states) and yS has shape (number of sets, number of
+// parameters, number of times, number of states). The solutions that stopped
+// early (at an event, or on failure) are padded with NaN after their first
+// length[i] time steps
+class BatchSolution
+{
+public:
+  BatchSolution(np_array_int flag_np, np_array_int length_np, np_array t_np,
+                np_array y_np, np_array yS_np)
+      : flag(flag_np), length(length_np), t(t_np), y(y_np), yS(yS_np)
+  {
+  }
+
+  np_array_int flag;
+  np_array_int length;
+  np_array t;
+  np_array y;
+  np_array yS;
 };
 
 #endif // PYBAMM_SOLUTION_HPP
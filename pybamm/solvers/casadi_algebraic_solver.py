@@ -149,6 +149,7 @@ class CasadiAlgebraicSolver(pybamm.BaseSolver):
 
         timer = pybamm.Timer()
         integration_time = 0
+        root_iterations = 0
         for idx, t in enumerate(t_eval):
             t_eval_inputs_sym = casadi.vertcat(t, symbolic_inputs)
             # Solve
@@ -156,6 +157,8 @@ class CasadiAlgebraicSolver(pybamm.BaseSolver):
                 timer.reset()
                 y_alg_sol = roots(y0_alg, t_eval_inputs_sym)
                 integration_time += timer.time()
+                if not has_symbolic_inputs:
+                    root_iterations += roots.stats().get("iter_count", 0)
                 success = True
                 message = None
                 # Check final output
@@ -219,4 +222,5 @@ class CasadiAlgebraicSolver(pybamm.BaseSolver):
             sensitivities=explicit_sensitivities,
         )
         sol.integration_time = integration_time
+        sol.root_iterations = root_iterations
         return sol
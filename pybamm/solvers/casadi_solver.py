@@ -2,8 +2,10 @@
 # CasADi Solver class
 #
 import casadi
+import hashlib
 import pybamm
 import numpy as np
+import warnings
 from scipy.interpolate import interp1d
 
 
@@ -28,6 +30,15 @@ class CasadiSolver(pybamm.BaseSolver):
             - "safe without grid": perform step-and-check integration step-by-step. \
             Takes more steps than "safe" mode, but doesn't require creating the grid \
             each time, so may be faster. Experimental only.
+            - "safe with dense output": as "safe", but using a single integrator \
+            for all the global steps, whatever the points of `t_eval` in them. \
+            The integrator has a grid of `dense_output_points` equally spaced \
+            points, with the start time and spacing as parameters. It is called \
+            for each run of equally spaced points of `t_eval` whose number of \
+            intervals divides the number of intervals of the grid, so the states \
+            are computed at exactly the points of `t_eval`. Points of `t_eval` \
+            that are not equally spaced are integrated one interval at a time, \
+            which is slower than "safe" mode.
     rtol : float, optional
         The relative tolerance for the solver (default is 1e-6).
     atol : float, optional
@@ -62,8 +73,31 @@ class CasadiSolver(pybamm.BaseSolver):
         Any options to pass to the CasADi integrator when calling the integrator.
         Please consult `CasADi documentation <https://tinyurl.com/y5rk76os>`_ for
         details.
+    dense_output_points : int, optional
+        The number of points in the grid of the integrator in "safe with dense
+        output" mode. Default is 61, so that runs of 1, 2, 3, 4, 5, 6, 10, 12, 15,
+        20, 30 or 60 intervals of `t_eval` are integrated in one call.
+
+    Attributes
+    ----------
+    integrator_cache : :class:`pybamm.IntegratorCache`
+        The cache of integrators (one for each distinct time grid). Models with
+        identical integrator specifications share their integrators. Set to a
+        :class:`pybamm.IntegratorCache` with different limits to bound the number
+        or the total size of the integrators kept in memory; the same cache can
+        be shared between solvers.
+    parallel_backend : str or pool
+        As for :class:`pybamm.BaseSolver`, with the additional option "batched":
+        when solving for a list of inputs, map a single integrator over all the sets
+        of inputs (using CasADi's `map` with threads), so that all the trajectories
+        are computed in one call to the integrator. The whole of `t_eval` is
+        integrated in one go, as in "fast" mode, and events are then located
+        separately for each trajectory. Symbolic inputs and sensitivities are not
+        supported in "batched" mode.
     """
 
+    _parallel_backends = pybamm.BaseSolver._parallel_backends + ["batched"]
+
     def __init__(
         self,
         mode="safe",
@@ -76,6 +110,7 @@ class CasadiSolver(pybamm.BaseSolver):
         extrap_tol=0,
         extra_options_setup=None,
         extra_options_call=None,
+        dense_output_points=61,
     ):
         super().__init__(
             "problem dependent",
@@ -85,14 +120,24 @@ class CasadiSolver(pybamm.BaseSolver):
             root_tol,
             extrap_tol,
         )
-        if mode in ["safe", "fast", "fast with events", "safe without grid"]:
+        if mode in [
+            "safe",
+            "fast",
+            "fast with events",
+            "safe without grid",
+            "safe with dense output",
+        ]:
             self.mode = mode
         else:
             raise ValueError(
                 "invalid mode '{}'. Must be 'safe', for solving with events, "
-                "'fast', for solving quickly without events, or 'safe without grid' or "
-                "'fast with events' (both experimental)".format(mode)
+                "'fast', for solving quickly without events, 'safe with dense output', "
+                "or 'safe without grid' or 'fast with events' (both experimental)"
+                "".format(mode)
             )
+        if dense_output_points < 2:
+            raise ValueError("dense_output_points must be at least 2")
+        self.dense_output_points = dense_output_points
         self.max_step_decrease_count = max_step_decrease_count
         self.dt_max = dt_max
 
@@ -103,12 +148,72 @@ class CasadiSolver(pybamm.BaseSolver):
         self.name = "CasADi solver with '{}' mode".format(mode)
 
         # Initialize
-        self.integrators = {}
+        self.integrator_cache = pybamm.IntegratorCache()
         self.integrator_specs = {}
+        self._integrator_spec_keys = {}
         self.y_sols = {}
 
         pybamm.citations.register("Andersson2019")
 
+    @property
+    def integrators(self):
+        """
+        Deprecated: use `self.integrator_cache` instead.
+
+        Dictionary of the integrators in `self.integrator_cache` for each model,
+        keyed on the time grid as before integrators were cached (the rounded
+        shifted `t_eval` as bytes, or "no grid"). Integrators mapped over
+        several sets of inputs are not included.
+        """
+        warnings.warn(
+            "`CasadiSolver.integrators` has been deprecated and will be removed in a "
+            "future release. Use `CasadiSolver.integrator_cache` instead.",
+            DeprecationWarning,
+        )
+        integrators = {}
+        for model, spec_key in self._integrator_spec_keys.items():
+            integrators[model] = {
+                key[1]: integrator
+                for key, integrator in self.integrator_cache.items()
+                if len(key) == 2 and key[0] == spec_key
+            }
+        return integrators
+
+    def copy(self):
+        """
+        As for :meth:`pybamm.BaseSolver.copy`, without the integrator specifications
+        of the models set up by this solver. The copy shares the integrator cache.
+        """
+        new_solver = super().copy()
+        new_solver.integrator_specs = {}
+        new_solver._integrator_spec_keys = {}
+        new_solver.y_sols = {}
+        return new_solver
+
+    def __getstate__(self):
+        # Integrators are specific to this process and can be large, so a pickled
+        # solver starts with an empty cache with the same limits
+        state = super().__getstate__()
+        cache = self.integrator_cache
+        state["integrator_cache"] = pybamm.IntegratorCache(
+            max_entries=cache.max_entries, max_bytes=cache.max_bytes
+        )
+        return state
+
+    def clear_set_up(self, model=None):
+        """
+        As for :meth:`pybamm.BaseSolver.clear_set_up`, also removing the integrator
+        specifications of the model(s). Integrators already in
+        `self.integrator_cache` are kept, since other models may share them.
+        """
+        super().clear_set_up(model)
+        if model is None:
+            self.integrator_specs.clear()
+            self._integrator_spec_keys.clear()
+        else:
+            self.integrator_specs.pop(model, None)
+            self._integrator_spec_keys.pop(model, None)
+
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
         Solve a DAE model defined by residuals with initial conditions y0.
@@ -151,9 +256,10 @@ class CasadiSolver(pybamm.BaseSolver):
 
         if has_symbolic_inputs:
             # Create integrator without grid to avoid having to create several times
-            self.create_integrator(model, inputs)
+            integrator = self.create_integrator(model, inputs)
             solution = self._run_integrator(
                 model,
+                integrator,
                 model.y0,
                 inputs_dict,
                 inputs,
@@ -171,18 +277,18 @@ class CasadiSolver(pybamm.BaseSolver):
             else:
                 use_event_switch = False
             # Create an integrator with the grid (we just need to do this once)
-            self.create_integrator(
+            integrator = self.create_integrator(
                 model, inputs, t_eval, use_event_switch=use_event_switch
             )
             solution = self._run_integrator(
-                model, model.y0, inputs_dict, inputs, t_eval
+                model, integrator, model.y0, inputs_dict, inputs, t_eval
             )
             # Check if the sign of an event changes, if so find an accurate
             # termination point and exit
             solution = self._solve_for_event(solution, init_event_signs)
             solution.check_ys_are_not_too_large()
             return solution
-        elif self.mode in ["safe", "safe without grid"]:
+        elif self.mode in ["safe", "safe without grid", "safe with dense output"]:
             y0 = model.y0
             # Step-and-check
             t = t_eval[0]
@@ -196,7 +302,7 @@ class CasadiSolver(pybamm.BaseSolver):
                 # in "safe without grid" mode,
                 # create integrator once, without grid,
                 # to avoid having to create several times
-                self.create_integrator(model, inputs)
+                integrator = self.create_integrator(model, inputs)
                 # Initialize solution
                 solution = pybamm.Solution(
                     np.array([t]),
@@ -208,6 +314,12 @@ class CasadiSolver(pybamm.BaseSolver):
                 solution.solve_time = 0
                 solution.integration_time = 0
                 use_grid = False
+            elif self.mode == "safe with dense output":
+                # create integrator once, with a grid that is scaled to the points
+                # of t_eval in each global step
+                integrator = self.create_integrator(model, inputs, dense_output=True)
+                solution = None
+                use_grid = True
             else:
                 solution = None
                 use_grid = True
@@ -241,18 +353,20 @@ class CasadiSolver(pybamm.BaseSolver):
 
                     if self.mode == "safe":
                         # update integrator with the grid
-                        self.create_integrator(model, inputs, t_window)
+                        integrator = self.create_integrator(model, inputs, t_window)
                     # Try to solve with the current global step, if it fails then
                     # halve the step size and try again.
                     try:
                         current_step_sol = self._run_integrator(
                             model,
+                            integrator,
                             y0,
                             inputs_dict,
                             inputs,
                             t_window,
                             use_grid=use_grid,
                             extract_sensitivities_in_solution=False,
+                            dense_output=self.mode == "safe with dense output",
                         )
                         solved = True
                     except pybamm.SolverError:
@@ -293,6 +407,105 @@ class CasadiSolver(pybamm.BaseSolver):
             solution.check_ys_are_not_too_large()
             return solution
 
+    def _integrate_in_parallel(self, model, t_eval, ext_and_inputs_list, nproc):
+        if self.parallel_backend == "batched":
+            return self._integrate_batched(model, t_eval, ext_and_inputs_list, nproc)
+        return super()._integrate_in_parallel(
+            model, t_eval, ext_and_inputs_list, nproc
+        )
+
+    def _integrate_batched(self, model, t_eval, inputs_list, nthreads=None):
+        """
+        Solve the model for each set of inputs in `inputs_list` with a single call to
+        an integrator mapped over the sets of inputs.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model whose solution to calculate.
+        t_eval : numeric type
+            The times at which to compute the solution
+        inputs_list : list of dict
+            The external variables or input parameters for each solution
+        nthreads : int, optional
+            The maximum number of threads used to evaluate the mapped integrator.
+            Default is the number of sets of inputs.
+        """
+        if any(
+            isinstance(v, casadi.MX)
+            for inputs_dict in inputs_list
+            for v in inputs_dict.values()
+        ):
+            raise pybamm.SolverError(
+                "Cannot use the 'batched' parallel backend with symbolic inputs"
+            )
+        if bool(model.calculate_sensitivities):
+            raise pybamm.SolverError(
+                "Cannot use the 'batched' parallel backend with sensitivities"
+            )
+
+        n_batch = len(inputs_list)
+        all_inputs = [
+            casadi.vertcat(*[x for x in inputs_dict.values()])
+            for inputs_dict in inputs_list
+        ]
+        use_event_switch = self.mode == "fast with events"
+        integrator = self.create_integrator(
+            model,
+            all_inputs[0],
+            t_eval,
+            use_event_switch=use_event_switch,
+            batch_size=n_batch,
+            nthreads=nthreads,
+        )
+
+        len_rhs = model.concatenated_rhs.size
+        y0_diff = model.y0[:len_rhs]
+        y0_alg = model.y0[len_rhs:]
+        # One column of parameters per trajectory (the initial conditions are the
+        # same for all trajectories, and are broadcast by the mapped integrator)
+        p = casadi.horzcat(
+            *[casadi.vertcat(inputs, t_eval[0]) for inputs in all_inputs]
+        )
+        try:
+            timer = pybamm.Timer()
+            casadi_sol = integrator(
+                x0=y0_diff, z0=y0_alg, p=p, **self.extra_options_call
+            )
+            integration_time = timer.time()
+        except RuntimeError as e:
+            raise pybamm.SolverError(e.args[0])
+        y_sols = casadi.vertcat(casadi_sol["xf"], casadi_sol["zf"])
+
+        n_t = len(t_eval)
+        solutions = []
+        for i, (inputs_dict, inputs) in enumerate(zip(inputs_list, all_inputs)):
+            solution = pybamm.Solution(
+                t_eval,
+                y_sols[:, i * n_t : (i + 1) * n_t],
+                model,
+                inputs_dict,
+                sensitivities=False,
+                check_solution=False,
+            )
+            # The trajectories share a single call to the integrator
+            solution.integration_time = integration_time / n_batch
+            if self.mode != "fast" and model.terminate_events_eval:
+                init_event_signs = np.sign(
+                    np.concatenate(
+                        [
+                            event(t_eval[0], model.y0, inputs)
+                            for event in model.terminate_events_eval
+                        ]
+                    )
+                )
+            else:
+                init_event_signs = np.sign([])
+            solution = self._solve_for_event(solution, init_event_signs)
+            solution.check_ys_are_not_too_large()
+            solutions.append(solution)
+        return solutions
+
     def _solve_for_event(self, coarse_solution, init_event_signs):
         """
         Check if the sign of an event changes, if so find an accurate
@@ -428,20 +641,26 @@ class CasadiSolver(pybamm.BaseSolver):
         )
 
         if self.mode == "safe without grid":
+            integrator = self.create_integrator(model, inputs)
             use_grid = False
+        elif self.mode == "safe with dense output":
+            integrator = self.create_integrator(model, inputs, dense_output=True)
+            use_grid = True
         else:
-            self.create_integrator(model, inputs, t_window_event_dense)
+            integrator = self.create_integrator(model, inputs, t_window_event_dense)
             use_grid = True
 
         y0 = coarse_solution.y[:, event_idx_lower]
         dense_step_sol = self._run_integrator(
             model,
+            integrator,
             y0,
             inputs_dict,
             inputs,
             t_window_event_dense,
             use_grid=use_grid,
             extract_sensitivities_in_solution=False,
+            dense_output=self.mode == "safe with dense output",
         )
 
         # Find the exact time at which the event was triggered
@@ -513,37 +732,61 @@ class CasadiSolver(pybamm.BaseSolver):
                         "these bounds.".format(extrap_event_names)
                     )
 
-    def create_integrator(self, model, inputs, t_eval=None, use_event_switch=False):
+    def create_integrator(
+        self,
+        model,
+        inputs,
+        t_eval=None,
+        use_event_switch=False,
+        batch_size=None,
+        nthreads=None,
+        dense_output=False,
+    ):
         """
         Method to create a casadi integrator object.
         If t_eval is provided, the integrator uses t_eval to make the grid.
+        If dense_output is True, the integrator has the grid 0, 1, ...,
+        `dense_output_points - 1`, in units of a time step that is passed as a
+        parameter together with the start time (see :meth:`_run_integrator`).
         Otherwise, the integrator has grid [0,1].
+        If batch_size is provided (together with t_eval), the integrator is mapped
+        over `batch_size` columns of inputs, using at most `nthreads` threads.
+        Integrators are stored in `self.integrator_cache`, keyed on the integrator
+        specifications and the time grid.
         """
-        pybamm.logger.debug("Creating CasADi integrator")
+        if batch_size is not None:
+            integrator = self.create_integrator(
+                model, inputs, t_eval, use_event_switch=use_event_switch
+            )
+            t_eval_shifted_rounded = np.round(t_eval - t_eval[0], decimals=12)
+            key = (
+                self._integrator_spec_keys[model],
+                t_eval_shifted_rounded.tobytes(),
+                batch_size,
+                nthreads,
+            )
+            mapped_integrator = self.integrator_cache.get(key)
+            if mapped_integrator is None:
+                pybamm.logger.debug("Mapping CasADi integrator")
+                mapped_integrator = integrator.map(
+                    batch_size, "thread", nthreads or batch_size
+                )
+                self.integrator_cache.put(key, mapped_integrator)
+            return mapped_integrator
 
         # Use grid if t_eval is given
-        use_grid = not (t_eval is None)
-        if use_grid is True:
+        if dense_output:
+            n_points = self.dense_output_points
+            t_eval_shifted = np.arange(n_points, dtype=float)
+            grid_key = "dense output"
+        elif t_eval is not None:
             t_eval_shifted = t_eval - t_eval[0]
-            t_eval_shifted_rounded = np.round(t_eval_shifted, decimals=12).tobytes()
-        # Only set up problem once
-        if model in self.integrators:
-            # If we're not using the grid, we don't need to change the integrator
-            if use_grid is False:
-                return self.integrators[model]["no grid"]
-            # Otherwise, create new integrator with an updated grid
-            # We don't need to update the grid if reusing the same t_eval
-            # (up to a shift by a constant)
-            else:
-                if t_eval_shifted_rounded in self.integrators[model]:
-                    return self.integrators[model][t_eval_shifted_rounded]
-                else:
-                    method, problem, options = self.integrator_specs[model]
-                    options["grid"] = t_eval_shifted
-                    integrator = casadi.integrator("F", method, problem, options)
-                    self.integrators[model][t_eval_shifted_rounded] = integrator
-                    return integrator
+            grid_key = np.round(t_eval_shifted, decimals=12).tobytes()
         else:
+            grid_key = "no grid"
+        use_grid = grid_key != "no grid"
+        # Only set up problem once
+        if model not in self.integrator_specs:
             rhs = model.casadi_rhs
             algebraic = model.casadi_algebraic
 
@@ -572,7 +815,15 @@ class CasadiSolver(pybamm.BaseSolver):
             y_alg = casadi.MX.sym("y_alg", algebraic(0, y0, p).shape[0])
             y_full = casadi.vertcat(y_diff, y_alg)
 
-            if use_grid is False:
+            if dense_output:
+                # rescale time by the spacing of the grid
+                t_min = casadi.MX.sym("t_min")
+                dt_grid = casadi.MX.sym("dt_grid")
+                t_max_minus_t_min = dt_grid
+                t_scaled = t_min + dt_grid * t
+                p_with_tlims = casadi.vertcat(p, t_min, dt_grid)
+                options.update({"grid": t_eval_shifted, "output_t0": True})
+            elif use_grid is False:
                 # rescale time
                 t_min = casadi.MX.sym("t_min")
                 t_max = casadi.MX.sym("t_max")
@@ -614,24 +865,53 @@ class CasadiSolver(pybamm.BaseSolver):
                         "alg": algebraic(t_scaled, y_full, p),
                     }
                 )
-            integrator = casadi.integrator("F", method, problem, options)
             self.integrator_specs[model] = method, problem, options
-            if use_grid is False:
-                self.integrators[model] = {"no grid": integrator}
-            else:
-                self.integrators[model] = {t_eval_shifted_rounded: integrator}
+            self._integrator_spec_keys[model] = self._get_integrator_spec_key(
+                method, problem, options
+            )
+
+        # We don't need to create a new integrator if reusing the same t_eval (up to
+        # a shift by a constant), or if a model with the same specifications has
+        # already created it
+        key = (self._integrator_spec_keys[model], grid_key)
+        integrator = self.integrator_cache.get(key)
+        if integrator is None:
+            pybamm.logger.debug("Creating CasADi integrator")
+            method, problem, options = self.integrator_specs[model]
+            if use_grid is True:
+                options = {**options, "grid": t_eval_shifted}
+            integrator = casadi.integrator("F", method, problem, options)
+            self.integrator_cache.put(key, integrator)
+        return integrator
 
-            return integrator
+    @staticmethod
+    def _get_integrator_spec_key(method, problem, options):
+        """
+        Fingerprint of the integrator specifications (ignoring the time grid), used
+        to share integrators between models with identical specifications.
+        """
+        inputs = [problem[name] for name in ["t", "x", "z", "p"] if name in problem]
+        outputs = [problem[name] for name in ["ode", "alg"] if name in problem]
+        problem_function = casadi.Function("problem", inputs, outputs)
+        options = sorted(
+            (name, value) for name, value in options.items() if name != "grid"
+        )
+        hasher = hashlib.sha1()
+        for part in [method, repr(options), problem_function.serialize()]:
+            hasher.update(part.encode())
+        return hasher.hexdigest()
 
     def _run_integrator(
         self,
         model,
+        integrator,
         y0,
         inputs_dict,
         inputs,
         t_eval,
         use_grid=True,
         extract_sensitivities_in_solution=None,
+        dense_output=False,
     ):
         """
         Run the integrator.
@@ -640,6 +920,8 @@ class CasadiSolver(pybamm.BaseSolver):
         ----------
         model : :class:`pybamm.BaseModel`
             The model whose solution to calculate.
+        integrator : :class:`casadi.Function`
+            The integrator, as returned by :meth:`create_integrator`
         y0:
             casadi vector of initial conditions
         inputs_dict : dict, optional
@@ -656,6 +938,10 @@ class CasadiSolver(pybamm.BaseSolver):
             Setting to True or False will override this behaviour, forcing the
             sensitivities to be extracted or not (it is up to the caller to determine if
             the sensitivities are in fact present)
+        dense_output: bool, optional
+            Whether the integrator was created with `dense_output=True`, in which case
+            it is called once for each chunk of t_eval given by
+            :func:`_equally_spaced_chunks`
         """
 
         pybamm.logger.debug("Running CasADi integrator")
@@ -667,15 +953,6 @@ class CasadiSolver(pybamm.BaseSolver):
         if extract_sensitivities_in_solution is None:
             extract_sensitivities_in_solution = explicit_sensitivities
 
-        if use_grid is True:
-            pybamm.logger.spam("Calculating t_eval_shifted")
-            t_eval_shifted = t_eval - t_eval[0]
-            t_eval_shifted_rounded = np.round(t_eval_shifted, decimals=12).tobytes()
-            pybamm.logger.spam("Finished calculating t_eval_shifted")
-            integrator = self.integrators[model][t_eval_shifted_rounded]
-        else:
-            integrator = self.integrators[model]["no grid"]
-
         len_rhs = model.concatenated_rhs.size
 
         # Check y0 to see if it includes sensitivities
@@ -690,7 +967,29 @@ class CasadiSolver(pybamm.BaseSolver):
         # Solve
         try:
             # Try solving
-            if use_grid is True:
+            if dense_output:
+                n_intervals = self.dense_output_points - 1
+                x = y0_diff
+                z = y0_alg
+                y_sols = []
+                integration_time = 0
+                for start, end in _equally_spaced_chunks(t_eval, n_intervals):
+                    dt_grid = (t_eval[end] - t_eval[start]) / n_intervals
+                    inputs_with_tgrid = casadi.vertcat(inputs, t_eval[start], dt_grid)
+                    timer = pybamm.Timer()
+                    casadi_sol = integrator(
+                        x0=x, z0=z, p=inputs_with_tgrid, **self.extra_options_call
+                    )
+                    integration_time += timer.time()
+                    # only keep the points of t_eval (and each of them once)
+                    step = n_intervals // (end - start)
+                    first = 0 if start == 0 else step
+                    y_chunk = casadi.vertcat(casadi_sol["xf"], casadi_sol["zf"])
+                    y_sols.append(y_chunk[:, first::step])
+                    x = casadi_sol["xf"][:, -1]
+                    z = casadi_sol["zf"][:, -1]
+                y_sol = casadi.horzcat(*y_sols)
+            elif use_grid is True:
                 t_min = t_eval[0]
                 inputs_with_tmin = casadi.vertcat(inputs, t_min)
                 # Call the integrator once, with the grid
@@ -748,3 +1047,27 @@ class CasadiSolver(pybamm.BaseSolver):
         except RuntimeError as e:
             # If it doesn't work raise error
             raise pybamm.SolverError(e.args[0])
+
+
+def _equally_spaced_chunks(t_eval, n_intervals):
+    """
+    Split `t_eval` into chunks of equally spaced times, each with a number of
+    intervals that divides `n_intervals`, so that the times of each chunk are points
+    of a grid of `n_intervals` equal intervals. Returns the indices of the first and
+    last time of each chunk.
+    """
+    divisors = [n for n in range(n_intervals, 0, -1) if n_intervals % n == 0]
+    dt = np.diff(t_eval)
+    # start of each run of equally spaced times
+    equal = np.isclose(dt[1:], dt[:-1], rtol=1e-9, atol=0)
+    run_starts = np.flatnonzero(~equal) + 1
+    chunks = []
+    for run_start, run_end in zip(
+        np.concatenate([[0], run_starts]), np.concatenate([run_starts, [len(dt)]])
+    ):
+        start = run_start
+        while start < run_end:
+            end = start + next(n for n in divisors if n <= run_end - start)
+            chunks.append((start, end))
+            start = end
+    return chunks
@@ -0,0 +1,140 @@
+#
+# Cache of consistent algebraic states
+#
+from collections import OrderedDict
+import numbers
+
+import casadi
+import numpy as np
+
+
+class ConsistentStateCache:
+    """
+    A cache of converged algebraic states, used by a solver as the initial guess for
+    the root-finder when calculating consistent initial conditions (see
+    :meth:`pybamm.BaseSolver.calculate_consistent_state`).
+
+    Entries are keyed on the model, the input parameters and the differential
+    states, rounded to `resolution`. This is useful when the same operating
+    conditions are visited many times with similar differential states, e.g. each
+    step of a long cycling experiment, where the algebraic states carried over from
+    the previous step (solved with a different model) can be a poor initial guess.
+
+    Parameters
+    ----------
+    resolution : float, optional
+        The resolution to which the (dimensionless) differential states are
+        rounded to find an entry. Default is 1e-2.
+    max_size : int, optional
+        The maximum number of entries. When the cache is full, the least recently
+        used entry is removed. Default is 1000.
+    ignore_inputs : list of str, optional
+        Input parameters that are not part of the key. Default is ["start time"],
+        which changes at every step of an experiment.
+
+    Attributes
+    ----------
+    hits : int
+        The number of times an initial guess has been found in the cache
+    misses : int
+        The number of times no initial guess has been found in the cache
+    """
+
+    def __init__(self, resolution=1e-2, max_size=1000, ignore_inputs=None):
+        self.resolution = resolution
+        self.max_size = max_size
+        if ignore_inputs is None:
+            ignore_inputs = ["start time"]
+        self.ignore_inputs = ignore_inputs
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all the entries."""
+        self._entries.clear()
+
+    def _key(self, model, inputs, y):
+        """
+        Return the key for the state `y` of `model` with inputs `inputs`, or None if
+        the state can't be cached (e.g. symbolic inputs or sensitivities).
+        """
+        if isinstance(y, casadi.DM):
+            y = y.full()
+        elif not isinstance(y, np.ndarray):
+            return None
+        if y.size != model.len_rhs_and_alg:
+            return None
+        input_items = []
+        for name, value in (inputs or {}).items():
+            if name in self.ignore_inputs:
+                continue
+            if isinstance(value, numbers.Number):
+                value = np.array([value], dtype=float)
+            elif isinstance(value, np.ndarray):
+                value = value.astype(float)
+            else:
+                # e.g. symbolic inputs
+                return None
+            input_items.append((name, value.tobytes()))
+        y_diff = np.asarray(y).reshape(-1)[: model.len_rhs]
+        y_diff_rounded = np.round(y_diff / self.resolution).astype(np.int64)
+        return (model, tuple(sorted(input_items)), y_diff_rounded.tobytes())
+
+    def get(self, model, inputs, y):
+        """
+        Return the state `y` with the algebraic states replaced by those of a cached
+        entry, or None if there is no matching entry.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model
+        inputs : dict
+            The input parameters
+        y : array-like
+            The current state of the model
+
+        Returns
+        -------
+        array-like or None
+            The initial guess, of the same type and shape as `y`
+        """
+        key = self._key(model, inputs, y)
+        if key is None or key not in self._entries:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        y_alg = self._entries[key]
+        if isinstance(y, casadi.DM):
+            return casadi.vertcat(y[: model.len_rhs], casadi.DM(y_alg))
+        y = np.array(y, dtype=float)
+        y.reshape(-1)[model.len_rhs :] = y_alg
+        return y
+
+    def put(self, model, inputs, y):
+        """
+        Store the algebraic states of a consistent state `y` of `model`.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model
+        inputs : dict
+            The input parameters
+        y : array-like
+            The consistent state
+        """
+        key = self._key(model, inputs, y)
+        if key is None:
+            return
+        if isinstance(y, casadi.DM):
+            y = y.full()
+        self._entries[key] = np.asarray(y).reshape(-1)[model.len_rhs :].copy()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -8,6 +8,7 @@ import numbers
 import scipy.sparse as sparse
 
 import importlib
+import os
 
 idaklu_spec = importlib.util.find_spec("pybamm.solvers.idaklu")
 if idaklu_spec is not None:
@@ -42,8 +43,26 @@ class IDAKLUSolver(pybamm.BaseSolver):
         The tolerance for the initial-condition solver (default is 1e-6).
     extrap_tol : float, optional
         The tolerance to assert whether extrapolation occurs or not (default is 0).
+    output_variables : list of str, optional
+        Names of model variables to return instead of the states (models converted
+        to casadi format only). The variables are evaluated by the idaklu extension
+        at each time step, and only their values (and the final state, to restart
+        from) are stored, which saves memory for large models. The returned solution
+        can only process these variables. Default is None (return the states).
+
+    Attributes
+    ----------
+    parallel_backend : str or pool
+        As for :class:`pybamm.BaseSolver`, with the additional option "batched":
+        when solving for a list of inputs, pass all the sets of inputs to the idaklu
+        extension in one call, which solves them on a pool of threads (each with its
+        own IDA and KLU memory) without holding the GIL, and returns the stacked
+        solutions. Only models converted to casadi format are supported in
+        "batched" mode.
     """
 
+    _parallel_backends = pybamm.BaseSolver._parallel_backends + ["batched"]
+
     def __init__(
         self,
         rtol=1e-6,
@@ -51,6 +70,7 @@ class IDAKLUSolver(pybamm.BaseSolver):
         root_method="casadi",
         root_tol=1e-6,
         extrap_tol=0,
+        output_variables=None,
     ):
 
         if idaklu_spec is None:  # pragma: no cover
@@ -65,6 +85,9 @@ class IDAKLUSolver(pybamm.BaseSolver):
             extrap_tol,
         )
         self.name = "IDA KLU solver"
+        self.output_variables = output_variables
+        # set-up (generated functions, sparsity, ...) for each model
+        self._setup = {}
 
         pybamm.citations.register("Hindmarsh2000")
         pybamm.citations.register("Hindmarsh2005")
@@ -368,6 +391,43 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 for i, dFdp_i in enumerate(dFdp.values()):
                     resvalS[i][:] = dFdy @ yS[i] - dFdyd @ ypS[i] + dFdp_i
 
+        # the output variables are evaluated by the extension at each time step, and
+        # read back from the stacked outputs by the solution
+        output_functions = []
+        output_variables = None
+        if self.output_variables:
+            if model.convert_to_format != "casadi":
+                raise pybamm.SolverError(
+                    "output_variables can only be used with models converted to "
+                    "casadi format"
+                )
+            if number_of_sensitivity_parameters != 0:
+                raise pybamm.SolverError(
+                    "output_variables cannot be used with sensitivities"
+                )
+            for name in self.output_variables:
+                var = model.variables_and_events[name].to_casadi(
+                    t_casadi, y_casadi, inputs=p_casadi
+                )
+                output_functions.append(
+                    casadi.Function(
+                        "output",
+                        [t_casadi, y_casadi, p_casadi_stacked],
+                        [casadi.densify(casadi.vec(var))],
+                    )
+                )
+            sizes = [f.numel_out(0) for f in output_functions]
+            y_outputs = casadi.MX.sym("y", sum(sizes))
+            output_variables = {}
+            offset = 0
+            for name, size in zip(self.output_variables, sizes):
+                output_variables[name] = casadi.Function(
+                    "variable",
+                    [t_casadi, y_outputs, p_casadi_stacked],
+                    [y_outputs[offset:offset + size]],
+                )
+                offset += size
+
         if model.convert_to_format == "casadi":
             rhs_algebraic = idaklu.generate_function(rhs_algebraic.serialize())
             jac_times_cjmass = idaklu.generate_function(
@@ -379,7 +439,10 @@ class IDAKLUSolver(pybamm.BaseSolver):
             rootfn = idaklu.generate_function(rootfn.serialize())
             mass_action = idaklu.generate_function(mass_action.serialize())
             sensfn = idaklu.generate_function(sensfn.serialize())
-            self._setup = {
+            output_functions = idaklu.VectorFunction(
+                [idaklu.generate_function(f.serialize()) for f in output_functions]
+            )
+            self._setup[model] = {
                 'rhs_algebraic': rhs_algebraic,
                 'jac_times_cjmass': jac_times_cjmass,
                 'jac_times_cjmass_colptrs': jac_times_cjmass_colptrs,
@@ -394,9 +457,11 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 'ids': ids,
                 'sensitivity_names': sensitivity_names,
                 'number_of_sensitivity_parameters': number_of_sensitivity_parameters,
+                'output_functions': output_functions,
+                'output_variables': output_variables,
             }
         else:
-            self._setup = {
+            self._setup[model] = {
                 'resfn': resfn,
                 'jac_class': jac_class,
                 'sensfn': sensfn,
@@ -406,10 +471,36 @@ class IDAKLUSolver(pybamm.BaseSolver):
                 'ids': ids,
                 'sensitivity_names': sensitivity_names,
                 'number_of_sensitivity_parameters': number_of_sensitivity_parameters,
+                'output_variables': None,
             }
 
         return base_set_up_return
 
+    def copy(self):
+        """
+        As for :meth:`pybamm.BaseSolver.copy`, without the functions generated for
+        the models set up by this solver.
+        """
+        new_solver = super().copy()
+        new_solver._setup = {}
+        return new_solver
+
+    def _set_up_worker(self, model, inputs):
+        # The functions generated by the extension cannot be pickled, so generate
+        # them again in the worker
+        self.set_up(model, inputs)
+
+    def clear_set_up(self, model=None):
+        """
+        As for :meth:`pybamm.BaseSolver.clear_set_up`, also removing the functions
+        generated for the model(s).
+        """
+        super().clear_set_up(model)
+        if model is None:
+            self._setup.clear()
+        else:
+            self._setup.pop(model, None)
+
     def _integrate(self, model, t_eval, inputs_dict=None):
         """
         Solve a DAE model defined by residuals with initial conditions y0.
@@ -424,15 +515,160 @@ class IDAKLUSolver(pybamm.BaseSolver):
             Any external variables or input parameters to pass to the model when solving
         """
         inputs_dict = inputs_dict or {}
-        # stack inputs
+        inputs = self._stack_inputs(inputs_dict)
+        setup = self._setup[model]
+        y0, ydot0, atol = self._get_initial_state(model)
+        rtol = self.rtol
+
+        timer = pybamm.Timer()
+        if model.convert_to_format == "casadi":
+            sol = idaklu.solve_casadi(
+                t_eval,
+                y0,
+                ydot0,
+                setup['rhs_algebraic'],
+                setup['jac_times_cjmass'],
+                setup['jac_times_cjmass_colptrs'],
+                setup['jac_times_cjmass_rowvals'],
+                setup['jac_times_cjmass_nnz'],
+                setup['jac_rhs_algebraic_action'],
+                setup['mass_action'],
+                setup['sensfn'],
+                setup['rootfn'],
+                setup['num_of_events'],
+                setup['use_jac'],
+                setup['ids'],
+                atol, rtol, inputs,
+                setup['number_of_sensitivity_parameters'],
+                setup['output_functions'],
+            )
+        else:
+            sol = idaklu.solve_python(
+                t_eval,
+                y0,
+                ydot0,
+                setup['resfn'],
+                setup['jac_class'].jac_res,
+                setup['sensfn'],
+                setup['jac_class'].get_jac_data,
+                setup['jac_class'].get_jac_row_vals,
+                setup['jac_class'].get_jac_col_ptrs,
+                setup['jac_class'].nnz,
+                setup['rootfn'],
+                setup['num_of_events'],
+                setup['use_jac'],
+                setup['ids'],
+                atol, rtol, inputs,
+                setup['number_of_sensitivity_parameters'],
+            )
+        integration_time = timer.time()
+
+        return self._make_solution(
+            model,
+            inputs_dict,
+            sol.t,
+            sol.y,
+            sol.yS,
+            sol.flag,
+            integration_time,
+            y_final=sol.y_final,
+        )
+
+    def _integrate_in_parallel(self, model, t_eval, ext_and_inputs_list, nproc):
+        if self.parallel_backend == "batched":
+            return self._integrate_batched(model, t_eval, ext_and_inputs_list, nproc)
+        return super()._integrate_in_parallel(
+            model, t_eval, ext_and_inputs_list, nproc
+        )
+
+    def _integrate_batched(self, model, t_eval, inputs_list, nthreads=None):
+        """
+        Solve the model for each set of inputs in `inputs_list` with a single call to
+        the idaklu extension, which solves the sets of inputs on a pool of threads
+        (each with its own IDA and KLU memory) without holding the GIL.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model whose solution to calculate.
+        t_eval : numeric type
+            The times at which to compute the solution
+        inputs_list : list of dict
+            The external variables or input parameters for each solution
+        nthreads : int, optional
+            The number of threads. Default is the number of CPUs.
+        """
+        if model.convert_to_format != "casadi":
+            raise pybamm.SolverError(
+                "Cannot use the 'batched' parallel backend unless the model is "
+                "converted to casadi format"
+            )
+        setup = self._setup[model]
+        if setup['output_variables'] is not None:
+            raise pybamm.SolverError(
+                "Cannot use the 'batched' parallel backend with output_variables"
+            )
+        y0, ydot0, atol = self._get_initial_state(model)
+        # one row of inputs for each solution
+        inputs = np.vstack(
+            [self._stack_inputs(inputs_dict).reshape(-1) for inputs_dict in inputs_list]
+        )
+        n_batch = len(inputs_list)
+        nthreads = min(nthreads or os.cpu_count() or 1, n_batch)
+
+        timer = pybamm.Timer()
+        sol = idaklu.solve_casadi_batch(
+            t_eval,
+            y0,
+            ydot0,
+            setup['rhs_algebraic'],
+            setup['jac_times_cjmass'],
+            setup['jac_times_cjmass_colptrs'],
+            setup['jac_times_cjmass_rowvals'],
+            setup['jac_times_cjmass_nnz'],
+            setup['jac_rhs_algebraic_action'],
+            setup['mass_action'],
+            setup['sensfn'],
+            setup['rootfn'],
+            setup['num_of_events'],
+            setup['use_jac'],
+            setup['ids'],
+            atol, self.rtol, inputs,
+            setup['number_of_sensitivity_parameters'],
+            nthreads,
+        )
+        integration_time = timer.time()
+
+        solutions = []
+        for i, inputs_dict in enumerate(inputs_list):
+            # the solutions that stopped early are padded with NaN
+            n_t = sol.length[i]
+            solutions.append(
+                self._make_solution(
+                    model,
+                    inputs_dict,
+                    sol.t[i, :n_t],
+                    sol.y[i, :n_t],
+                    sol.yS[i, :, :n_t],
+                    sol.flag[i],
+                    # the solutions share a single call to the extension
+                    integration_time / n_batch,
+                )
+            )
+        return solutions
+
+    @staticmethod
+    def _stack_inputs(inputs_dict):
+        """Stack the values of the inputs into a column vector"""
         if inputs_dict:
             arrays_to_stack = [
                 np.array(x).reshape(-1, 1) for x in inputs_dict.values()
             ]
-            inputs = np.vstack(arrays_to_stack)
-        else:
-            inputs = np.array([[]])
+            return np.vstack(arrays_to_stack)
+        return np.array([[]])
 
+    def _get_initial_state(self, model):
+        """Return the initial state, its time derivative and the absolute tolerance"""
         # do this here cause y0 is set after set_up (calc consistent conditions)
         y0 = model.y0
         if isinstance(y0, casadi.DM):
@@ -446,86 +682,57 @@ class IDAKLUSolver(pybamm.BaseSolver):
             atol = model.atol
         except AttributeError:
             atol = self.atol
-
-        rtol = self.rtol
         atol = self._check_atol_type(atol, y0.size)
 
-        timer = pybamm.Timer()
-        if model.convert_to_format == "casadi":
-            sol = idaklu.solve_casadi(
-                t_eval,
-                y0,
-                ydot0,
-                self._setup['rhs_algebraic'],
-                self._setup['jac_times_cjmass'],
-                self._setup['jac_times_cjmass_colptrs'],
-                self._setup['jac_times_cjmass_rowvals'],
-                self._setup['jac_times_cjmass_nnz'],
-                self._setup['jac_rhs_algebraic_action'],
-                self._setup['mass_action'],
-                self._setup['sensfn'],
-                self._setup['rootfn'],
-                self._setup['num_of_events'],
-                self._setup['use_jac'],
-                self._setup['ids'],
-                atol, rtol, inputs,
-                self._setup['number_of_sensitivity_parameters']
-            )
-        else:
-            sol = idaklu.solve_python(
-                t_eval,
-                y0,
-                ydot0,
-                self._setup['resfn'],
-                self._setup['jac_class'].jac_res,
-                self._setup['sensfn'],
-                self._setup['jac_class'].get_jac_data,
-                self._setup['jac_class'].get_jac_row_vals,
-                self._setup['jac_class'].get_jac_col_ptrs,
-                self._setup['jac_class'].nnz,
-                self._setup['rootfn'],
-                self._setup['num_of_events'],
-                self._setup['use_jac'],
-                self._setup['ids'],
-                atol, rtol, inputs,
-                self._setup['number_of_sensitivity_parameters'],
-            )
-        integration_time = timer.time()
+        return y0, ydot0, atol
 
+    def _make_solution(
+        self, model, inputs_dict, t, y, yS, flag, integration_time, y_final=None
+    ):
+        """
+        Create a :class:`pybamm.Solution` from the output of the idaklu extension,
+        or raise a :class:`pybamm.SolverError` if the solver failed. If the model has
+        output variables, `y` contains their values and `y_final` the final state.
+        """
+        setup = self._setup[model]
         number_of_sensitivity_parameters = \
-            self._setup['number_of_sensitivity_parameters']
-        sensitivity_names = self._setup['sensitivity_names']
-        t = sol.t
+            setup['number_of_sensitivity_parameters']
+        sensitivity_names = setup['sensitivity_names']
         number_of_timesteps = t.size
-        number_of_states = y0.size
-        y_out = sol.y.reshape((number_of_timesteps, number_of_states))
+        y_out = y.reshape((number_of_timesteps, -1))
 
         # return sensitivity solution, we need to flatten yS to
         # (#timesteps * #states,) to match format used by Solution
         if number_of_sensitivity_parameters != 0:
             yS_out = {
-                name: sol.yS[i].reshape(-1, 1)
+                name: yS[i].reshape(-1, 1)
                 for i, name in enumerate(sensitivity_names)
             }
         else:
             yS_out = False
-        if sol.flag in [0, 2]:
+        if flag in [0, 2]:
             # 0 = solved for all t_eval
-            if sol.flag == 0:
+            if flag == 0:
                 termination = "final time"
             # 2 = found root(s)
-            elif sol.flag == 2:
+            elif flag == 2:
                 termination = "event"
 
+            output_variables = setup['output_variables']
+            if output_variables is None:
+                y_event = np.transpose(y_out[-1])[:, np.newaxis]
+            else:
+                y_event = y_final[:, np.newaxis]
             sol = pybamm.Solution(
-                sol.t,
+                t,
                 np.transpose(y_out),
                 model,
                 inputs_dict,
                 np.array([t[-1]]),
-                np.transpose(y_out[-1])[:, np.newaxis],
+                y_event,
                 termination,
                 sensitivities=yS_out,
+                output_variables=output_variables,
             )
             sol.integration_time = integration_time
             return sol
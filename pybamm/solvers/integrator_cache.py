@@ -0,0 +1,134 @@
+#
+# Cache of CasADi integrators
+#
+from collections import OrderedDict
+
+
+class IntegratorCache:
+    """
+    A least-recently-used cache of CasADi integrators, used by
+    :class:`pybamm.CasadiSolver` to avoid re-creating an integrator for each time
+    grid. Entries are keyed on a fingerprint of the integrator specifications
+    (method, problem and options), so that models with identical specifications
+    share their integrators, and on the (shifted and rounded) time grid.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of integrators. Default is 100. If None, the number of
+        integrators is not limited.
+    max_bytes : int, optional
+        The maximum total estimated size of the integrators, in bytes (see
+        :meth:`estimate_nbytes`). Default is None (not limited).
+
+    Attributes
+    ----------
+    hits : int
+        The number of times an integrator has been found in the cache
+    misses : int
+        The number of times an integrator has not been found in the cache
+    evictions : int
+        The number of integrators removed to keep the cache within its limits
+    """
+
+    def __init__(self, max_entries=100, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def nbytes(self):
+        """The total estimated size of the integrators in the cache, in bytes"""
+        return self._nbytes
+
+    @property
+    def stats(self):
+        """Dictionary of the cache statistics"""
+        return {
+            "entries": len(self),
+            "nbytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    @staticmethod
+    def estimate_nbytes(integrator):
+        """
+        Estimate the memory used by a CasADi function, in bytes, from the sizes of
+        its work vectors and outputs (which grow with the number of points in the
+        time grid of an integrator).
+        """
+        n_out = sum(integrator.nnz_out(i) for i in range(integrator.n_out()))
+        return 8 * (integrator.sz_w() + integrator.sz_iw() + n_out)
+
+    def get(self, key):
+        """
+        Return the integrator stored with `key`, or None if there is none.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the integrator
+
+        Returns
+        -------
+        :class:`casadi.Function` or None
+            The integrator
+        """
+        try:
+            integrator, _ = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return integrator
+
+    def put(self, key, integrator):
+        """
+        Store an integrator, then remove the least recently used integrators until
+        the cache is within its limits. The integrator that has just been stored is
+        never removed.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the integrator
+        integrator : :class:`casadi.Function`
+            The integrator
+        """
+        if key in self._entries:
+            self._nbytes -= self._entries.pop(key)[1]
+        nbytes = self.estimate_nbytes(integrator)
+        self._entries[key] = (integrator, nbytes)
+        self._nbytes += nbytes
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+        ):
+            _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= evicted_nbytes
+            self.evictions += 1
+
+    def items(self):
+        """
+        Return a list of the (key, integrator) pairs in the cache, from the least to
+        the most recently used, without changing the order of use.
+        """
+        return [(key, integrator) for key, (integrator, _) in self._entries.items()]
+
+    def clear(self):
+        """Remove all the integrators."""
+        self._entries.clear()
+        self._nbytes = 0
@@ -0,0 +1,110 @@
+#
+# Storage of solution states in memory-mapped files
+#
+import os
+import shutil
+import tempfile
+import uuid
+import weakref
+
+import casadi
+import numpy as np
+import pybamm
+
+
+class MemoryMappedStorage:
+    """
+    Storage of the states of solutions in memory-mapped ``.npy`` files, so that very
+    long solutions (e.g. thousands of cycles of an ageing experiment) do not need to
+    be held in memory. The operating system only keeps the parts of the files that
+    are being read in memory.
+
+    Use :meth:`pybamm.Solution.move_to_storage` to move the states of a solution to
+    the storage, or pass the storage to :meth:`pybamm.Simulation.solve` to move the
+    states of each step of an experiment as soon as it has been solved. The states
+    are then read lazily, in chunks of `pybamm.settings.memmap_chunk_size` time
+    points, when processing variables.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory to write the files to. If None (default), a temporary
+        directory is created, which is deleted when the storage is garbage
+        collected (or at exit).
+    """
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="pybamm-solution-")
+            # Memory-mapped arrays keep their files open, so the directory can be
+            # deleted (on POSIX systems) while solutions are still using it
+            self._finalizer = weakref.finalize(
+                self, shutil.rmtree, directory, ignore_errors=True
+            )
+        else:
+            os.makedirs(directory, exist_ok=True)
+            self._finalizer = None
+        self.directory = directory
+
+    def _new_file(self, shape):
+        filename = os.path.join(self.directory, uuid.uuid4().hex + ".npy")
+        return np.lib.format.open_memmap(
+            filename, mode="w+", dtype=np.float64, shape=shape
+        )
+
+    def store(self, ys):
+        """
+        Write an array of states to a new file.
+
+        Parameters
+        ----------
+        ys : :class:`numpy.array` or :class:`casadi.DM`
+            The states, with one column per time point
+
+        Returns
+        -------
+        :class:`numpy.memmap`
+            A read-only memory-mapped array with the same values
+        """
+        if isinstance(ys, np.memmap):
+            return ys
+        if isinstance(ys, casadi.DM):
+            ys = ys.full()
+        out = self._new_file(ys.shape)
+        out[...] = ys
+        return self._read_only(out)
+
+    def concatenate(self, arrays):
+        """
+        Concatenate arrays of states along the time axis into a new file, copying
+        them in chunks of `pybamm.settings.memmap_chunk_size` time points.
+
+        Parameters
+        ----------
+        arrays : list of :class:`numpy.array`
+            The arrays to concatenate, with the same number of rows
+
+        Returns
+        -------
+        :class:`numpy.memmap`
+            A read-only memory-mapped array of the concatenated arrays
+        """
+        n_rows = arrays[0].shape[0]
+        out = self._new_file((n_rows, sum(array.shape[1] for array in arrays)))
+        chunk_size = pybamm.settings.memmap_chunk_size
+        idx = 0
+        for array in arrays:
+            if array.shape[0] != n_rows:
+                raise ValueError("all the arrays must have the same number of rows")
+            for start in range(0, array.shape[1], chunk_size):
+                chunk = array[:, start : start + chunk_size]
+                out[:, idx : idx + chunk.shape[1]] = chunk
+                idx += chunk.shape[1]
+        return self._read_only(out)
+
+    @staticmethod
+    def _read_only(array):
+        array.flush()
+        filename = array.filename
+        del array
+        return np.load(filename, mmap_mode="r")
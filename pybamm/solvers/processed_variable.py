@@ -6,6 +6,7 @@ import numbers
 import numpy as np
 import pybamm
 import scipy.interpolate as interp
+from collections import OrderedDict
 
 
 class ProcessedVariable(object):
@@ -31,9 +32,25 @@ class ProcessedVariable(object):
     warn : bool, optional
         Whether to raise warnings when trying to evaluate time and length scales.
         Default is True.
+    lazy : bool, optional
+        Whether to evaluate 2D variables lazily: only the time slices needed to
+        interpolate at the times requested by `__call__` are evaluated, and the
+        full `entries` are only evaluated when accessed. Default is
+        `pybamm.settings.lazy_2D_variables`.
+    cache_size : int, optional
+        The number of time slices of a lazy 2D variable to keep in memory, the least
+        recently used slices being discarded first. Default is 32.
     """
 
-    def __init__(self, base_variables, base_variables_casadi, solution, warn=True):
+    def __init__(
+        self,
+        base_variables,
+        base_variables_casadi,
+        solution,
+        warn=True,
+        lazy=None,
+        cache_size=32,
+    ):
         self.base_variables = base_variables
         self.base_variables_casadi = base_variables_casadi
 
@@ -46,9 +63,18 @@ class ProcessedVariable(object):
         self.domain = base_variables[0].domain
         self.domains = base_variables[0].domains
         self.warn = warn
+        if lazy is None:
+            lazy = pybamm.settings.lazy_2D_variables
+        self.lazy = False
+        self._entries = None
+        self._time_slices = OrderedDict()
+        self._time_slices_size = cache_size
 
         self.symbolic_inputs = solution.has_symbolic_inputs
 
+        # Casadi functions mapped over time points, see `_get_mapped_casadi`
+        self._mapped_casadi = {}
+
         # Sensitivity starts off uninitialized, only set when called
         self._sensitivities = None
         self.solution_sensitivities = solution.sensitivities
@@ -96,7 +122,7 @@ class ProcessedVariable(object):
                         len(first_dim_nodes),
                         len(first_dim_edges),
                     ]:
-                        self.initialise_2D()
+                        self.initialise_2D(lazy=lazy)
                     else:
                         # Raise error for 3D variable
                         raise NotImplementedError(
@@ -104,19 +130,64 @@ class ProcessedVariable(object):
                             + "(note processing of 3D variables is not yet implemented)"
                         )
 
-    def initialise_0D(self):
-        # initialise empty array of the correct size
-        entries = np.empty(len(self.t_pts))
+    def _evaluate_all_sub_solutions(self):
+        """
+        Evaluate the base variable at every time point of every sub-solution.
+        Rather than calling the casadi function once per time point, each
+        sub-solution is evaluated in a single call to a version of the function that
+        is mapped over the columns of `ys`. States stored in memory-mapped files (see
+        :class:`pybamm.MemoryMappedStorage`) are read and evaluated in chunks of
+        `pybamm.settings.memmap_chunk_size` time points, so that only one chunk is
+        in memory at a time.
+
+        Returns
+        -------
+        entries : :class:`numpy.array`, size (n, len(t_pts))
+            The (flattened) value of the base variable at each time point
+        """
+        entries = np.empty((self.base_eval.size, len(self.t_pts)))
         idx = 0
-        # Evaluate the base_variable index-by-index
         for ts, ys, inputs, base_var_casadi in zip(
             self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
         ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[idx] = base_var_casadi(t, y, inputs).full()[0, 0]
-                idx += 1
+            if isinstance(ys, np.memmap):
+                chunk_size = pybamm.settings.memmap_chunk_size
+                chunks = (
+                    (
+                        ts[start : start + chunk_size],
+                        np.asarray(ys[:, start : start + chunk_size]),
+                    )
+                    for start in range(0, len(ts), chunk_size)
+                )
+            else:
+                chunks = [(ts, ys)] if len(ts) > 0 else []
+            for ts_chunk, ys_chunk in chunks:
+                n_t = len(ts_chunk)
+                mapped_casadi = self._get_mapped_casadi(base_var_casadi, n_t)
+                # Inputs are the same for all time points, so casadi broadcasts them
+                # across the map
+                entries[:, idx : idx + n_t] = mapped_casadi(
+                    ts_chunk, ys_chunk, inputs
+                ).full()
+                idx += n_t
+        return entries
+
+    def _get_mapped_casadi(self, base_var_casadi, n_t):
+        """
+        Return a version of `base_var_casadi` that evaluates `n_t` time points in a
+        single call. Mapped functions are cached so that sub-solutions of the same
+        model and length (e.g. repeated experiment steps) reuse them.
+        """
+        if n_t == 1:
+            return base_var_casadi
+        key = (id(base_var_casadi), n_t)
+        if key not in self._mapped_casadi:
+            self._mapped_casadi[key] = base_var_casadi.map(n_t)
+        return self._mapped_casadi[key]
+
+    def initialise_0D(self):
+        # Evaluate the base_variable in one batch per sub-solution
+        entries = self._evaluate_all_sub_solutions()[0]
 
         # set up interpolation
         if len(self.t_pts) == 1:
@@ -136,19 +207,8 @@ class ProcessedVariable(object):
         self.dimensions = 0
 
     def initialise_1D(self, fixed_t=False):
-        len_space = self.base_eval.shape[0]
-        entries = np.empty((len_space, len(self.t_pts)))
-
-        # Evaluate the base_variable index-by-index
-        idx = 0
-        for ts, ys, inputs, base_var_casadi in zip(
-            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
-        ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, idx] = base_var_casadi(t, y, inputs).full()[:, 0]
-                idx += 1
+        # Evaluate the base_variable in one batch per sub-solution
+        entries = self._evaluate_all_sub_solutions()
 
         # Get node and edge values
         nodes = self.mesh.nodes
@@ -222,9 +282,11 @@ class ProcessedVariable(object):
                 bounds_error=False,
             )
 
-    def initialise_2D(self):
+    def initialise_2D(self, lazy=False):
         """
         Initialise a 2D object that depends on x and r, x and z, x and R, or R and r.
+        If `lazy` (and there is more than one time point), the variable is not
+        evaluated yet, see :class:`LazyInterpolant2D`.
         """
         first_dim_nodes = self.mesh.nodes
         first_dim_edges = self.mesh.edges
@@ -236,24 +298,13 @@ class ProcessedVariable(object):
             first_dim_pts = first_dim_edges
 
         second_dim_pts = second_dim_nodes
-        first_dim_size = len(first_dim_pts)
-        second_dim_size = len(second_dim_pts)
-        entries = np.empty((first_dim_size, second_dim_size, len(self.t_pts)))
-
-        # Evaluate the base_variable index-by-index
-        idx = 0
-        for ts, ys, inputs, base_var_casadi in zip(
-            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
-        ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, :, idx] = np.reshape(
-                    base_var_casadi(t, y, inputs).full(),
-                    [first_dim_size, second_dim_size],
-                    order="F",
-                )
-                idx += 1
+        self._shape_2D = (len(first_dim_pts), len(second_dim_pts))
+        lazy = lazy and len(self.t_pts) > 1
+        if not lazy:
+            # Evaluate the base_variable in one batch per sub-solution. Each column is
+            # the flattened (Fortran order) value at one time point
+            entries = self._evaluate_2D_entries()
+            entries_for_interp = self._extrapolate_2D_entries(entries)
 
         # add points outside first dimension domain for extrapolation to
         # boundaries
@@ -266,11 +317,6 @@ class ProcessedVariable(object):
         first_dim_pts = np.concatenate(
             [extrap_space_first_dim_left, first_dim_pts, extrap_space_first_dim_right]
         )
-        extrap_entries_left = np.expand_dims(2 * entries[0] - entries[1], axis=0)
-        extrap_entries_right = np.expand_dims(2 * entries[-1] - entries[-2], axis=0)
-        entries_for_interp = np.concatenate(
-            [extrap_entries_left, entries, extrap_entries_right], axis=0
-        )
 
         # add points outside second dimension domain for extrapolation to
         # boundaries
@@ -287,20 +333,6 @@ class ProcessedVariable(object):
                 extrap_space_second_dim_right,
             ]
         )
-        extrap_entries_second_dim_left = np.expand_dims(
-            2 * entries_for_interp[:, 0, :] - entries_for_interp[:, 1, :], axis=1
-        )
-        extrap_entries_second_dim_right = np.expand_dims(
-            2 * entries_for_interp[:, -1, :] - entries_for_interp[:, -2, :], axis=1
-        )
-        entries_for_interp = np.concatenate(
-            [
-                extrap_entries_second_dim_left,
-                entries_for_interp,
-                extrap_entries_second_dim_right,
-            ],
-            axis=1,
-        )
 
         # Process r-x, x-z, r-R, R-x, or R-z
         if self.domain[0] in [
@@ -367,7 +399,9 @@ class ProcessedVariable(object):
             )
 
         # assign attributes for reference
-        self.entries = entries
+        self.lazy = lazy
+        if not lazy:
+            self.entries = entries
         self.dimensions = 2
         if self.first_dimension == "r" and self.second_dimension == "R":
             # for an r-R variable, must leave r nondimensional as it was scaled using
@@ -389,7 +423,15 @@ class ProcessedVariable(object):
         self.second_dim_pts = second_dim_edges * second_length_scale
 
         # set up interpolation
-        if len(self.t_pts) == 1:
+        if lazy:
+            # function of space and time, evaluated when called
+            self._interpolation_function = LazyInterpolant2D(
+                first_dim_pts_for_interp,
+                second_dim_pts_for_interp,
+                self.t_pts,
+                self._get_time_slice_for_interp,
+            )
+        elif len(self.t_pts) == 1:
             # function of space only. Note the order of the points is the reverse
             # of what you'd expect
             self._interpolation_function = Interpolant2D(
@@ -405,27 +447,89 @@ class ProcessedVariable(object):
                 bounds_error=False,
             )
 
+    def _evaluate_2D_entries(self):
+        """Evaluate a 2D variable at all the time points"""
+        return np.reshape(
+            self._evaluate_all_sub_solutions(),
+            [*self._shape_2D, len(self.t_pts)],
+            order="F",
+        )
+
+    @staticmethod
+    def _extrapolate_2D_entries(entries):
+        """
+        Add points outside the domain of both dimensions of `entries` (of shape
+        (first_dim, second_dim, time)), for extrapolation to the boundaries
+        """
+        extrap_entries_left = np.expand_dims(2 * entries[0] - entries[1], axis=0)
+        extrap_entries_right = np.expand_dims(2 * entries[-1] - entries[-2], axis=0)
+        entries_for_interp = np.concatenate(
+            [extrap_entries_left, entries, extrap_entries_right], axis=0
+        )
+        extrap_entries_second_dim_left = np.expand_dims(
+            2 * entries_for_interp[:, 0, :] - entries_for_interp[:, 1, :], axis=1
+        )
+        extrap_entries_second_dim_right = np.expand_dims(
+            2 * entries_for_interp[:, -1, :] - entries_for_interp[:, -2, :], axis=1
+        )
+        return np.concatenate(
+            [
+                extrap_entries_second_dim_left,
+                entries_for_interp,
+                extrap_entries_second_dim_right,
+            ],
+            axis=1,
+        )
+
+    def _get_time_slice_for_interp(self, idx):
+        """
+        Return the value of a lazy 2D variable at the `idx`-th time point, with the
+        points for extrapolation, keeping the most recently used slices in memory
+        """
+        if idx in self._time_slices:
+            self._time_slices.move_to_end(idx)
+            return self._time_slices[idx]
+
+        # Find the sub-solution of this time point
+        idx_in_sub_solution = idx
+        for ts, ys, inputs, base_var_casadi in zip(
+            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
+        ):
+            if idx_in_sub_solution < len(ts):
+                break
+            idx_in_sub_solution -= len(ts)
+        entries = base_var_casadi(
+            ts[idx_in_sub_solution], ys[:, idx_in_sub_solution], inputs
+        ).full()
+        entries = np.reshape(entries, [*self._shape_2D, 1], order="F")
+        time_slice = self._extrapolate_2D_entries(entries)[:, :, 0]
+
+        self._time_slices[idx] = time_slice
+        if len(self._time_slices) > self._time_slices_size:
+            self._time_slices.popitem(last=False)
+        return time_slice
+
+    @property
+    def entries(self):
+        """The value of the variable at all the time points of the solution"""
+        if self._entries is None and self.lazy:
+            self._entries = self._evaluate_2D_entries()
+        return self._entries
+
+    @entries.setter
+    def entries(self, value):
+        self._entries = value
+
     def initialise_2D_scikit_fem(self):
         y_sol = self.mesh.edges["y"]
         len_y = len(y_sol)
         z_sol = self.mesh.edges["z"]
         len_z = len(z_sol)
-        entries = np.empty((len_y, len_z, len(self.t_pts)))
-
-        # Evaluate the base_variable index-by-index
-        idx = 0
-        for ts, ys, inputs, base_var_casadi in zip(
-            self.all_ts, self.all_ys, self.all_inputs_casadi, self.base_variables_casadi
-        ):
-            for inner_idx, t in enumerate(ts):
-                t = ts[inner_idx]
-                y = ys[:, inner_idx]
-                entries[:, :, idx] = np.reshape(
-                    base_var_casadi(t, y, inputs).full(),
-                    [len_y, len_z],
-                    order="C",
-                )
-                idx += 1
+        # Evaluate the base_variable in one batch per sub-solution. Each column is
+        # the flattened (C order) value at one time point
+        entries = np.reshape(
+            self._evaluate_all_sub_solutions(), [len_y, len_z, len(self.t_pts)]
+        )
 
         # assign attributes for reference
         self.entries = entries
@@ -668,6 +772,60 @@ class Interpolant2D:
             return self.interpolant(second_dim, first_dim)[0]
 
 
+class LazyInterpolant2D:
+    """
+    Interpolant of a 2D variable in space and time that only evaluates the time
+    slices it needs. When called, the time points on either side of each requested
+    time are found, the variable is evaluated at these time points only (see
+    `get_time_slice`), and the result is interpolated on this subset of the time
+    grid, which gives the same values as interpolating on the full grid.
+
+    Parameters
+    ----------
+    first_dim_pts_for_interp : :class:`numpy.array`
+        The points of the first dimension
+    second_dim_pts_for_interp : :class:`numpy.array`
+        The points of the second dimension
+    t_pts : :class:`numpy.array`
+        The time points of the solution
+    get_time_slice : callable
+        Returns the value of the variable at the i-th time point, of size
+        (len(first_dim_pts_for_interp), len(second_dim_pts_for_interp))
+    """
+
+    def __init__(
+        self,
+        first_dim_pts_for_interp,
+        second_dim_pts_for_interp,
+        t_pts,
+        get_time_slice,
+    ):
+        self.first_dim_pts_for_interp = first_dim_pts_for_interp
+        self.second_dim_pts_for_interp = second_dim_pts_for_interp
+        self.t_pts = t_pts
+        self.get_time_slice = get_time_slice
+
+    def __call__(self, input):
+        first_dim, second_dim, t = input
+        # Indices of the time points on either side of each requested time
+        idx = np.searchsorted(self.t_pts, np.ravel(t), side="right") - 1
+        idx = np.clip(idx, 0, len(self.t_pts) - 2)
+        needed = np.unique(np.concatenate([idx, idx + 1]))
+        entries = np.stack([self.get_time_slice(i) for i in needed], axis=-1)
+        interpolant = interp.RegularGridInterpolator(
+            (
+                self.first_dim_pts_for_interp,
+                self.second_dim_pts_for_interp,
+                self.t_pts[needed],
+            ),
+            entries,
+            method="linear",
+            fill_value=np.nan,
+            bounds_error=False,
+        )
+        return interpolant((first_dim, second_dim, t))
+
+
 def eval_dimension_name(name, x, r, y, z, R):
     if name == "x":
         out = x
@@ -60,6 +60,12 @@ class Solution(object):
         True if sensitivities included as the solution of the explicit forwards
         equations.  False if no sensitivities included/wanted. Dict if sensitivities are
         provided as a dict of {parameter: sensitivities} pairs.
+    output_variables : dict, optional
+        If given, `all_ys` contains the values of these variables (stacked) rather
+        than the states of the model, and `y_event` is the final state. Dict of
+        {name: casadi.Function} pairs, each returning the value of a variable from
+        (t, y, inputs), where y is a column of `all_ys`. Only these variables can be
+        processed. Default is None.
 
     """
 
@@ -74,6 +80,7 @@ class Solution(object):
         termination="final time",
         sensitivities=False,
         check_solution=True,
+        output_variables=None,
     ):
         if not isinstance(all_ts, list):
             all_ts = [all_ts]
@@ -92,11 +99,17 @@ class Solution(object):
             for key, value in all_inputs_copy.items():
                 if isinstance(value, numbers.Number):
                     all_inputs_copy[key] = np.array([value])
-            self.all_inputs = [all_inputs_copy]
+            self._all_inputs = [all_inputs_copy]
         else:
-            self.all_inputs = all_inputs
+            self._all_inputs = all_inputs
+
+        # The lists of sub-solution data may be shared with (and extended by) other
+        # solutions, see `__add__`. This solution only ever "sees" the first
+        # `_n_sub_solutions` entries of each list
+        self._n_sub_solutions = len(all_ts)
 
         self.sensitivities = sensitivities
+        self._output_variables = output_variables
 
         self._t_event = t_event
         self._y_event = y_event
@@ -107,7 +120,11 @@ class Solution(object):
         )
 
         # Check no ys are too large
-        if check_solution and not self.has_symbolic_inputs:
+        if (
+            check_solution
+            and not self.has_symbolic_inputs
+            and output_variables is None
+        ):
             self.check_ys_are_not_too_large()
 
         # Copy the timescale_eval and lengthscale_evals if they exist
@@ -140,7 +157,7 @@ class Solution(object):
         self.data = pybamm.FuzzyDict()
 
         # Add self as sub-solution for compatibility with ProcessedVariable
-        self._sub_solutions = [self]
+        self._set_sub_solutions([self])
 
         # initialize empty cycles
         self._cycles = []
@@ -160,7 +177,9 @@ class Solution(object):
             self.all_models[0], self.y, self.t, self.all_inputs[0]
         )
 
-        # make sure we remove all sensitivities from all_ys
+        # make sure we remove all sensitivities from all_ys. This modifies all_ys in
+        # place, which is safe because solutions with sensitivities never share their
+        # lists of sub-solution data (see `_extendable_sub_solution_data`)
         for index, (model, ys, ts, inputs) in enumerate(
             zip(self.all_models, self.all_ys, self.all_ts, self.all_inputs)
         ):
@@ -309,6 +328,9 @@ class Solution(object):
         try:
             if isinstance(self.all_ys[0], (casadi.DM, casadi.MX)):
                 self._y = casadi.horzcat(*self.all_ys)
+            elif any(isinstance(ys, np.memmap) for ys in self.all_ys):
+                # Concatenate into a (temporary) file rather than in memory
+                self._y = pybamm.MemoryMappedStorage().concatenate(self.all_ys)
             else:
                 self._y = np.hstack(self.all_ys)
         except ValueError:
@@ -317,6 +339,74 @@ class Solution(object):
                 "computed explicitly."
             )
 
+    def move_to_storage(self, storage):
+        """
+        Move the states of each sub-solution to memory-mapped files, which are then
+        read lazily (see :class:`pybamm.MemoryMappedStorage`). The in-memory states
+        are only freed once nothing else refers to them.
+
+        Parameters
+        ----------
+        storage : :class:`pybamm.MemoryMappedStorage` or str
+            The storage to move the states to, or the directory of a new storage
+        """
+        if self._sensitivities:
+            raise NotImplementedError(
+                "Solutions with sensitivities cannot be moved to a storage"
+            )
+        if isinstance(storage, str):
+            storage = pybamm.MemoryMappedStorage(storage)
+        stored = {}
+
+        def store(ys):
+            if id(ys) not in stored:
+                # keep the old states alive until the end, so that ids are not
+                # reused
+                stored[id(ys)] = (ys, storage.store(ys))
+            return stored[id(ys)][1]
+
+        def last_column(ys):
+            column = ys[:, -1]
+            if isinstance(column, casadi.DM):
+                column = column.full()
+            return np.ravel(column)
+
+        # Store the states of each sub-solution once
+        sub_solutions = [sol for sol in self.sub_solutions if sol is not self]
+        sub_ys = [ys for sol in sub_solutions for ys in sol.all_ys]
+        for sol in sub_solutions:
+            # only the entries of the sub-solution itself, since its lists may have
+            # been extended in place by this solution
+            for i, ys in enumerate(sol.all_ys):
+                sol._all_ys[i] = store(ys)
+
+        # The states of this solution are those of its sub-solutions, without the
+        # first time point of a sub-solution if it repeats the last time point of
+        # the previous one (see `__add__`), so refer to the stored states of the
+        # sub-solutions rather than storing copies of them
+        # (again only the entries of this solution itself)
+        aligned = len(sub_ys) == len(self.all_ys)
+        for i, ys in enumerate(self.all_ys):
+            if aligned and i < len(sub_ys) and id(ys) not in stored:
+                old_ys = sub_ys[i]
+                if (
+                    ys.shape[0] == old_ys.shape[0]
+                    and ys.shape[1] == old_ys.shape[1] - 1
+                    and ys.shape[1] > 0
+                    and np.array_equal(last_column(ys), last_column(old_ys))
+                ):
+                    self._all_ys[i] = stored[id(old_ys)][1][:, 1:]
+                    continue
+            self._all_ys[i] = store(ys)
+
+        # Remove cached views of the old states
+        for sol in [self] + sub_solutions:
+            sol._all_ys_and_sens = sol._all_ys
+            for attr in ["_y", "_first_state", "_last_state"]:
+                sol.__dict__.pop(attr, None)
+            sol._variables = pybamm.FuzzyDict()
+            sol.data = pybamm.FuzzyDict()
+
     def check_ys_are_not_too_large(self):
         # Only check last one so that it doesn't take too long
         # We only care about the cases where y is growing too large without any
@@ -335,23 +425,43 @@ class Solution(object):
                         "'pybammm.settings.max_y_value'."
                     )
 
+    def _own_entries(self, entries, n=None):
+        """
+        Return the first `n` entries (default: the number of sub-solutions) of a
+        (possibly shared) list of sub-solution data, i.e. the entries that belong to
+        this solution. Only solutions that have since been extended by another
+        solution need to slice the list.
+        """
+        n = n or self._n_sub_solutions
+        if len(entries) == n:
+            return entries
+        return entries[:n]
+
+    def _set_sub_solutions(self, sub_solutions):
+        self._sub_solutions = sub_solutions
+        self._n_sub_solution_objects = len(sub_solutions)
+
     @property
     def all_ts(self):
-        return self._all_ts
+        return self._own_entries(self._all_ts)
 
     @property
     def all_ys(self):
-        return self._all_ys
+        return self._own_entries(self._all_ys)
 
     @property
     def all_models(self):
         """Model(s) used for solution"""
-        return self._all_models
+        return self._own_entries(self._all_models)
+
+    @property
+    def all_inputs(self):
+        return self._own_entries(self._all_inputs)
 
     @property
     def all_inputs_casadi(self):
         try:
-            return self._all_inputs_casadi
+            return self._own_entries(self._all_inputs_casadi)
         except AttributeError:
             self._all_inputs_casadi = [
                 casadi.vertcat(*inp.values()) for inp in self.all_inputs
@@ -368,6 +478,30 @@ class Solution(object):
         """Value of the solution at the time of the event"""
         return self._y_event
 
+    @property
+    def output_variables(self):
+        """
+        The functions of the output variables stored in `all_ys` instead of the
+        states, or None if `all_ys` contains the states
+        """
+        return self._output_variables
+
+    @property
+    def final_state(self):
+        """The state of the model at the last time of the solution"""
+        if self.output_variables is None:
+            final_state = self.all_ys[-1][:, -1]
+            if isinstance(final_state, np.memmap):
+                # Read the state into memory
+                final_state = np.array(final_state)
+            return final_state
+        if self.y_event is None:
+            raise pybamm.SolverError(
+                "The final state is not available, since the solution only contains "
+                "the output variables"
+            )
+        return self.y_event.flatten()
+
     @property
     def termination(self):
         """Reason for termination"""
@@ -396,9 +530,10 @@ class Solution(object):
                 None,
                 None,
                 "success",
+                output_variables=self.output_variables,
             )
             new_sol._all_inputs_casadi = self.all_inputs_casadi[:1]
-            new_sol._sub_solutions = self.sub_solutions[:1]
+            new_sol._set_sub_solutions(self.sub_solutions[:1])
 
             new_sol.solve_time = 0
             new_sol.integration_time = 0
@@ -425,9 +560,10 @@ class Solution(object):
                 self.t_event,
                 self.y_event,
                 self.termination,
+                output_variables=self.output_variables,
             )
             new_sol._all_inputs_casadi = self.all_inputs_casadi[-1:]
-            new_sol._sub_solutions = self.sub_solutions[-1:]
+            new_sol._set_sub_solutions(self.sub_solutions[-1:])
 
             new_sol.solve_time = 0
             new_sol.integration_time = 0
@@ -488,44 +624,59 @@ class Solution(object):
                 vars_pybamm = [
                     model.variables_and_events[key] for model in self.all_models
                 ]
-
-                # Iterate through all models, some may be in the list several times and
-                # therefore only get set up once
-                vars_casadi = []
-                for model, ys, inputs, var_pybamm in zip(
-                    self.all_models, self.all_ys, self.all_inputs, vars_pybamm
-                ):
-                    if key in model._variables_casadi:
-                        var_casadi = model._variables_casadi[key]
-                    else:
-                        t_MX = casadi.MX.sym("t")
-                        y_MX = casadi.MX.sym("y", ys.shape[0])
-                        symbolic_inputs_dict = {
-                            key: casadi.MX.sym("input", value.shape[0])
-                            for key, value in inputs.items()
-                        }
-                        symbolic_inputs = casadi.vertcat(
-                            *[p for p in symbolic_inputs_dict.values()]
-                        )
-
-                        # Convert variable to casadi
-                        # Make all inputs symbolic first for converting to casadi
-                        var_sym = var_pybamm.to_casadi(
-                            t_MX, y_MX, inputs=symbolic_inputs_dict
-                        )
-
-                        var_casadi = casadi.Function(
-                            "variable", [t_MX, y_MX, symbolic_inputs], [var_sym]
-                        )
-                        model._variables_casadi[key] = var_casadi
-                    vars_casadi.append(var_casadi)
-
+                vars_casadi = [
+                    self._get_variable_casadi(key, model, ys, inputs)
+                    for model, ys, inputs in zip(
+                        self.all_models, self.all_ys, self.all_inputs
+                    )
+                ]
                 var = pybamm.ProcessedVariable(vars_pybamm, vars_casadi, self)
 
             # Save variable and data
             self._variables[key] = var
             self.data[key] = var.data
 
+    def _get_variable_casadi(self, key, model, ys, inputs):
+        """
+        Return the casadi function of the variable `key` of `model`, with arguments
+        (t, y, inputs). If the solution only contains the output variables, these
+        are read directly from `all_ys`.
+        """
+        # The solution only contains the output variables, whose values are read
+        # directly from `all_ys`
+        if self.output_variables is not None:
+            if key not in self.output_variables:
+                raise KeyError(
+                    "'{}' is not one of the output variables of the solution "
+                    "({})".format(key, list(self.output_variables.keys()))
+                )
+            return self.output_variables[key]
+
+        # Models may be in the list of models several times and therefore only get
+        # set up once
+        if key in model._variables_casadi:
+            return model._variables_casadi[key]
+
+        t_MX = casadi.MX.sym("t")
+        y_MX = casadi.MX.sym("y", ys.shape[0])
+        symbolic_inputs_dict = {
+            name: casadi.MX.sym("input", value.shape[0])
+            for name, value in inputs.items()
+        }
+        symbolic_inputs = casadi.vertcat(*[p for p in symbolic_inputs_dict.values()])
+
+        # Convert variable to casadi
+        # Make all inputs symbolic first for converting to casadi
+        var_sym = model.variables_and_events[key].to_casadi(
+            t_MX, y_MX, inputs=symbolic_inputs_dict
+        )
+
+        var_casadi = casadi.Function(
+            "variable", [t_MX, y_MX, symbolic_inputs], [var_sym]
+        )
+        model._variables_casadi[key] = var_casadi
+        return var_casadi
+
     def __getitem__(self, key):
         """Read a variable from the solution. Variables are created 'just in time', i.e.
         only when they are called.
@@ -692,7 +843,7 @@ class Solution(object):
         """List of sub solutions that have been
         concatenated to form the full solution"""
 
-        return self._sub_solutions
+        return self._own_entries(self._sub_solutions, self._n_sub_solution_objects)
 
     def __add__(self, other):
         """Adds two solutions together, e.g. when stepping"""
@@ -702,6 +853,19 @@ class Solution(object):
             raise pybamm.SolverError(
                 "Only a Solution or None can be added to a Solution"
             )
+        if (self.output_variables is None) != (other.output_variables is None):
+            raise pybamm.SolverError(
+                "Cannot add a solution with output variables to a solution with "
+                "states"
+            )
+        if self._get_output_layout() != other._get_output_layout():
+            raise pybamm.SolverError(
+                "Cannot add solutions with different output variables "
+                "({} and {})".format(
+                    list(self.output_variables.keys()),
+                    list(other.output_variables.keys()),
+                )
+            )
         # Special case: new solution only has one timestep and it is already in the
         # existing solution. In this case, return a copy of the existing solution
         if (
@@ -719,35 +883,94 @@ class Solution(object):
         # Update list of sub-solutions
         if other.all_ts[0][0] == self.all_ts[-1][-1]:
             # Skip first time step if it is repeated
-            all_ts = self.all_ts + [other.all_ts[0][1:]] + other.all_ts[1:]
-            all_ys = self.all_ys + [other.all_ys[0][:, 1:]] + other.all_ys[1:]
+            other_ts = [other.all_ts[0][1:]] + other.all_ts[1:]
+            other_ys = [other.all_ys[0][:, 1:]] + other.all_ys[1:]
         else:
-            all_ts = self.all_ts + other.all_ts
-            all_ys = self.all_ys + other.all_ys
+            other_ts = other.all_ts
+            other_ys = other.all_ys
+
+        # Extend the sub-solution data in place where possible, so that adding a
+        # step to a long solution (e.g. in an experiment) does not copy all of the
+        # previous sub-solutions
+        (
+            all_ts,
+            all_ys,
+            all_models,
+            all_inputs,
+            all_inputs_casadi,
+            sub_solutions,
+        ) = self._extendable_sub_solution_data()
+        all_ts.extend(other_ts)
+        all_ys.extend(other_ys)
+        all_models.extend(other.all_models)
+        all_inputs.extend(other.all_inputs)
+        all_inputs_casadi.extend(other.all_inputs_casadi)
+        sub_solutions.extend(other.sub_solutions)
 
         new_sol = Solution(
             all_ts,
             all_ys,
-            self.all_models + other.all_models,
-            self.all_inputs + other.all_inputs,
+            all_models,
+            all_inputs,
             other.t_event,
             other.y_event,
             other.termination,
             bool(self.sensitivities),
+            output_variables=self.output_variables,
         )
 
         new_sol.closest_event_idx = other.closest_event_idx
-        new_sol._all_inputs_casadi = self.all_inputs_casadi + other.all_inputs_casadi
+        new_sol._all_inputs_casadi = all_inputs_casadi
 
         # Set solution time
         new_sol.solve_time = self.solve_time + other.solve_time
         new_sol.integration_time = self.integration_time + other.integration_time
 
         # Set sub_solutions
-        new_sol._sub_solutions = self.sub_solutions + other.sub_solutions
+        new_sol._set_sub_solutions(sub_solutions)
 
         return new_sol
 
+    def _get_output_layout(self):
+        """
+        Return the names and sizes of the output variables stacked in `all_ys`, in
+        order, or None if `all_ys` contains the states. Solutions can only be added
+        together if their layouts are the same.
+        """
+        if self.output_variables is None:
+            return None
+        return [
+            (name, func.size_in(1), func.size_out(0))
+            for name, func in self.output_variables.items()
+        ]
+
+    def _extendable_sub_solution_data(self):
+        """
+        Return lists of this solution's sub-solution data (times, states, models,
+        inputs, casadi inputs and sub-solutions) that can be extended in place.
+
+        If no other solution has been built on top of this one, the underlying lists
+        are returned directly, so that appending is amortised O(1): the existing
+        solution keeps seeing only its own (unchanged) first entries. Otherwise, or if
+        the data may be modified in place later (sensitivities), copies are returned.
+        """
+        self.all_inputs_casadi  # make sure the casadi inputs have been created
+        data = [
+            self._all_ts,
+            self._all_ys,
+            self._all_models,
+            self._all_inputs,
+            self._all_inputs_casadi,
+        ]
+        is_tip = all(len(entries) == self._n_sub_solutions for entries in data) and (
+            len(self._sub_solutions) == self._n_sub_solution_objects
+        )
+        if is_tip and not self._sensitivities:
+            return data + [self._sub_solutions]
+        return [list(self._own_entries(entries)) for entries in data] + [
+            list(self.sub_solutions)
+        ]
+
     def __radd__(self, other):
         """
         Right-side adding with special handling for the case None + Solution (returns
@@ -769,9 +992,10 @@ class Solution(object):
             self.t_event,
             self.y_event,
             self.termination,
+            output_variables=self.output_variables,
         )
         new_sol._all_inputs_casadi = self.all_inputs_casadi
-        new_sol._sub_solutions = self.sub_solutions
+        new_sol._set_sub_solutions(self.sub_solutions)
         new_sol.closest_event_idx = self.closest_event_idx
 
         new_sol.solve_time = self.solve_time
@@ -781,7 +1005,9 @@ class Solution(object):
         return new_sol
 
 
-def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
+def make_cycle_solution(
+    step_solutions, esoh_sim=None, save_this_cycle=True, summary_reducer=None
+):
     """
     Function to create a Solution for an entire cycle, and associated summary variables
 
@@ -789,14 +1015,22 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
     ----------
     step_solutions : list of :class:`Solution`
         Step solutions that form the entire cycle
-    esoh_sim : :class:`pybamm.Simulation`, optional
-        A simulation, whose model should be a :class:`pybamm.lithium_ion.ElectrodeSOH`
-        model, which is used to calculate some of the summary variables. If `None`
+    esoh_sim : :class:`pybamm.lithium_ion.ElectrodeSOHSolver` or \
+        :class:`pybamm.Simulation`, optional
+        A solver for the :class:`pybamm.lithium_ion.ElectrodeSOH` model (or a
+        simulation, whose model should be a :class:`pybamm.lithium_ion.ElectrodeSOH`
+        model), which is used to calculate some of the summary variables. If `None`
         (default) then only summary variables that do not require the eSOH calculation
         are calculated. See [1] for more details on eSOH variables.
     save_this_cycle : bool, optional
         Whether to save the entire cycle variables or just the summary variables.
         Default True
+    summary_reducer : :class:`pybamm.SummaryVariableReducer`, optional
+        A reducer that has already been updated with all the steps of the cycle
+        (e.g. as they were solved), which gives the summary variables that do not
+        require the eSOH calculation. If `None` (default), a reducer with the
+        default summary variables of the model is created and updated with the
+        cycle solution.
 
     Returns
     -------
@@ -826,7 +1060,7 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
         sum_sols.termination,
     )
     cycle_solution._all_inputs_casadi = sum_sols.all_inputs_casadi
-    cycle_solution._sub_solutions = sum_sols.sub_solutions
+    cycle_solution._set_sub_solutions(sum_sols.sub_solutions)
 
     cycle_solution.solve_time = sum_sols.solve_time
     cycle_solution.integration_time = sum_sols.integration_time
@@ -834,7 +1068,9 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
 
     cycle_solution.steps = step_solutions
 
-    cycle_summary_variables = get_cycle_summary_variables(cycle_solution, esoh_sim)
+    cycle_summary_variables = get_cycle_summary_variables(
+        cycle_solution, esoh_sim, summary_reducer
+    )
 
     cycle_first_state = cycle_solution.first_state
 
@@ -846,44 +1082,14 @@ def make_cycle_solution(step_solutions, esoh_sim=None, save_this_cycle=True):
     return cycle_solution, cycle_summary_variables, cycle_first_state
 
 
-def get_cycle_summary_variables(cycle_solution, esoh_sim):
+def get_cycle_summary_variables(cycle_solution, esoh_sim, summary_reducer=None):
     model = cycle_solution.all_models[0]
-    cycle_summary_variables = pybamm.FuzzyDict({})
-
-    # Measured capacity variables
-    if "Discharge capacity [A.h]" in model.variables:
-        Q = cycle_solution["Discharge capacity [A.h]"].data
-        min_Q, max_Q = np.min(Q), np.max(Q)
-
-        cycle_summary_variables.update(
-            {
-                "Minimum measured discharge capacity [A.h]": min_Q,
-                "Maximum measured discharge capacity [A.h]": max_Q,
-                "Measured capacity [A.h]": max_Q - min_Q,
-            }
-        )
 
-    # Voltage variables
-    if "Battery voltage [V]" in model.variables:
-        V = cycle_solution["Battery voltage [V]"].data
-        min_V, max_V = np.min(V), np.max(V)
-
-        cycle_summary_variables.update(
-            {"Minimum voltage [V]": min_V, "Maximum voltage [V]": max_V}
-        )
-
-    # Degradation variables
-    degradation_variables = model.summary_variables
-    first_state = cycle_solution.first_state
-    last_state = cycle_solution.last_state
-    for var in degradation_variables:
-        data_first = first_state[var].data
-        data_last = last_state[var].data
-        cycle_summary_variables[var] = data_last[0]
-        var_lowercase = var[0].lower() + var[1:]
-        cycle_summary_variables["Change in " + var_lowercase] = (
-            data_last[0] - data_first[0]
-        )
+    # Measured capacity, voltage and degradation variables
+    if summary_reducer is None:
+        summary_reducer = pybamm.SummaryVariableReducer.from_model(model)
+        summary_reducer.update(cycle_solution)
+    cycle_summary_variables = summary_reducer.result()
 
     # eSOH variables (full-cell lithium-ion model only, for now)
     if (
@@ -893,44 +1099,9 @@ def get_cycle_summary_variables(cycle_solution, esoh_sim):
     ):
         V_min = esoh_sim.parameter_values["Lower voltage cut-off [V]"]
         V_max = esoh_sim.parameter_values["Upper voltage cut-off [V]"]
-        C_n = last_state["Negative electrode capacity [A.h]"].data[0]
-        C_p = last_state["Positive electrode capacity [A.h]"].data[0]
-        n_Li = last_state["Total lithium in particles [mol]"].data[0]
-        if esoh_sim.solution is not None:
-            # initialize with previous solution if it is available
-            esoh_sim.built_model.set_initial_conditions_from(esoh_sim.solution)
-            solver = None
-        else:
-            x_100_init = np.max(cycle_solution["Negative electrode SOC"].data)
-            # make sure x_0 > 0
-            C_init = np.minimum(0.95 * (C_n * x_100_init), max_Q - min_Q)
-
-            # Solve the esoh model and add outputs to the summary variables
-            # use CasadiAlgebraicSolver if there are interpolants
-            if isinstance(
-                esoh_sim.parameter_values["Negative electrode OCP [V]"], tuple
-            ) or isinstance(
-                esoh_sim.parameter_values["Positive electrode OCP [V]"], tuple
-            ):
-                solver = pybamm.CasadiAlgebraicSolver()
-                # Choose x_100_init so as not to violate the interpolation limits
-                if isinstance(
-                    esoh_sim.parameter_values["Positive electrode OCP [V]"], tuple
-                ):
-                    y_100_min = np.min(
-                        esoh_sim.parameter_values["Positive electrode OCP [V]"][1][0][0]
-                    )
-                    x_100_max = (
-                        n_Li * pybamm.constants.F.value / 3600 - y_100_min * C_p
-                    ) / C_n
-                    x_100_init = np.minimum(x_100_init, 0.99 * x_100_max)
-            else:
-                solver = None
-            # Update initial conditions using the cycle solution
-            esoh_sim.build()
-            esoh_sim.built_model.set_initial_conditions_from(
-                {"x_100": x_100_init, "C": C_init}
-            )
+        C_n = cycle_summary_variables["Negative electrode capacity [A.h]"]
+        C_p = cycle_summary_variables["Positive electrode capacity [A.h]"]
+        n_Li = cycle_summary_variables["Total lithium in particles [mol]"]
         inputs = {
             "V_min": V_min,
             "V_max": V_max,
@@ -938,17 +1109,82 @@ def get_cycle_summary_variables(cycle_solution, esoh_sim):
             "C_p": C_p,
             "n_Li": n_Li,
         }
+        parameter_values = esoh_sim.parameter_values
 
         try:
-            esoh_sol = esoh_sim.solve([0], inputs=inputs, solver=solver)
+            if isinstance(esoh_sim, pybamm.lithium_ion.ElectrodeSOHSolver):
+                # warm-start from the previous solution if it is available
+                if esoh_sim.last_solution is None:
+                    initial_guess = _get_esoh_initial_guess(
+                        cycle_solution,
+                        cycle_summary_variables,
+                        inputs,
+                        parameter_values,
+                    )
+                else:
+                    initial_guess = None
+                esoh_variables = esoh_sim.solve(inputs, initial_guess)
+            else:
+                if esoh_sim.solution is not None:
+                    # initialize with previous solution if it is available
+                    esoh_sim.built_model.set_initial_conditions_from(
+                        esoh_sim.solution
+                    )
+                    solver = None
+                else:
+                    # Update initial conditions using the cycle solution
+                    esoh_sim.build()
+                    esoh_sim.built_model.set_initial_conditions_from(
+                        _get_esoh_initial_guess(
+                            cycle_solution,
+                            cycle_summary_variables,
+                            inputs,
+                            parameter_values,
+                        )
+                    )
+                    # use CasadiAlgebraicSolver if there are interpolants
+                    if isinstance(
+                        parameter_values["Negative electrode OCP [V]"], tuple
+                    ) or isinstance(
+                        parameter_values["Positive electrode OCP [V]"], tuple
+                    ):
+                        solver = pybamm.CasadiAlgebraicSolver()
+                    else:
+                        solver = None
+                esoh_sol = esoh_sim.solve([0], inputs=inputs, solver=solver)
+                esoh_variables = {
+                    var: esoh_sol[var].data[0] for var in esoh_sim.built_model.variables
+                }
         except pybamm.SolverError:  # pragma: no cover
             raise pybamm.SolverError(
                 "Could not solve for summary variables, run "
                 "`sim.solve(calc_esoh=False)` to skip this step"
             )
-        for var in esoh_sim.built_model.variables:
-            cycle_summary_variables[var] = esoh_sol[var].data[0]
+        cycle_summary_variables.update(esoh_variables)
 
         cycle_summary_variables["Capacity [A.h]"] = cycle_summary_variables["C"]
 
     return cycle_summary_variables
+
+
+def _get_esoh_initial_guess(
+    cycle_solution, cycle_summary_variables, inputs, parameter_values
+):
+    """
+    Initial guess of the eSOH unknowns, "x_100" and "C", from a cycle solution
+    """
+    x_100_init = np.max(cycle_solution["Negative electrode SOC"].data)
+    # make sure x_0 > 0
+    C_init = np.minimum(
+        0.95 * (inputs["C_n"] * x_100_init),
+        cycle_summary_variables["Measured capacity [A.h]"],
+    )
+    # Choose x_100_init so as not to violate the interpolation limits
+    if isinstance(parameter_values["Positive electrode OCP [V]"], tuple):
+        y_100_min = np.min(parameter_values["Positive electrode OCP [V]"][1][0][0])
+        x_100_max = (
+            inputs["n_Li"] * pybamm.constants.F.value / 3600
+            - y_100_min * inputs["C_p"]
+        ) / inputs["C_n"]
+        x_100_init = np.minimum(x_100_init, 0.99 * x_100_max)
+    return {"x_100": x_100_init, "C": C_init}
@@ -0,0 +1,369 @@
+#
+# Streaming reductions for the summary variables of a cycle
+#
+import casadi
+import numpy as np
+import pybamm
+from collections import OrderedDict
+
+
+class BaseReduction:
+    """
+    Base class for the reduction of a scalar variable to a single value over a
+    cycle. The values of the variable are passed in batches of time points (in the
+    order in which they were solved) to :meth:`update`, so that the reduction never
+    needs the values at all time points at once.
+
+    To add a new type of reduction, subclass this class and implement
+    :meth:`reset`, :meth:`update` and :meth:`result`, and optionally add it to
+    `pybamm.SummaryVariableReducer.registry`.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the values seen so far"""
+        raise NotImplementedError
+
+    def update(self, t, values):
+        """
+        Update the reduction with the values of the variable at some time points
+
+        Parameters
+        ----------
+        t : :class:`numpy.array`
+            The time points [s]
+        values : :class:`numpy.array`
+            The values of the variable at the time points
+        """
+        raise NotImplementedError
+
+    def result(self):
+        """Return the reduced value, or NaN if no values have been seen"""
+        raise NotImplementedError
+
+
+class MinimumReduction(BaseReduction):
+    """The minimum value of the variable"""
+
+    def reset(self):
+        self._value = np.nan
+
+    def update(self, t, values):
+        self._value = np.nanmin([self._value, np.min(values)])
+
+    def result(self):
+        return self._value
+
+
+class MaximumReduction(BaseReduction):
+    """The maximum value of the variable"""
+
+    def reset(self):
+        self._value = np.nan
+
+    def update(self, t, values):
+        self._value = np.nanmax([self._value, np.max(values)])
+
+    def result(self):
+        return self._value
+
+
+class RangeReduction(BaseReduction):
+    """The difference between the maximum and minimum values of the variable"""
+
+    def reset(self):
+        self._min = MinimumReduction()
+        self._max = MaximumReduction()
+
+    def update(self, t, values):
+        self._min.update(t, values)
+        self._max.update(t, values)
+
+    def result(self):
+        return self._max.result() - self._min.result()
+
+
+class FirstReduction(BaseReduction):
+    """The value of the variable at the first time point"""
+
+    def reset(self):
+        self._value = np.nan
+        self._seen = False
+
+    def update(self, t, values):
+        if not self._seen:
+            self._value = values[0]
+            self._seen = True
+
+    def result(self):
+        return self._value
+
+
+class LastReduction(BaseReduction):
+    """The value of the variable at the last time point"""
+
+    def reset(self):
+        self._value = np.nan
+
+    def update(self, t, values):
+        self._value = values[-1]
+
+    def result(self):
+        return self._value
+
+
+class ChangeReduction(BaseReduction):
+    """The change in the variable between the first and last time points"""
+
+    def reset(self):
+        self._first = FirstReduction()
+        self._last = LastReduction()
+
+    def update(self, t, values):
+        self._first.update(t, values)
+        self._last.update(t, values)
+
+    def result(self):
+        return self._last.result() - self._first.result()
+
+
+class IntegralReduction(BaseReduction):
+    """
+    The integral of the variable over time [s], using the trapezoidal rule
+    (including across the boundaries between batches of time points)
+    """
+
+    def reset(self):
+        self._value = np.nan
+        self._last_t = None
+        self._last_value = None
+
+    def update(self, t, values):
+        if self._last_t is None:
+            self._value = 0
+        else:
+            t = np.concatenate([[self._last_t], t])
+            values = np.concatenate([[self._last_value], values])
+        self._value += np.sum(np.diff(t) * (values[1:] + values[:-1]) / 2)
+        self._last_t = t[-1]
+        self._last_value = values[-1]
+
+    def result(self):
+        return self._value
+
+
+class SummaryVariableReducer:
+    """
+    Calculates the summary variables of a cycle incrementally from the raw states of
+    each step, as the steps are solved, without creating processed variables for the
+    whole cycle. The variables needed by the reductions are evaluated in a single
+    call (mapped over all the time points) per sub-solution.
+
+    Parameters
+    ----------
+    reductions : dict
+        The summary variables to calculate. Keys are the names of the summary
+        variables, and values are tuples (variable name, reduction), where the
+        reduction is a key of `SummaryVariableReducer.registry` or a subclass of
+        :class:`pybamm.BaseReduction`. The variables must be scalars.
+    max_functions : int, optional
+        The maximum number of mapped casadi functions kept for reuse. Default is 32.
+        The least recently used functions are discarded first.
+
+    Attributes
+    ----------
+    registry : dict
+        The reductions that can be referred to by name ("min", "max", "range",
+        "first", "last", "change" and "integral"). Add a subclass of
+        :class:`pybamm.BaseReduction` to this dictionary to make it available to
+        all reducers.
+    """
+
+    registry = {
+        "min": MinimumReduction,
+        "max": MaximumReduction,
+        "range": RangeReduction,
+        "first": FirstReduction,
+        "last": LastReduction,
+        "change": ChangeReduction,
+        "integral": IntegralReduction,
+    }
+
+    def __init__(self, reductions, max_functions=32):
+        self.reductions = {}
+        for name, (variable, reduction) in reductions.items():
+            if isinstance(reduction, str):
+                try:
+                    reduction = self.registry[reduction]
+                except KeyError:
+                    raise ValueError(
+                        f"Unknown reduction '{reduction}' for summary variable "
+                        f"'{name}', must be one of {list(self.registry.keys())} or "
+                        "a subclass of pybamm.BaseReduction"
+                    )
+            self.reductions[name] = (variable, reduction())
+        # Each variable is only evaluated once, even if it is used by several
+        # reductions
+        self.variables = list(
+            dict.fromkeys(variable for variable, _ in self.reductions.values())
+        )
+        self.max_functions = max_functions
+        self._mapped_casadi = OrderedDict()
+
+    @classmethod
+    def from_model(cls, model, extra_reductions=None):
+        """
+        Create a reducer for the default summary variables of a model: the minimum,
+        maximum and measured discharge capacity, the minimum and maximum voltage,
+        and the last value and change over the cycle of each of
+        `model.summary_variables`.
+
+        Parameters
+        ----------
+        model : :class:`pybamm.BaseModel`
+            The model that is solved
+        extra_reductions : dict, optional
+            Any other summary variables to calculate, see
+            :class:`pybamm.SummaryVariableReducer`
+        """
+        reductions = {}
+        if "Discharge capacity [A.h]" in model.variables:
+            reductions.update(
+                {
+                    "Minimum measured discharge capacity [A.h]": (
+                        "Discharge capacity [A.h]",
+                        "min",
+                    ),
+                    "Maximum measured discharge capacity [A.h]": (
+                        "Discharge capacity [A.h]",
+                        "max",
+                    ),
+                    "Measured capacity [A.h]": ("Discharge capacity [A.h]", "range"),
+                }
+            )
+        if "Battery voltage [V]" in model.variables:
+            reductions.update(
+                {
+                    "Minimum voltage [V]": ("Battery voltage [V]", "min"),
+                    "Maximum voltage [V]": ("Battery voltage [V]", "max"),
+                }
+            )
+        for var in getattr(model, "summary_variables", []):
+            var_lowercase = var[0].lower() + var[1:]
+            reductions[var] = (var, "last")
+            reductions["Change in " + var_lowercase] = (var, "change")
+        reductions.update(extra_reductions or {})
+        return cls(reductions)
+
+    def reset(self):
+        """Reset all the reductions, e.g. at the start of a cycle"""
+        for _, reduction in self.reductions.values():
+            reduction.reset()
+
+    def update(self, solution):
+        """
+        Update the reductions with all the time points of a solution (e.g. of the
+        step that has just been solved)
+
+        Parameters
+        ----------
+        solution : :class:`pybamm.Solution`
+            The solution
+        """
+        if len(self.variables) == 0:
+            return
+        for ts, ys, model, inputs, inputs_casadi in zip(
+            solution.all_ts,
+            solution.all_ys,
+            solution.all_models,
+            solution.all_inputs,
+            solution.all_inputs_casadi,
+        ):
+            if len(ts) == 0:
+                continue
+            if isinstance(ys, np.memmap):
+                chunk_size = pybamm.settings.memmap_chunk_size
+                chunks = (
+                    (
+                        ts[start : start + chunk_size],
+                        np.asarray(ys[:, start : start + chunk_size]),
+                    )
+                    for start in range(0, len(ts), chunk_size)
+                )
+            else:
+                chunks = [(ts, ys)]
+            for ts_chunk, ys_chunk in chunks:
+                n_t = len(ts_chunk)
+                # Round the number of time points up to a power of two, so that
+                # steps of different lengths share a few mapped functions, and pad
+                # with the last time point
+                n_mapped = 1 << (n_t - 1).bit_length()
+                mapped_casadi = self._get_mapped_casadi(
+                    solution, model, ys_chunk, inputs, n_mapped
+                )
+                if n_mapped > n_t:
+                    pad = n_mapped - n_t
+                    ts_chunk = np.concatenate([ts_chunk, np.repeat(ts_chunk[-1], pad)])
+                    ys_chunk = np.hstack(
+                        [ys_chunk, np.repeat(ys_chunk[:, -1:], pad, axis=1)]
+                    )
+                # one row per variable, one column per time point
+                values = mapped_casadi(ts_chunk, ys_chunk, inputs_casadi).full()
+                values = values[:, :n_t]
+                ts_chunk = ts_chunk[:n_t]
+                t_seconds = ts_chunk * solution.timescale_eval
+                values = dict(zip(self.variables, values))
+                for variable, reduction in self.reductions.values():
+                    reduction.update(t_seconds, values[variable])
+
+    def result(self):
+        """
+        Return the summary variables
+
+        Returns
+        -------
+        :class:`pybamm.FuzzyDict`
+            The values of the summary variables
+        """
+        return pybamm.FuzzyDict(
+            {
+                name: reduction.result()
+                for name, (_, reduction) in self.reductions.items()
+            }
+        )
+
+    def _get_mapped_casadi(self, solution, model, ys, inputs, n_t):
+        """
+        Return a casadi function that evaluates all the variables (first entry only)
+        at `n_t` time points of a model, with one row per variable. The most
+        recently used functions are cached, so that steps of the same model and
+        (rounded) length reuse them.
+        """
+        # Key on the model itself rather than its id, which could be reused by a
+        # new model once the old one has been deleted
+        key = (model, solution.output_variables is None, n_t)
+        try:
+            self._mapped_casadi.move_to_end(key)
+            return self._mapped_casadi[key]
+        except KeyError:
+            pass
+        vars_casadi = [
+            solution._get_variable_casadi(variable, model, ys, inputs)
+            for variable in self.variables
+        ]
+        t_MX = casadi.MX.sym("t")
+        y_MX = casadi.MX.sym("y", ys.shape[0])
+        p_MX = casadi.MX.sym("p", *vars_casadi[0].size_in(2))
+        summary_casadi = casadi.Function(
+            "summary",
+            [t_MX, y_MX, p_MX],
+            [casadi.vertcat(*[var(t_MX, y_MX, p_MX)[0] for var in vars_casadi])],
+        )
+        if n_t > 1:
+            summary_casadi = summary_casadi.map(n_t)
+        self._mapped_casadi[key] = summary_casadi
+        while len(self._mapped_casadi) > self.max_functions:
+            self._mapped_casadi.popitem(last=False)
+        return summary_casadi
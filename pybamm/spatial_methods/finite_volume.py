@@ -2,6 +2,7 @@
 # Finite Volume discretisation class
 #
 import pybamm
+from pybamm.spatial_methods.spatial_method import cached_matrix
 
 from scipy.sparse import (
     diags,
@@ -121,6 +122,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_matrix
     def gradient_matrix(self, domain, domains):
         """
         Gradient matrix for finite volumes in the appropriate domain.
@@ -179,6 +181,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_matrix
     def divergence_matrix(self, domains):
         """
         Divergence matrix for finite volumes in the appropriate domain.
@@ -241,6 +244,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_matrix
     def definite_integral_matrix(
         self, child, vector_type="row", integration_dimension="primary"
     ):
@@ -367,6 +371,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return out
 
+    @cached_matrix
     def indefinite_integral_matrix_edges(self, domains, direction):
         """
         Matrix for finite-volume implementation of the indefinite integral where the
@@ -467,6 +472,7 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         return pybamm.Matrix(matrix)
 
+    @cached_matrix
     def indefinite_integral_matrix_nodes(self, domains, direction):
         """
         Matrix for finite-volume implementation of the (backward) indefinite integral
@@ -1202,40 +1208,8 @@ class FiniteVolume(pybamm.SpatialMethod):
 
         def arithmetic_mean(array):
             """Calculate the arithmetic mean of an array using matrix multiplication"""
-            # Create appropriate submesh by combining submeshes in domain
-            submesh = self.mesh.combine_submeshes(*array.domain)
-
-            # Create 1D matrix using submesh
-            n = submesh.npts
-
-            if shift_key == "node to edge":
-                sub_matrix_left = csr_matrix(
-                    ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
-                )
-                sub_matrix_center = diags([0.5, 0.5], [0, 1], shape=(n - 1, n))
-                sub_matrix_right = csr_matrix(
-                    ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
-                )
-                sub_matrix = vstack(
-                    [sub_matrix_left, sub_matrix_center, sub_matrix_right]
-                )
-            elif shift_key == "edge to node":
-                sub_matrix = diags([0.5, 0.5], [0, 1], shape=(n, n + 1))
-            else:
-                raise ValueError("shift key '{}' not recognised".format(shift_key))
-            # Second dimension length
-            second_dim_repeats = self._get_auxiliary_domain_repeats(
-                discretised_symbol.domains
-            )
-
-            # Generate full matrix from the submatrix
-            # Convert to csr_matrix so that we can take the index (row-slicing), which
-            # is not supported by the default kron format
-            # Note that this makes column-slicing inefficient, but this should not be an
-            # issue
-            matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
-            return pybamm.Matrix(matrix) @ array
+            matrix = self.arithmetic_mean_matrix(array.domains, shift_key)
+            return matrix @ array
 
         def harmonic_mean(array):
             """
@@ -1260,113 +1234,20 @@ class FiniteVolume(pybamm.SpatialMethod):
             [2] Recktenwald, Gerald. "The control-volume finite-difference
             approximation to the diffusion equation." (2012).
             """
-            # Create appropriate submesh by combining submeshes in domain
-            submesh = self.mesh.combine_submeshes(*array.domain)
-
-            # Get second dimension length for use later
-            second_dim_repeats = self._get_auxiliary_domain_repeats(
-                discretised_symbol.domains
-            )
+            matrices = self.harmonic_mean_matrices(array.domains, shift_key)
+            D1 = matrices["D1"] @ array
+            D2 = matrices["D2"] @ array
+            beta = matrices["beta"]
 
-            # Create 1D matrix using submesh
-            n = submesh.npts
+            # Compute harmonic mean on internal edges (node to edge) or on nodes
+            # (edge to node)
+            # Note: add small number to denominator to regularise D_eff
+            D_eff = D1 * D2 / (D2 * beta + D1 * (1 - beta) + 1e-16)
 
             if shift_key == "node to edge":
-                # Matrix to compute values at the exterior edges
-                edges_sub_matrix_left = csr_matrix(
-                    ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
-                )
-                edges_sub_matrix_center = csr_matrix((n - 1, n))
-                edges_sub_matrix_right = csr_matrix(
-                    ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
-                )
-                edges_sub_matrix = vstack(
-                    [
-                        edges_sub_matrix_left,
-                        edges_sub_matrix_center,
-                        edges_sub_matrix_right,
-                    ]
-                )
-
-                # Generate full matrix from the submatrix
-                # Convert to csr_matrix so that we can take the index (row-slicing),
-                # which is not supported by the default kron format
-                # Note that this makes column-slicing inefficient, but this should
-                # not be an issue
-                edges_matrix = csr_matrix(
-                    kron(eye(second_dim_repeats), edges_sub_matrix)
-                )
-
-                # Matrix to extract the node values running from the first node
-                # to the penultimate node in the primary dimension (D_1 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D1 = hstack([eye(n - 1), csr_matrix((n - 1, 1))])
-                matrix_D1 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D1))
-                D1 = pybamm.Matrix(matrix_D1) @ array
-
-                # Matrix to extract the node values running from the second node
-                # to the final node in the primary dimension  (D_2 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D2 = hstack([csr_matrix((n - 1, 1)), eye(n - 1)])
-                matrix_D2 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D2))
-                D2 = pybamm.Matrix(matrix_D2) @ array
-
-                # Compute weight beta
-                dx = submesh.d_edges
-                sub_beta = (dx[:-1] / (dx[1:] + dx[:-1]))[:, np.newaxis]
-                beta = pybamm.Array(np.kron(np.ones((second_dim_repeats, 1)), sub_beta))
-
-                # Compute harmonic mean on internal edges
-                # Note: add small number to denominator to regularise D_eff
-                D_eff = D1 * D2 / (D2 * beta + D1 * (1 - beta) + 1e-16)
-
-                # Matrix to pad zeros at the beginning and end of the array where
-                # the exterior edge values will be added
-                sub_matrix = vstack(
-                    [csr_matrix((1, n - 1)), eye(n - 1), csr_matrix((1, n - 1))]
-                )
-
-                # Generate full matrix from the submatrix
-                # Convert to csr_matrix so that we can take the index (row-slicing),
-                # which is not supported by the default kron format
-                # Note that this makes column-slicing inefficient, but this should
-                # not be an issue
-                matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
-
-                return (
-                    pybamm.Matrix(edges_matrix) @ array + pybamm.Matrix(matrix) @ D_eff
-                )
-
-            elif shift_key == "edge to node":
-                # Matrix to extract the edge values running from the first edge
-                # to the penultimate edge in the primary dimension (D_1 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D1 = hstack([eye(n), csr_matrix((n, 1))])
-                matrix_D1 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D1))
-                D1 = pybamm.Matrix(matrix_D1) @ array
-
-                # Matrix to extract the edge values running from the second edge
-                # to the final edge in the primary dimension  (D_2 in the
-                # definiton of the harmonic mean)
-                sub_matrix_D2 = hstack([csr_matrix((n, 1)), eye(n)])
-                matrix_D2 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D2))
-                D2 = pybamm.Matrix(matrix_D2) @ array
-
-                # Compute weight beta
-                dx0 = submesh.nodes[0] - submesh.edges[0]  # first edge to node
-                dxN = submesh.edges[-1] - submesh.nodes[-1]  # last node to edge
-                dx = np.concatenate(([dx0], submesh.d_nodes, [dxN]))
-                sub_beta = (dx[:-1] / (dx[1:] + dx[:-1]))[:, np.newaxis]
-                beta = pybamm.Array(np.kron(np.ones((second_dim_repeats, 1)), sub_beta))
-
-                # Compute harmonic mean on nodes
-                # Note: add small number to denominator to regularise D_eff
-                D_eff = D1 * D2 / (D2 * beta + D1 * (1 - beta) + 1e-16)
-
-                return D_eff
-
+                return matrices["edges"] @ array + matrices["internal edges"] @ D_eff
             else:
-                raise ValueError("shift key '{}' not recognised".format(shift_key))
+                return D_eff
 
         # If discretised_symbol evaluates to number there is no need to average
         if discretised_symbol.size == 1:
@@ -1379,6 +1260,178 @@ class FiniteVolume(pybamm.SpatialMethod):
             raise ValueError("method '{}' not recognised".format(method))
         return out
 
+    @cached_matrix
+    def arithmetic_mean_matrix(self, domains, shift_key):
+        """
+        Matrix for the arithmetic mean of a discretised symbol, to shift it from
+        nodes to edges or from edges to nodes. See :meth:`pybamm.FiniteVolume.shift`
+
+        Parameters
+        ----------
+        domains : dict
+            The domains of the symbol being averaged
+        shift_key : str
+            Whether to shift from nodes to edges ("node to edge"), or from edges to
+            nodes ("edge to node")
+
+        Returns
+        -------
+        :class:`pybamm.Matrix`
+            The arithmetic mean matrix
+        """
+        # Create appropriate submesh by combining submeshes in domain
+        submesh = self.mesh.combine_submeshes(*domains["primary"])
+
+        # Create 1D matrix using submesh
+        n = submesh.npts
+
+        if shift_key == "node to edge":
+            sub_matrix_left = csr_matrix(([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n))
+            sub_matrix_center = diags([0.5, 0.5], [0, 1], shape=(n - 1, n))
+            sub_matrix_right = csr_matrix(
+                ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
+            )
+            sub_matrix = vstack([sub_matrix_left, sub_matrix_center, sub_matrix_right])
+        elif shift_key == "edge to node":
+            sub_matrix = diags([0.5, 0.5], [0, 1], shape=(n, n + 1))
+        else:
+            raise ValueError("shift key '{}' not recognised".format(shift_key))
+        # Second dimension length
+        second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
+
+        # Generate full matrix from the submatrix
+        # Convert to csr_matrix so that we can take the index (row-slicing), which
+        # is not supported by the default kron format
+        # Note that this makes column-slicing inefficient, but this should not be an
+        # issue
+        matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
+
+        return pybamm.Matrix(matrix)
+
+    @cached_matrix
+    def harmonic_mean_matrices(self, domains, shift_key):
+        """
+        Matrices and weights for the harmonic mean of a discretised symbol, to shift
+        it from nodes to edges or from edges to nodes.
+        See :meth:`pybamm.FiniteVolume.shift`
+
+        Parameters
+        ----------
+        domains : dict
+            The domains of the symbol being averaged
+        shift_key : str
+            Whether to shift from nodes to edges ("node to edge"), or from edges to
+            nodes ("edge to node")
+
+        Returns
+        -------
+        dict
+            The matrices that extract the values either side of each edge/node ("D1"
+            and "D2"), and the weights of the harmonic mean ("beta"). For
+            "node to edge", also the matrix that computes the values at the exterior
+            edges ("edges") and the matrix that pads the values at the internal edges
+            with zeros ("internal edges").
+        """
+        # Create appropriate submesh by combining submeshes in domain
+        submesh = self.mesh.combine_submeshes(*domains["primary"])
+
+        # Get second dimension length for use later
+        second_dim_repeats = self._get_auxiliary_domain_repeats(domains)
+
+        # Create 1D matrix using submesh
+        n = submesh.npts
+
+        if shift_key == "node to edge":
+            # Matrix to compute values at the exterior edges
+            edges_sub_matrix_left = csr_matrix(
+                ([1.5, -0.5], ([0, 0], [0, 1])), shape=(1, n)
+            )
+            edges_sub_matrix_center = csr_matrix((n - 1, n))
+            edges_sub_matrix_right = csr_matrix(
+                ([-0.5, 1.5], ([0, 0], [n - 2, n - 1])), shape=(1, n)
+            )
+            edges_sub_matrix = vstack(
+                [
+                    edges_sub_matrix_left,
+                    edges_sub_matrix_center,
+                    edges_sub_matrix_right,
+                ]
+            )
+
+            # Generate full matrix from the submatrix
+            # Convert to csr_matrix so that we can take the index (row-slicing),
+            # which is not supported by the default kron format
+            # Note that this makes column-slicing inefficient, but this should
+            # not be an issue
+            edges_matrix = csr_matrix(kron(eye(second_dim_repeats), edges_sub_matrix))
+
+            # Matrix to extract the node values running from the first node
+            # to the penultimate node in the primary dimension (D_1 in the
+            # definiton of the harmonic mean)
+            sub_matrix_D1 = hstack([eye(n - 1), csr_matrix((n - 1, 1))])
+            matrix_D1 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D1))
+
+            # Matrix to extract the node values running from the second node
+            # to the final node in the primary dimension  (D_2 in the
+            # definiton of the harmonic mean)
+            sub_matrix_D2 = hstack([csr_matrix((n - 1, 1)), eye(n - 1)])
+            matrix_D2 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D2))
+
+            # Compute weight beta
+            dx = submesh.d_edges
+            sub_beta = (dx[:-1] / (dx[1:] + dx[:-1]))[:, np.newaxis]
+            beta = pybamm.Array(np.kron(np.ones((second_dim_repeats, 1)), sub_beta))
+
+            # Matrix to pad zeros at the beginning and end of the array where
+            # the exterior edge values will be added
+            sub_matrix = vstack(
+                [csr_matrix((1, n - 1)), eye(n - 1), csr_matrix((1, n - 1))]
+            )
+
+            # Generate full matrix from the submatrix
+            # Convert to csr_matrix so that we can take the index (row-slicing),
+            # which is not supported by the default kron format
+            # Note that this makes column-slicing inefficient, but this should
+            # not be an issue
+            matrix = csr_matrix(kron(eye(second_dim_repeats), sub_matrix))
+
+            return {
+                "D1": pybamm.Matrix(matrix_D1),
+                "D2": pybamm.Matrix(matrix_D2),
+                "beta": beta,
+                "edges": pybamm.Matrix(edges_matrix),
+                "internal edges": pybamm.Matrix(matrix),
+            }
+
+        elif shift_key == "edge to node":
+            # Matrix to extract the edge values running from the first edge
+            # to the penultimate edge in the primary dimension (D_1 in the
+            # definiton of the harmonic mean)
+            sub_matrix_D1 = hstack([eye(n), csr_matrix((n, 1))])
+            matrix_D1 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D1))
+
+            # Matrix to extract the edge values running from the second edge
+            # to the final edge in the primary dimension  (D_2 in the
+            # definiton of the harmonic mean)
+            sub_matrix_D2 = hstack([csr_matrix((n, 1)), eye(n)])
+            matrix_D2 = csr_matrix(kron(eye(second_dim_repeats), sub_matrix_D2))
+
+            # Compute weight beta
+            dx0 = submesh.nodes[0] - submesh.edges[0]  # first edge to node
+            dxN = submesh.edges[-1] - submesh.nodes[-1]  # last node to edge
+            dx = np.concatenate(([dx0], submesh.d_nodes, [dxN]))
+            sub_beta = (dx[:-1] / (dx[1:] + dx[:-1]))[:, np.newaxis]
+            beta = pybamm.Array(np.kron(np.ones((second_dim_repeats, 1)), sub_beta))
+
+            return {
+                "D1": pybamm.Matrix(matrix_D1),
+                "D2": pybamm.Matrix(matrix_D2),
+                "beta": beta,
+            }
+
+        else:
+            raise ValueError("shift key '{}' not recognised".format(shift_key))
+
     def upwind_or_downwind(self, symbol, discretised_symbol, bcs, direction):
         """
         Implement an upwinding operator. Currently, this requires the symbol to have
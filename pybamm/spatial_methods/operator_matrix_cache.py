@@ -0,0 +1,111 @@
+#
+# Cache of discretisation operator matrices
+#
+from collections import OrderedDict
+
+
+class OperatorMatrixCache:
+    """
+    A least-recently-used cache of the matrices created by spatial methods to
+    discretise operators (gradient, divergence, integrals, averages, ...). Entries
+    are keyed on the spatial method (class and options), a fingerprint of the mesh
+    (see :attr:`pybamm.Mesh.fingerprint`), the operator and its domains, so that
+    matrices are shared between all the spatial methods and discretisations that use
+    the same mesh, e.g. the models for each operating condition of an experiment or
+    the simulations of a :class:`pybamm.BatchStudy`.
+
+    Spatial methods store their matrices in the shared cache
+    `pybamm.operator_matrix_cache`.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of matrices. Default is 1000. If None, the number of
+        matrices is not limited. If 0, no matrices are stored.
+
+    Attributes
+    ----------
+    hits : int
+        The number of times a matrix has been found in the cache
+    misses : int
+        The number of times a matrix has not been found in the cache
+    evictions : int
+        The number of matrices removed to keep the cache within its limits
+
+    Notes
+    -----
+    Cached matrices are shared between expression trees, so they must not be
+    modified in place.
+    """
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def stats(self):
+        """Dictionary of the cache statistics"""
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def get(self, key):
+        """
+        Return the matrix stored with `key`, or None if there is none.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the matrix
+
+        Returns
+        -------
+        :class:`pybamm.Matrix` or None
+            The matrix (or the other objects stored by the spatial method, e.g. a
+            dictionary of matrices)
+        """
+        try:
+            matrix = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return matrix
+
+    def put(self, key, matrix):
+        """
+        Store a matrix, then remove the least recently used matrices until the cache
+        is within its limits.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the matrix
+        matrix : :class:`pybamm.Matrix`
+            The matrix
+        """
+        self._entries[key] = matrix
+        self._entries.move_to_end(key)
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all the matrices."""
+        self._entries.clear()
+
+
+operator_matrix_cache = OperatorMatrixCache()
@@ -1,11 +1,60 @@
 #
 # A general spatial method class
 #
+import functools
+import hashlib
+
 import pybamm
+from pybamm.build_cache import _update_fingerprint
 import numpy as np
 from scipy.sparse import eye, kron, coo_matrix, csr_matrix, vstack
 
 
+def _matrix_cache_key(value):
+    """Hashable key for the arguments of a method decorated with `cached_matrix`"""
+    if isinstance(value, dict):
+        return tuple((k, _matrix_cache_key(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_matrix_cache_key(v) for v in value)
+    if isinstance(value, pybamm.Symbol):
+        # Discretisation matrices only depend on the domains of the symbol and on
+        # whether it is evaluated on the edges of the mesh
+        return (
+            "symbol",
+            _matrix_cache_key(value.domains),
+            value.evaluates_on_edges("primary"),
+        )
+    return value
+
+
+def cached_matrix(method):
+    """
+    Decorator for the methods of a spatial method that create a discretisation matrix
+    (e.g. a gradient matrix) from domains and options. Matrices are stored in the
+    shared :class:`pybamm.OperatorMatrixCache`, keyed on the spatial method, the
+    mesh, the method and its arguments, so that the same matrix is only created once
+    per mesh, and the same :class:`pybamm.Matrix` is shared by all the symbols (and
+    discretisations) that use it.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (
+            self._operator_cache_key,
+            method.__name__,
+            _matrix_cache_key(args),
+            _matrix_cache_key(dict(sorted(kwargs.items()))),
+        )
+        cache = pybamm.operator_matrix_cache
+        matrix = cache.get(key)
+        if matrix is None:
+            matrix = method(self, *args, **kwargs)
+            cache.put(key, matrix)
+        return matrix
+
+    return wrapper
+
+
 class SpatialMethod:
     """
     A general spatial methods class, with default (trivial) behaviour for some spatial
@@ -33,12 +82,14 @@ class SpatialMethod:
                     self.options[opt] = val
 
         self._mesh = None
+        self._operator_cache_key_value = None
 
     def build(self, mesh):
         # add npts_for_broadcast to mesh domains for this particular discretisation
         for dom in mesh.keys():
             mesh[dom].npts_for_broadcast_to_nodes = mesh[dom].npts
         self._mesh = mesh
+        self._operator_cache_key_value = None
 
     def _get_auxiliary_domain_repeats(self, domains):
         """
@@ -54,6 +105,18 @@ class SpatialMethod:
     def mesh(self):
         return self._mesh
 
+    @property
+    def _operator_cache_key(self):
+        """
+        Key of the spatial method (class and public attributes, e.g. options) and of
+        its mesh in the :class:`pybamm.OperatorMatrixCache`, computed once per build
+        """
+        if self._operator_cache_key_value is None:
+            hasher = hashlib.sha256()
+            _update_fingerprint(hasher, self)
+            self._operator_cache_key_value = (hasher.hexdigest(), self.mesh.fingerprint)
+        return self._operator_cache_key_value
+
     def spatial_variable(self, symbol):
         """
         Convert a :class:`pybamm.SpatialVariable` node to a linear algebra object that
@@ -3,6 +3,8 @@ Tests for the batch_study.py
 """
 import os
 import pybamm
+import numpy as np
+import time
 import unittest
 
 spm = pybamm.lithium_ion.SPM()
@@ -31,6 +33,14 @@ bs_true = pybamm.BatchStudy(
 )
 
 
+class HangingSolver(pybamm.ScipySolver):
+    """A solver that never finishes, to test time limits"""
+
+    def _integrate(self, model, t_eval, inputs_dict=None):
+        while True:
+            time.sleep(1)
+
+
 class TestBatchStudy(unittest.TestCase):
     def test_solve(self):
         # Tests for exceptions
@@ -92,6 +102,79 @@ class TestBatchStudy(unittest.TestCase):
             ]
             self.assertIn(output_experiment, experiments_list)
 
+    def test_solve_in_parallel(self):
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm, "SPM uniform": spm_uniform},
+            solvers={"casadi safe": casadi_safe, "casadi fast": casadi_fast},
+            experiments={"exp1": exp1, "exp2": exp2},
+            permutations=True,
+            processes=2,
+            chunksize=2,
+        )
+        bs.solve()
+        self.assertEqual(len(bs.sims), 8)
+        self.assertEqual(bs.failures, {})
+        self.assertEqual(bs.timings["number of simulations"], 8)
+        self.assertEqual(bs.timings["number of failures"], 0)
+        self.assertGreater(bs.timings["max simulation time"], 0)
+
+        # Same solutions as solving in series
+        bs_series = pybamm.BatchStudy(
+            models={"SPM": spm, "SPM uniform": spm_uniform},
+            solvers={"casadi safe": casadi_safe, "casadi fast": casadi_fast},
+            experiments={"exp1": exp1, "exp2": exp2},
+            permutations=True,
+        )
+        bs_series.solve()
+        for sim, sim_series in zip(bs.sims, bs_series.sims):
+            self.assertEqual(sim.model.name, sim_series.model.name)
+            np.testing.assert_array_almost_equal(
+                sim.solution["Terminal voltage [V]"].entries,
+                sim_series.solution["Terminal voltage [V]"].entries,
+            )
+
+        # Solvers that have already been set up are copied for each simulation
+        sim = pybamm.Simulation(spm, solver=casadi_safe)
+        sim.solve([0, 3600])
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm}, solvers={"casadi safe": casadi_safe}, processes=1
+        )
+        bs.solve(t_eval=[0, 3600])
+        self.assertEqual(bs.failures, {})
+        self.assertEqual(len(bs.sims), 1)
+
+        # Failures are isolated and results are streamed
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm, "SPM uniform": spm_uniform},
+            parameter_values={
+                "good": spm.default_parameter_values,
+                "bad": pybamm.ParameterValues({"Nominal cell capacity [A.h]": 1}),
+            },
+            processes=2,
+        )
+        results = sorted(bs.solve_iter(t_eval=[0, 3600]), key=lambda x: x[0])
+        self.assertIsNone(results[0][2])
+        self.assertIsInstance(results[0][1], pybamm.Simulation)
+        self.assertIsNone(results[1][1])
+        self.assertIsInstance(results[1][2], KeyError)
+        self.assertEqual(list(bs.failures), [1])
+        self.assertIn("Traceback", bs.failures[1].formatted_traceback)
+        self.assertEqual(bs.timings["number of failures"], 1)
+
+    def test_timeout(self):
+        # The hanging solve is stopped, and the other simulation is unaffected
+        bs = pybamm.BatchStudy(
+            models={"SPM": spm},
+            solvers={"hanging": HangingSolver(), "casadi": pybamm.CasadiSolver()},
+            permutations=True,
+            processes=2,
+            timeout=5,
+        )
+        bs.solve(t_eval=[0, 3600])
+        self.assertEqual(len(bs.sims), 1)
+        self.assertEqual(list(bs.failures), [0])
+        self.assertIsInstance(bs.failures[0], TimeoutError)
+
     def test_create_gif(self):
         bs = pybamm.BatchStudy({"spm": pybamm.lithium_ion.SPM()})
         bs.solve([0, 10])
@@ -0,0 +1,201 @@
+#
+# Tests for the BuildCache class
+#
+import pybamm
+import unittest
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def get_built_model(convert_to_format="casadi"):
+    model = pybamm.BaseModel()
+    model.convert_to_format = convert_to_format
+    var = pybamm.Variable("var")
+    model.rhs = {var: -var}
+    model.initial_conditions = {var: 1}
+    model.variables = {"var": var}
+    pybamm.Discretisation().process_model(model)
+    return model
+
+
+SCALE = 2
+
+
+def scaled(x):
+    return SCALE * x
+
+
+def factorial(n):
+    return 1 if n <= 1 else n * factorial(n - 1)
+
+
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = pybamm.BuildCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key(self):
+        model = pybamm.lithium_ion.SPM()
+        parameter_values = pybamm.ParameterValues("Marquis2019")
+        var_pts = model.default_var_pts
+        key = self.cache.key(model, parameter_values, var_pts)
+        self.assertEqual(len(key), 64)
+
+        # same key for equal objects
+        self.assertEqual(
+            key,
+            self.cache.key(
+                pybamm.lithium_ion.SPM(),
+                pybamm.ParameterValues("Marquis2019"),
+                model.default_var_pts,
+            ),
+        )
+        # dictionary order doesn't matter
+        self.assertEqual(
+            key,
+            self.cache.key(model, parameter_values, dict(reversed(var_pts.items()))),
+        )
+
+        # different model options, parameters or mesh
+        self.assertNotEqual(
+            key,
+            self.cache.key(
+                pybamm.lithium_ion.SPM({"thermal": "lumped"}), parameter_values, var_pts
+            ),
+        )
+        new_parameter_values = parameter_values.copy()
+        new_parameter_values["Electrode height [m]"] = 0.2
+        self.assertNotEqual(key, self.cache.key(model, new_parameter_values, var_pts))
+        self.assertNotEqual(
+            key, self.cache.key(model, parameter_values, {**var_pts, "x_n": 11})
+        )
+
+        # models are identified by their equations, not only by their name
+        custom_model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        custom_model.rhs = {var: -var}
+        custom_model.initial_conditions = {var: 1}
+        key_custom = self.cache.key(custom_model)
+        custom_model.rhs = {var: -2 * var}
+        self.assertNotEqual(key_custom, self.cache.key(custom_model))
+        custom_model.rhs = {var: -var}
+        self.assertEqual(key_custom, self.cache.key(custom_model))
+        custom_model.initial_conditions = {var: 2}
+        self.assertNotEqual(key_custom, self.cache.key(custom_model))
+
+        # functions are identified by their source code
+        def f(x):
+            return x
+
+        def g(x):
+            return 2 * x
+
+        g.__qualname__ = f.__qualname__
+        self.assertNotEqual(self.cache.key(f), self.cache.key(g))
+
+        # ... and by the values of their default arguments, closures and globals
+        def make_function(scale):
+            def h(x, power=1):
+                return scale * x**power
+
+            return h
+
+        self.assertEqual(
+            self.cache.key(make_function(2)), self.cache.key(make_function(2))
+        )
+        self.assertNotEqual(
+            self.cache.key(make_function(2)), self.cache.key(make_function(3))
+        )
+        h = make_function(2)
+        key_h = self.cache.key(h)
+        h.__defaults__ = (2,)
+        self.assertNotEqual(key_h, self.cache.key(h))
+
+        global SCALE
+        key_scaled = self.cache.key(scaled)
+        SCALE = 3
+        try:
+            self.assertNotEqual(key_scaled, self.cache.key(scaled))
+        finally:
+            SCALE = 2
+        self.assertEqual(key_scaled, self.cache.key(scaled))
+        # recursive functions
+        self.assertEqual(len(self.cache.key(factorial)), 64)
+
+        # symbols and arrays
+        self.assertNotEqual(
+            self.cache.key(pybamm.Array(np.array([1, 2]))),
+            self.cache.key(pybamm.Array(np.array([1, 3]))),
+        )
+        self.assertEqual(
+            self.cache.key(pybamm.Scalar(1) + pybamm.Parameter("a")),
+            self.cache.key(pybamm.Scalar(1) + pybamm.Parameter("a")),
+        )
+
+    def test_save_load(self):
+        model = get_built_model()
+        self.assertIsNone(self.cache.load("a"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+        self.cache.save("a", model)
+        entry = self.cache.load("a")
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(entry["model"].name, model.name)
+        self.assertIsNone(entry["set up"])
+        self.assertGreater(self.cache.size, 0)
+
+        self.cache.save("a", model, set_up="set up key")
+        self.assertEqual(self.cache.load("a")["set up"], "set up key")
+
+        # models that can't be pickled are not saved
+        self.cache.save("b", get_built_model("python"))
+        self.assertIsNone(self.cache.load("b"))
+
+        # unreadable entries are removed
+        with open(os.path.join(self.directory.name, "c.pkl"), "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(self.cache.load("c"))
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "c.pkl")))
+
+        self.cache.clear()
+        self.assertEqual(self.cache.size, 0)
+
+    def test_evict(self):
+        model = get_built_model()
+        for key in ["a", "b", "c"]:
+            self.cache.save(key, model)
+        path = os.path.join(self.directory.name, "{}.pkl")
+        # make "a" the least recently used, then "c"
+        now = time.time()
+        os.utime(path.format("a"), (now - 100, now - 100))
+        os.utime(path.format("c"), (now - 50, now - 50))
+        entry_size = os.path.getsize(path.format("b"))
+
+        # by size
+        cache = pybamm.BuildCache(self.directory.name, max_size=2.5 * entry_size)
+        cache.evict()
+        self.assertFalse(os.path.exists(path.format("a")))
+        self.assertTrue(os.path.exists(path.format("b")))
+        self.assertTrue(os.path.exists(path.format("c")))
+
+        # by age
+        cache = pybamm.BuildCache(self.directory.name, max_age=10)
+        cache.evict()
+        self.assertTrue(os.path.exists(path.format("b")))
+        self.assertFalse(os.path.exists(path.format("c")))
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
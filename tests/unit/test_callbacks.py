@@ -3,7 +3,11 @@
 #
 import pybamm
 import unittest
+import importlib
 import os
+import tempfile
+import numpy as np
+import pandas as pd
 from pybamm import callbacks
 
 
@@ -108,6 +112,104 @@ class TestCallbacks(unittest.TestCase):
         with open("test_callback.log") as f:
             self.assertEqual(f.read(), "")
 
+    def test_solution_writer_errors(self):
+        with self.assertRaisesRegex(ValueError, "Could not infer format"):
+            pybamm.callbacks.SolutionWriter("out.txt")
+        with self.assertRaisesRegex(ValueError, "format 'txt' not recognised"):
+            pybamm.callbacks.SolutionWriter("out.txt", to_format="txt")
+        with self.assertRaisesRegex(ValueError, "States can't be written to csv"):
+            pybamm.callbacks.SolutionWriter("out.csv")
+        if importlib.util.find_spec("h5py") is None:
+            with self.assertRaisesRegex(ModuleNotFoundError, "h5py is required"):
+                pybamm.callbacks.SolutionWriter("out.h5")
+
+    def solve_with_writer(self, filename, **kwargs):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C until 3.3V", "Charge at 1C until 4.1 V")] * 3
+        )
+        sim = pybamm.Simulation(pybamm.lithium_ion.SPM(), experiment=experiment)
+        writer = pybamm.callbacks.SolutionWriter(
+            filename, variables=["Terminal voltage [V]"], **kwargs
+        )
+        solution = sim.solve(callbacks=writer)
+        # each step is written in full, including its first time (which is dropped
+        # when the steps are combined in the solution)
+        steps = [step for cycle in solution.cycles for step in cycle.steps]
+        return solution, steps
+
+    def test_solution_writer_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "solution.csv")
+            solution, steps = self.solve_with_writer(filename, save_states=False)
+            data = pd.read_csv(filename)
+            np.testing.assert_array_equal(data["Cycle"].unique(), [1, 2, 3])
+            np.testing.assert_array_equal(data["Step"].unique(), [1, 2])
+            np.testing.assert_array_almost_equal(
+                data["Terminal voltage [V]"],
+                np.concatenate(
+                    [step["Terminal voltage [V]"].entries for step in steps]
+                ),
+            )
+            summary = pd.read_csv(os.path.join(directory, "solution_summary.csv"))
+            np.testing.assert_array_equal(summary["Cycle number"], [1, 2, 3])
+            np.testing.assert_array_almost_equal(
+                summary["Capacity [A.h]"], solution.summary_variables["Capacity [A.h]"]
+            )
+
+            # only 0D variables can be written
+            writer = pybamm.callbacks.SolutionWriter(
+                filename, variables=["Electrolyte concentration"], save_states=False
+            )
+            writer.on_experiment_start({})
+            logs = {"step solution": solution, "cycle number": (1, 1)}
+            logs["step number"] = (1, 1)
+            with self.assertRaisesRegex(ValueError, "only 0D variables"):
+                writer.on_step_end(logs)
+            writer.close()
+
+    @unittest.skipIf(importlib.util.find_spec("h5py") is None, "h5py is not installed")
+    def test_solution_writer_hdf5(self):
+        import h5py
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "solution.h5")
+            solution, steps = self.solve_with_writer(filename)
+            with h5py.File(filename, "r") as f:
+                step = f["cycle 3/step 2"]
+                step_solution = steps[-1]
+                np.testing.assert_array_equal(step["t"], step_solution.t)
+                np.testing.assert_array_equal(step["y"], step_solution.y)
+                np.testing.assert_array_almost_equal(
+                    step["Terminal voltage [V]"],
+                    step_solution["Terminal voltage [V]"].entries,
+                )
+                np.testing.assert_array_almost_equal(
+                    f["summary variables/Capacity [A.h]"],
+                    solution.summary_variables["Capacity [A.h]"],
+                )
+
+    @unittest.skipIf(
+        importlib.util.find_spec("pyarrow") is None, "pyarrow is not installed"
+    )
+    def test_solution_writer_parquet(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "solution.parquet")
+            solution, steps = self.solve_with_writer(filename)
+            data = pd.read_parquet(filename)
+            np.testing.assert_array_almost_equal(
+                data["Terminal voltage [V]"],
+                np.concatenate(
+                    [step["Terminal voltage [V]"].entries for step in steps]
+                ),
+            )
+            np.testing.assert_array_equal(
+                np.stack(data["y"]).T, np.hstack([step.y for step in steps])
+            )
+            summary = pd.read_parquet(
+                os.path.join(directory, "solution_summary.parquet")
+            )
+            np.testing.assert_array_equal(summary["Cycle number"], [1, 2, 3])
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
@@ -329,6 +329,191 @@ class TestSimulationExperiment(unittest.TestCase):
         # Summary variables are not None
         self.assertIsNotNone(sol.summary_variables["Capacity [A.h]"])
 
+    def test_keep_in_memory(self):
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C until 3.3V", "Charge at 1C until 4.1 V")] * 3
+        )
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model, experiment=experiment)
+        sol = sim.solve(keep_in_memory=False)
+        # Only the final state and the summary variables are kept
+        self.assertEqual(len(sol.t), 1)
+        self.assertEqual(sol.cycles, [None] * 3)
+        self.assertEqual(len(sol.summary_variables["Capacity [A.h]"]), 3)
+
+        full_sol = sim.solve()
+        np.testing.assert_array_almost_equal(sol.y, full_sol.y[:, -1:])
+        np.testing.assert_array_almost_equal(
+            sol.summary_variables["Capacity [A.h]"],
+            full_sol.summary_variables["Capacity [A.h]"],
+        )
+
+        sim = pybamm.Simulation(model)
+        with self.assertRaisesRegex(ValueError, "keep_in_memory"):
+            sim.solve([0, 3600], keep_in_memory=False)
+
+    def test_run_experiment_single_model(self):
+        experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at C/20 for 20 minutes",
+                    "Charge at 1 A until 4.1 V",
+                    "Hold at 4.1 V until 50 mA",
+                    "Discharge at 2 W for 20 minutes",
+                    "Charge at 1 A until 4.1 V",
+                )
+            ]
+        )
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(
+            model, experiment=experiment, experiment_mode="single model"
+        )
+        # all the steps share the same model
+        models = sim.op_conds_to_model_and_param.values()
+        self.assertEqual(len({id(model) for model, _ in models}), 1)
+        sol = sim.solve()
+        built_models = sim.op_conds_to_built_models.values()
+        self.assertEqual(len({id(model) for model in built_models}), 1)
+
+        sol_multiple = pybamm.Simulation(model, experiment=experiment).solve()
+        self.assertEqual(
+            [step.termination for step in sol.cycles[0].steps],
+            [step.termination for step in sol_multiple.cycles[0].steps],
+        )
+        for step, step_multiple in zip(
+            sol.cycles[0].steps, sol_multiple.cycles[0].steps
+        ):
+            np.testing.assert_allclose(
+                step["Terminal voltage [V]"].entries[-1],
+                step_multiple["Terminal voltage [V]"].entries[-1],
+                rtol=1e-3,
+            )
+            np.testing.assert_allclose(
+                step["Current [A]"].entries[-1],
+                step_multiple["Current [A]"].entries[-1],
+                rtol=1e-3,
+                atol=1e-5,
+            )
+
+        # CCCV steps still have their own model
+        experiment = pybamm.Experiment(
+            [
+                "Discharge at 1C for 10 minutes",
+                "Charge at 1C until 4.1 V then hold at 4.1 V until C/50",
+                "Rest for 10 minutes",
+            ],
+            cccv_handling="ode",
+        )
+        sim = pybamm.Simulation(
+            model, experiment=experiment, experiment_mode="single model"
+        )
+        models = sim.op_conds_to_model_and_param.values()
+        self.assertEqual(len({id(model) for model, _ in models}), 2)
+
+        with self.assertRaisesRegex(ValueError, "experiment_mode"):
+            pybamm.Simulation(model, experiment=experiment, experiment_mode="bad")
+
+    def test_output_policy(self):
+        experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C for 20 minutes (10 second period)",
+                    "Rest for 1 hour (10 second period)",
+                )
+            ]
+        )
+        model = pybamm.lithium_ion.SPM()
+
+        class StoredPoints(pybamm.callbacks.Callback):
+            def __init__(self):
+                self.stored_points = []
+
+            def on_step_end(self, logs):
+                self.stored_points.append(logs["stored points"])
+
+        def solve(output_policy):
+            sim = pybamm.Simulation(model, experiment=experiment)
+            callback = StoredPoints()
+            sol = sim.solve(callbacks=callback, output_policy=output_policy)
+            return sol, callback.stored_points
+
+        full_sol, stored_points = solve(None)
+        self.assertEqual(stored_points, [121, 361])
+        voltage = full_sol["Terminal voltage [V]"]
+
+        # adaptive: few points during the rest, and the step boundaries are kept
+        sol, stored_points = solve(
+            pybamm.AdaptiveOutput("Terminal voltage [V]", rtol=1e-3)
+        )
+        self.assertLess(stored_points[1], 361 / 4)
+        self.assertEqual(
+            [len(step.t) for step in sol.cycles[0].steps], stored_points
+        )
+        for step, full_step in zip(sol.cycles[0].steps, full_sol.cycles[0].steps):
+            self.assertEqual(step.t[0], full_step.t[0])
+            self.assertEqual(step.t[-1], full_step.t[-1])
+        # the stored points are the same as without decimation
+        np.testing.assert_array_almost_equal(
+            sol["Terminal voltage [V]"].entries, voltage(sol.t * sol.timescale_eval)
+        )
+        # linear interpolation between the stored points is within the tolerance
+        t_full = full_sol.t * full_sol.timescale_eval
+        np.testing.assert_allclose(
+            sol["Terminal voltage [V]"](t_full), voltage.entries, rtol=2e-3
+        )
+
+        # with a maximum period (after the first two points of each step)
+        sol, stored_points = solve(
+            pybamm.AdaptiveOutput("Terminal voltage [V]", rtol=1, max_period=600)
+        )
+        self.assertEqual(stored_points, [4, 8])
+
+        # only the start and end of each step, and a different policy for each step
+        sol, stored_points = solve(pybamm.StepEndpointsOutput())
+        self.assertEqual(stored_points, [2, 2])
+        sol, stored_points = solve(
+            {"Rest for 1 hour (10 second period)": pybamm.StepEndpointsOutput()}
+        )
+        self.assertEqual(stored_points, [121, 2])
+
+        sim = pybamm.Simulation(model)
+        with self.assertRaisesRegex(ValueError, "output_policy"):
+            sim.solve([0, 3600], output_policy=pybamm.StepEndpointsOutput())
+
+    def test_summary_reductions(self):
+        experiment = pybamm.Experiment(
+            [
+                (
+                    "Discharge at 1C for 20 minutes (1 minute period)",
+                    "Charge at C/3 for 10 minutes (1 minute period)",
+                )
+            ]
+            * 2,
+        )
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model, experiment=experiment)
+        sol = sim.solve(
+            calc_esoh=False,
+            summary_reductions={"Throughput [A.s]": ("Current [A]", "integral")},
+            output_policy=pybamm.StepEndpointsOutput(),
+        )
+        self.assertEqual(len(sol.all_summary_variables), 2)
+        for summary in sol.all_summary_variables:
+            self.assertIn("Throughput [A.s]", summary)
+            self.assertIn("Change in total lithium [mol]", summary)
+        # Integral of the (constant) current of each step
+        current = sol.cycles[0]["Current [A]"].data
+        np.testing.assert_almost_equal(
+            sol.summary_variables["Throughput [A.s]"][0],
+            current[0] * 1200 + current[-1] * 600,
+            decimal=5,
+        )
+        Q = sol.cycles[0]["Discharge capacity [A.h]"].data
+        np.testing.assert_almost_equal(
+            sol.summary_variables["Maximum measured discharge capacity [A.h]"][0],
+            np.max(Q),
+        )
+
     def test_cycle_summary_variables(self):
         # Test cycle_summary_variables works for different combinations of data and
         # function OCPs
@@ -38,6 +38,16 @@ class TestInterpolant(unittest.TestCase):
                 (pybamm.Symbol("a"), pybamm.Symbol("b")),
                 interpolator="cubic spline",
             )
+        with self.assertRaisesRegex(ValueError, "x3"):
+            pybamm.Interpolant(
+                (np.ones(10), np.ones(11), np.ones(12)),
+                np.ones((10, 11, 13)),
+                (pybamm.Symbol("a"), pybamm.Symbol("b"), pybamm.Symbol("c")),
+            )
+        with self.assertRaisesRegex(ValueError, "derivative_dimension"):
+            pybamm.Interpolant(
+                np.ones(10), np.ones(10), pybamm.Symbol("a"), derivative_dimension=0
+            )
 
     def test_interpolation(self):
         x = np.linspace(0, 1, 200)
@@ -88,6 +98,87 @@ class TestInterpolant(unittest.TestCase):
             interp.evaluate(y=np.array([0, 0])), 0, decimal=3
         )
 
+    def test_interpolation_2_x_non_square(self):
+        # y[i, j] is the value at (x1[i], x2[j])
+        x = (np.linspace(0, 1, 11), np.linspace(0, 2, 5))
+        y = x[0][:, np.newaxis] + 10 * x[1][np.newaxis, :]
+        var1 = pybamm.StateVector(slice(0, 1))
+        var2 = pybamm.StateVector(slice(1, 2))
+        interp = pybamm.Interpolant(x, y, (var1, var2))
+        np.testing.assert_array_almost_equal(
+            interp.evaluate(y=np.array([0.35, 1.5])), [[15.35]]
+        )
+
+    def test_interpolation_3_x(self):
+        x = (np.linspace(0, 1, 11), np.linspace(0, 2, 6), np.linspace(-1, 1, 5))
+        xx, yy, zz = np.meshgrid(*x, indexing="ij")
+        # multi-linear interpolation is exact for this function
+        data = xx * yy + 2 * zz
+
+        var = pybamm.StateVector(slice(0, 3))
+        scalar = pybamm.StateVector(slice(3, 4))
+        y_test = np.array([0.1, 0.37, 0.9, 0.5])
+        interp = pybamm.Interpolant(x, data, (var, var, scalar))
+        np.testing.assert_array_almost_equal(
+            interp.evaluate(y=y_test)[:, 0], y_test[:3] ** 2 + 1
+        )
+        self.assertEqual(interp.evaluate_for_shape().shape, (3, 1))
+
+        # extrapolation
+        y_out = np.array([1.5, 1.5, 1.5, 0.5])
+        np.testing.assert_array_almost_equal(
+            interp.evaluate(y=y_out)[:, 0], [3.25, 3.25, 3.25]
+        )
+        interp = pybamm.Interpolant(x, data, (var, var, scalar), extrapolate=False)
+        self.assertTrue(np.all(np.isnan(interp.evaluate(y=y_out))))
+
+        # python evaluator, which calls the interpolating function directly
+        interp = pybamm.Interpolant(x, data, (var, var, scalar))
+        evaluator = pybamm.EvaluatorPython(interp)
+        np.testing.assert_array_almost_equal(
+            evaluator(y=y_test[:, np.newaxis]), interp.evaluate(y=y_test)
+        )
+
+    def test_diff_3_x(self):
+        x = (np.linspace(0, 1, 11), np.linspace(0, 2, 6), np.linspace(-1, 1, 5))
+        xx, yy, zz = np.meshgrid(*x, indexing="ij")
+        data = xx * yy + 2 * zz
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        c = pybamm.StateVector(slice(4, 6))
+        y_test = np.array([0.15, 0.42, 1.3, 0.5, -0.3, 0.2])
+        interp = pybamm.Interpolant(x, data, (a, b, c))
+
+        np.testing.assert_array_almost_equal(
+            interp.diff(a).evaluate(y=y_test)[:, 0], [1.3, 0.5]
+        )
+        np.testing.assert_array_almost_equal(
+            interp.diff(b).evaluate(y=y_test)[:, 0], [0.15, 0.42]
+        )
+        np.testing.assert_array_almost_equal(
+            interp.diff(c).evaluate(y=y_test)[:, 0], [2, 2]
+        )
+        # outside of the grid
+        y_out = np.array([1.5, 0.42, 3, 0.5, -0.3, 0.2])
+        np.testing.assert_array_almost_equal(
+            interp.diff(a).evaluate(y=y_out)[:, 0], [3, 0.5]
+        )
+
+        # jacobian
+        y = pybamm.StateVector(slice(0, 6))
+        jac = interp.jac(y).evaluate(y=y_test).toarray()
+        np.testing.assert_array_almost_equal(
+            jac,
+            [[1.3, 0, 0.15, 0, 2, 0], [0, 0.5, 0, 0.42, 0, 2]],
+        )
+
+        derivative = interp.diff(a)
+        self.assertEqual(derivative.derivative_dimension, 0)
+        self.assertNotEqual(derivative, interp)
+        self.assertEqual(derivative, derivative.new_copy())
+        with self.assertRaisesRegex(NotImplementedError, "Second derivatives"):
+            derivative.diff(a)
+
     def test_name(self):
         a = pybamm.Symbol("a")
         x = np.linspace(0, 1, 200)
@@ -195,17 +195,6 @@ class TestCasadiConverter(unittest.TestCase):
             interp = pybamm.Interpolant(x, data, y, interpolator="idonotexist")
             interp_casadi = interp.to_casadi(y=casadi_y)
 
-        # error for converted children count
-        y3 = (pybamm.StateVector(slice(0, 1)),
-              pybamm.StateVector(slice(0, 1)),
-              pybamm.StateVector(slice(0, 1)))
-        x3_ = [np.linspace(0, 1) for _ in range(3)]
-        x3 = np.column_stack(x3_)
-        data3 = 2 * x3  # np.tile(2 * x3, (10, 1)).T
-        with self.assertRaisesRegex(ValueError, "Invalid dimension of x"):
-            interp = pybamm.Interpolant(x3_, data3, y3, interpolator="linear")
-            interp_casadi = interp.to_casadi(y=casadi_y)
-
     def test_interpolation_2d(self):
         x_ = [np.linspace(0, 1), np.linspace(0, 1)]
 
@@ -250,6 +239,40 @@ class TestCasadiConverter(unittest.TestCase):
             interp = pybamm.Interpolant(x_, Y, y, interpolator="pchip")
             interp_casadi = interp.to_casadi(y=casadi_y)
 
+    def test_interpolation_3d(self):
+        x = (np.linspace(0, 1, 11), np.linspace(0, 2, 6), np.linspace(-1, 1, 5))
+        xx, yy, zz = np.meshgrid(*x, indexing="ij")
+        data = np.sin(xx) * yy + zz ** 2
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        c = pybamm.StateVector(slice(4, 5))
+        y = pybamm.StateVector(slice(0, 5))
+        casadi_y = casadi.MX.sym("y", 5)
+        y_test = np.array([0.15, 0.42, 1.3, 0.5, -0.3])
+        y_out = np.array([1.5, 0.42, 3, 0.5, -0.3])
+
+        # scalar children are broadcast against the other children
+        interp = pybamm.Interpolant(x, data, (a, b, c))
+        f = casadi.Function("f", [casadi_y], [interp.to_casadi(y=casadi_y)])
+        for y_eval in [y_test, y_out]:
+            np.testing.assert_array_almost_equal(interp.evaluate(y=y_eval), f(y_eval))
+
+        # derivatives
+        for child in [a, b, c]:
+            interp_diff = interp.diff(child)
+            f = casadi.Function("f", [casadi_y], [interp_diff.to_casadi(y=casadi_y)])
+            np.testing.assert_array_almost_equal(
+                interp_diff.evaluate(y=y_test), f(y_test)
+            )
+        f_jac = casadi.Function(
+            "f_jac",
+            [casadi_y],
+            [casadi.jacobian(interp.to_casadi(y=casadi_y), casadi_y)],
+        )
+        np.testing.assert_array_almost_equal(
+            interp.jac(y).evaluate(y=y_test).toarray(), f_jac(y_test)
+        )
+
     def test_concatenations(self):
         y = np.linspace(0, 1, 10)[:, np.newaxis]
         a = pybamm.Vector(y)
@@ -0,0 +1,97 @@
+#
+# Tests for the common subexpression eliminator
+#
+import pybamm
+import unittest
+
+import numpy as np
+
+
+class TestCommonSubexpressionEliminator(unittest.TestCase):
+    def test_process_symbol(self):
+        y = pybamm.StateVector(slice(0, 2))
+        A = pybamm.Matrix(np.array([[1, 2], [3, 4]]))
+        # two equal (but distinct) subtrees
+        expr = pybamm.exp(A @ y) + 2 * pybamm.exp(A @ y)
+        left, right = expr.children
+        self.assertIsNot(left, right.children[1])
+
+        eliminator = pybamm.CommonSubexpressionEliminator()
+        new_expr = eliminator.process_symbol(expr)
+        self.assertEqual(new_expr, expr)
+        new_left, new_right = new_expr.children
+        self.assertIs(new_left, new_right.children[1])
+        self.assertIs(new_right.left, new_right.children[0])
+        self.assertIs(new_right.right, new_left)
+        self.assertIs(new_left.children[0].left, A)
+        y_test = np.array([1, 2])
+        np.testing.assert_array_equal(
+            new_expr.evaluate(y=y_test), expr.evaluate(y=y_test)
+        )
+        # the original expression is not modified
+        self.assertIsNot(left, right.children[1])
+
+        # exp(A @ y) + 2 * exp(A @ y) has 11 nodes, of which 7 are distinct
+        self.assertEqual(eliminator.n_nodes, 11)
+        self.assertEqual(eliminator.n_unique_nodes, 7)
+        self.assertEqual(eliminator.n_duplicate_nodes, 4)
+
+        # subexpressions are shared with previously processed symbols
+        other = eliminator.process_symbol(pybamm.exp(A @ y) - y)
+        self.assertIs(other.left, new_left)
+        self.assertEqual(eliminator.n_nodes, 11 + 6)
+        self.assertEqual(eliminator.n_unique_nodes, 8)
+
+        # symbols without repeated subexpressions are unchanged
+        expr = pybamm.sin(y) + pybamm.cos(y)
+        self.assertIs(pybamm.CommonSubexpressionEliminator().process_symbol(expr), expr)
+
+    def test_discretisation(self):
+        model = pybamm.lithium_ion.DFN()
+        geometry = model.default_geometry
+        param = model.default_parameter_values
+        param.process_model(model)
+        param.process_geometry(geometry)
+        mesh = pybamm.Mesh(geometry, model.default_submesh_types, model.default_var_pts)
+
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        model_shared = disc.process_model(
+            model, inplace=False, eliminate_common_subexpressions=True
+        )
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        model_unshared = disc.process_model(model, inplace=False)
+
+        def count_nodes(symbol):
+            return len(set(id(node) for node in symbol.pre_order()))
+
+        for attr in ["concatenated_rhs", "concatenated_algebraic"]:
+            shared = getattr(model_shared, attr)
+            unshared = getattr(model_unshared, attr)
+            self.assertEqual(shared, unshared)
+            self.assertEqual(
+                count_nodes(shared), len(set(node.id for node in shared.pre_order()))
+            )
+        self.assertLess(
+            count_nodes(model_shared.concatenated_rhs),
+            count_nodes(model_unshared.concatenated_rhs),
+        )
+        y0 = model_shared.concatenated_initial_conditions.evaluate()
+        np.testing.assert_array_equal(
+            model_shared.concatenated_rhs.evaluate(0, y0),
+            model_unshared.concatenated_rhs.evaluate(0, y0),
+        )
+        self.assertEqual(
+            [event.expression for event in model_shared.events],
+            [event.expression for event in model_unshared.events],
+        )
+        self.assertEqual(model_shared.variables.keys(), model_unshared.variables.keys())
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
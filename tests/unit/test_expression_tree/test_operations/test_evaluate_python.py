@@ -3,7 +3,11 @@
 #
 import pybamm
 
-from tests import get_discretisation_for_testing, get_1p1d_discretisation_for_testing
+from tests import (
+    get_discretisation_for_testing,
+    get_1p1d_discretisation_for_testing,
+    get_mesh_for_testing,
+)
 import unittest
 import numpy as np
 import scipy.sparse
@@ -459,6 +463,100 @@ class TestEvaluate(unittest.TestCase):
             result = evaluator(t=t, y=y)
             np.testing.assert_allclose(result, expr.evaluate(t=t, y=y))
 
+    def test_evaluator_python_multiple_times(self):
+        mesh = get_mesh_for_testing()
+        n = mesh["negative electrode"].npts
+        s = mesh["separator"].npts
+        a = pybamm.StateVector(slice(0, n), domain="negative electrode")
+        b = pybamm.StateVector(slice(n, n + s), domain="separator")
+        c = pybamm.StateVector(slice(n + s, n + s + 1))
+        x = np.linspace(0, 10, 11)
+        interp = pybamm.Interpolant(x, x ** 2, c)
+        # one column per time
+        y_tests = np.linspace(1, 2, 3 * (n + s + 1)).reshape(-1, 3)
+        t_tests = np.array([1, 2, 3])
+
+        for expr in [
+            b * pybamm.t + c,
+            pybamm.exp(pybamm.Matrix(np.eye(n)) @ a),
+            pybamm.NumpyConcatenation(a, pybamm.Vector(np.ones(2)), c),
+            pybamm.DomainConcatenation(
+                [a, pybamm.Vector(np.ones(s), domain="separator")], mesh
+            ),
+            pybamm.max(a),
+            pybamm.min(b * c) + pybamm.t,
+            interp,
+            pybamm.t,
+            pybamm.Vector(np.array([1, 2])),
+        ]:
+            evaluator = pybamm.EvaluatorPython(expr)
+            result = evaluator(t=t_tests, y=y_tests)
+            for i, (t, y) in enumerate(zip(t_tests, y_tests.T)):
+                expected = expr.evaluate(t=t, y=y.reshape(-1, 1))
+                # evaluations at a single time are unchanged
+                np.testing.assert_allclose(evaluator(t=t, y=y), expected)
+                # constant results are not broadcast
+                np.testing.assert_allclose(
+                    np.broadcast_to(result, (np.size(expected), 3))[:, i],
+                    np.reshape(expected, -1),
+                )
+
+    def test_evaluator_python_sparse_jacobian(self):
+        y = pybamm.StateVector(slice(0, 4))
+        a = pybamm.StateVector(slice(0, 2))
+        b = pybamm.StateVector(slice(2, 4))
+        c = pybamm.StateVector(slice(0, 1))
+        A = pybamm.Matrix(scipy.sparse.csr_matrix(np.array([[1, 0], [2, 4]])))
+        y_tests = [np.array([[2], [3], [4], [5]]), np.array([1.0, 3, 2, 1])]
+        t_tests = [1, 2]
+
+        def check(expr, n_structure=None):
+            jac = pybamm.Jacobian().jac(expr, y)
+            evaluator = pybamm.EvaluatorPythonSparseJacobian(jac)
+            self.assertIsNone(evaluator._fallback)
+            self.assertEqual(evaluator.shape, jac.shape)
+            structure = None
+            for t, y_test in zip(t_tests, y_tests):
+                result = evaluator(t=t, y=y_test)
+                self.assertTrue(scipy.sparse.isspmatrix_csr(result))
+                expected = jac.evaluate(t=t, y=y_test.reshape(-1, 1))
+                if scipy.sparse.issparse(expected):
+                    expected = expected.toarray()
+                np.testing.assert_allclose(result.toarray(), expected)
+                # the structure is the same at every call
+                if structure is None:
+                    structure = (result.indices, result.indptr)
+                else:
+                    np.testing.assert_array_equal(structure[0], result.indices)
+                    np.testing.assert_array_equal(structure[1], result.indptr)
+            if n_structure is not None:
+                self.assertEqual(result.nnz, n_structure)
+
+        # products with vectors and scalars, sums, matrix products and negation
+        check(a * b)
+        check(-(A @ (a ** 2)) + b / c - pybamm.t * a)
+        check(pybamm.exp(a) * (A @ b))
+        # concatenation and indexing
+        check(pybamm.NumpyConcatenation(a * b, c * b, A @ a), n_structure=11)
+        check(
+            pybamm.Index(pybamm.NumpyConcatenation(a * b, pybamm.sin(b)), slice(1, 3))
+        )
+        # broadcasting a scalar function of the state
+        check(a * pybamm.Index(b, 0))
+        # constant jacobian
+        check(A @ a + b)
+
+        # unsupported operations are evaluated without the sparse structure
+        jac = pybamm.Jacobian().jac(a * b, y)
+        jac = pybamm.SparseStack(jac, jac * jac)
+        evaluator = pybamm.EvaluatorPythonSparseJacobian(jac)
+        self.assertIsNotNone(evaluator._fallback)
+        result = evaluator(t=1, y=y_tests[0])
+        self.assertTrue(scipy.sparse.isspmatrix_csr(result))
+        np.testing.assert_allclose(
+            result.toarray(), jac.evaluate(t=1, y=y_tests[0]).toarray()
+        )
+
     @unittest.skipIf(not pybamm.have_jax(), "jax or jaxlib is not installed")
     def test_find_symbols_jax(self):
         # test sparse conversion
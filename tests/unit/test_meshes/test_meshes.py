@@ -237,6 +237,24 @@ class TestMesh(unittest.TestCase):
         with self.assertRaises(pybamm.DomainError):
             mesh.combine_submeshes("negative electrode", "positive electrode")
 
+        # combined submeshes and the fingerprint are memoised until a submesh is
+        # replaced
+        self.assertIs(
+            mesh.combine_submeshes("negative electrode", "separator"), submesh
+        )
+        fingerprint = mesh.fingerprint
+        self.assertEqual(
+            pybamm.Mesh(geometry, submesh_types, var_pts).fingerprint, fingerprint
+        )
+        mesh["separator"] = pybamm.SubMesh1D(
+            mesh["separator"].edges * 2 - mesh["separator"].edges[0],
+            mesh["separator"].coord_sys,
+        )
+        new_submesh = mesh.combine_submeshes("negative electrode", "separator")
+        self.assertIsNot(new_submesh, submesh)
+        self.assertNotEqual(mesh.fingerprint, fingerprint)
+        self.assertEqual(new_submesh.edges[-1], mesh["separator"].edges[-1])
+
         # test errors
         geometry = {
             "negative electrode": {"x_n": {"min": 0, "max": 0.5}},
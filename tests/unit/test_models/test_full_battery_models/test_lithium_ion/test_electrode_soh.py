@@ -4,6 +4,8 @@
 import pybamm
 import unittest
 
+import numpy as np
+
 
 class TestElectrodeSOH(unittest.TestCase):
     def test_known_solution(self):
@@ -36,6 +38,58 @@ class TestElectrodeSOH(unittest.TestCase):
         self.assertAlmostEqual(sol["n_Li_0"].data[0], n_Li, places=5)
 
 
+class TestElectrodeSOHSolver(unittest.TestCase):
+    def test_known_solution(self):
+        param = pybamm.LithiumIonParameters()
+        parameter_values = pybamm.ParameterValues("Mohtat2020")
+        esoh_solver = pybamm.lithium_ion.ElectrodeSOHSolver(parameter_values)
+        sim = pybamm.Simulation(
+            pybamm.lithium_ion.ElectrodeSOH(), parameter_values=parameter_values
+        )
+
+        inputs = {
+            "V_min": 3,
+            "V_max": 4.2,
+            "C_n": parameter_values.evaluate(param.n.cap_init),
+            "C_p": parameter_values.evaluate(param.p.cap_init),
+            "n_Li": parameter_values.evaluate(param.n_Li_particles_init),
+        }
+        self.assertIsNone(esoh_solver.last_solution)
+        sol = esoh_solver.solve(inputs)
+        sim_sol = sim.solve([0], inputs=inputs)
+        for var in ["x_100", "y_100", "x_0", "y_0", "C"]:
+            self.assertAlmostEqual(sol[var], sim_sol[var].data[0], places=5)
+        self.assertAlmostEqual(sol["Up(y_100) - Un(x_100)"], 4.2, places=5)
+        self.assertAlmostEqual(sol["Up(y_0) - Un(x_0)"], 3, places=5)
+
+        # Warm start from the previous solution, or from an initial guess
+        self.assertIsNotNone(esoh_solver.last_solution)
+        sol_2 = esoh_solver.solve({**inputs, "n_Li": 0.99 * inputs["n_Li"]})
+        self.assertAlmostEqual(sol_2["n_Li_100"], 0.99 * inputs["n_Li"], places=5)
+        sol_3 = esoh_solver.solve(
+            inputs, initial_guess={"x_100": sol["x_100"], "C": 0.9 * sol["C"]}
+        )
+        self.assertAlmostEqual(sol_3["C"], sol["C"], places=5)
+
+        # Batch solve
+        batch_sol = esoh_solver.solve_batch(
+            {**inputs, "n_Li": inputs["n_Li"] * np.array([1, 0.99, 0.98])}
+        )
+        self.assertEqual(batch_sol["C"].shape, (3,))
+        self.assertAlmostEqual(batch_sol["C"][0], sol["C"], places=5)
+        self.assertAlmostEqual(batch_sol["C"][1], sol_2["C"], places=5)
+        self.assertGreater(batch_sol["C"][1], batch_sol["C"][2])
+
+        # Failures give NaN in the batch, and errors otherwise
+        batch_sol = esoh_solver.solve_batch({**inputs, "V_max": np.array([4.2, 100])})
+        self.assertAlmostEqual(batch_sol["C"][0], sol["C"], places=5)
+        self.assertTrue(np.isnan(batch_sol["C"][1]))
+        with self.assertRaisesRegex(pybamm.SolverError, "eSOH"):
+            esoh_solver.solve({**inputs, "V_max": 100})
+        with self.assertRaisesRegex(KeyError, "Missing input"):
+            esoh_solver.solve({"V_min": 3})
+
+
 class TestElectrodeSOHHalfCell(unittest.TestCase):
     def test_known_solution(self):
         model = pybamm.lithium_ion.ElectrodeSOHHalfCell("positive")
@@ -514,7 +514,8 @@ class TestParameterValues(unittest.TestCase):
 
         x_ = [np.linspace(0, 10), np.linspace(0, 20)]
 
-        X = list(np.meshgrid(*x_))
+        # data[i, j] is the value at (x_[0][i], x_[1][j])
+        X = list(np.meshgrid(*x_, indexing="ij"))
 
         x = np.column_stack([el.reshape(-1, 1) for el in X])
 
@@ -534,7 +535,9 @@ class TestParameterValues(unittest.TestCase):
 
         processed_func = parameter_values.process_symbol(func)
         self.assertIsInstance(processed_func, pybamm.Interpolant)
-        self.assertEqual(processed_func.evaluate(), 14.82)
+        np.testing.assert_almost_equal(
+            processed_func.evaluate().flatten()[0], 14.82, decimal=4
+        )
 
         # process differentiated function parameter
         # diff_func = func.diff(a)
@@ -544,7 +547,9 @@ class TestParameterValues(unittest.TestCase):
         # interpolant defined up front
         interp2 = pybamm.Interpolant(data[0], data[1], children=(a, b))
         processed_interp2 = parameter_values.process_symbol(interp2)
-        self.assertEqual(processed_interp2.evaluate(), 14.82)
+        np.testing.assert_almost_equal(
+            processed_interp2.evaluate().flatten()[0], 14.82, decimal=4
+        )
 
         y3 = (3 * x).sum(axis=1)
 
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 import os
 import sys
+import tempfile
 import unittest
 import uuid
 
@@ -302,6 +303,66 @@ class TestSimulation(unittest.TestCase):
         ):
             sim.save("test.pickle")
 
+    def test_build_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model = pybamm.lithium_ion.SPM()
+            sim = pybamm.Simulation(model, build_cache=directory)
+            self.assertIsInstance(sim.build_cache, pybamm.BuildCache)
+            sol = sim.solve([0, 600])
+            self.assertEqual(sim.build_cache.misses, 1)
+            self.assertIsNotNone(sim.model_with_set_params)
+
+            # A new simulation (e.g. in another process) loads the built and set up
+            # model from the cache
+            cache = pybamm.BuildCache(directory)
+            sim_cached = pybamm.Simulation(pybamm.lithium_ion.SPM(), build_cache=cache)
+            sim_cached.build()
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            self.assertIsNone(sim_cached.model_with_set_params)
+            built_model = sim_cached.built_model
+            self.assertTrue(hasattr(built_model, "casadi_rhs"))
+            sol_cached = sim_cached.solve([0, 600])
+            np.testing.assert_array_almost_equal(
+                sol["Terminal voltage [V]"].entries,
+                sol_cached["Terminal voltage [V]"].entries,
+            )
+            # Different parameter values are built again
+            parameter_values = model.default_parameter_values
+            parameter_values["Current function [A]"] = 2
+            sim_new = pybamm.Simulation(
+                model, parameter_values=parameter_values, build_cache=cache
+            )
+            sim_new.build()
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_build_cache_custom_models(self):
+        # Custom models with the same (default) name but different equations are
+        # built separately
+        def make_model(rate):
+            model = pybamm.BaseModel()
+            var = pybamm.Variable("var")
+            model.rhs = {var: -rate * var}
+            model.initial_conditions = {var: 1}
+            model.variables = {"var": var}
+            return model
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = pybamm.BuildCache(directory)
+            t_eval = np.linspace(0, 1, 11)
+            sols = []
+            for rate in [1, 2]:
+                sim = pybamm.Simulation(make_model(rate), build_cache=cache)
+                sols.append(sim.solve(t_eval))
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+            np.testing.assert_array_almost_equal(
+                sols[1]["var"].entries, np.exp(-2 * t_eval), decimal=5
+            )
+
+            # the same equations are loaded from the cache
+            sim = pybamm.Simulation(make_model(2), build_cache=cache)
+            sim.build()
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+
     def test_load_param(self):
         # Test load_sim for parameters imports
         filename = f"{uuid.uuid4()}.p"
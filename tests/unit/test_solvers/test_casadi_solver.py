@@ -1,6 +1,7 @@
 #
 # Tests for the Casadi Solver class
 #
+import casadi
 import pybamm
 import unittest
 import numpy as np
@@ -216,6 +217,49 @@ class TestCasadiSolver(unittest.TestCase):
         np.testing.assert_array_less(solution.y.full()[0], 1.02 + 1e-10)
         np.testing.assert_array_almost_equal(solution.y[0, -1], 1.02, decimal=2)
 
+    def test_model_solver_dense_output(self):
+        model = pybamm.BaseModel()
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        var1 = pybamm.Variable("var1", domain=whole_cell)
+        var2 = pybamm.Variable("var2", domain=whole_cell)
+        model.rhs = {var1: 0.1 * var1}
+        model.algebraic = {var2: 2 * var1 - var2}
+        model.initial_conditions = {var1: 1, var2: 2}
+        model.events = [pybamm.Event("var1 = 1.5", pybamm.min(var1 - 1.5))]
+        disc = get_discretisation_for_testing()
+        disc.process_model(model)
+
+        safe_solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8, dt_max=0.5)
+        solver = pybamm.CasadiSolver(
+            mode="safe with dense output", rtol=1e-8, atol=1e-8, dt_max=0.5
+        )
+        # equally spaced points, points that are more spaced out over time, and a
+        # mix of the two
+        for t_eval in [
+            np.linspace(0, 5, 100),
+            5 * np.linspace(0, 1, 100) ** 2,
+            np.concatenate([np.linspace(0, 1, 21), np.linspace(1.1, 5, 40)]),
+        ]:
+            solution = solver.solve(model, t_eval)
+            safe_solution = safe_solver.solve(model, t_eval)
+            np.testing.assert_array_equal(solution.t[:-1], safe_solution.t[:-1])
+            np.testing.assert_array_almost_equal(
+                solution.y.full()[0], np.exp(0.1 * solution.t), decimal=5
+            )
+            np.testing.assert_array_almost_equal(
+                solution.y.full()[-1], 2 * np.exp(0.1 * solution.t), decimal=5
+            )
+            self.assertEqual(solution.termination, "event: var1 = 1.5")
+            self.assertAlmostEqual(
+                solution.t_event[0], safe_solution.t_event[0], places=4
+            )
+        # the same integrator is used for all the global steps and events
+        self.assertEqual(solver.integrator_cache.misses, 1)
+
+        # The grid must have at least one interval
+        with self.assertRaisesRegex(ValueError, "dense_output_points"):
+            pybamm.CasadiSolver(mode="safe with dense output", dense_output_points=1)
+
     def test_model_step(self):
         # Create model
         model = pybamm.BaseModel()
@@ -369,6 +413,85 @@ class TestCasadiSolver(unittest.TestCase):
             solution.y.full()[0], np.exp(-1.1 * solution.t), rtol=1e-04
         )
 
+    def test_clear_set_up(self):
+        model = pybamm.BaseModel()
+        var = pybamm.Variable("var")
+        model.rhs = {var: -0.1 * var}
+        model.initial_conditions = {var: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        solver = pybamm.CasadiSolver()
+        t_eval = np.linspace(0, 1, 10)
+        solver.solve(model, t_eval)
+        self.assertIn(model, solver.models_set_up)
+        self.assertIn(model, solver.integrator_specs)
+        solver.clear_set_up(model)
+        self.assertNotIn(model, solver.models_set_up)
+        self.assertNotIn(model, solver.integrator_specs)
+        # The integrators are kept, and reused when the model is set up again
+        self.assertEqual(len(solver.integrator_cache), 1)
+        solution = solver.solve(model, t_eval)
+        np.testing.assert_allclose(
+            solution.y.full()[0], np.exp(-0.1 * t_eval), rtol=1e-5
+        )
+        self.assertEqual(solver.integrator_cache.misses, 1)
+
+        # Deprecated view of the cached integrators
+        t_eval_rounded = np.round(t_eval, decimals=12).tobytes()
+        with self.assertWarns(DeprecationWarning):
+            integrators = solver.integrators
+        self.assertEqual(list(integrators[model].keys()), [t_eval_rounded])
+
+        solver.clear_set_up()
+        self.assertEqual(solver.models_set_up, {})
+        self.assertEqual(solver.integrator_specs, {})
+
+    def test_model_solver_multiple_inputs_batched(self):
+        # Create model
+        model = pybamm.BaseModel()
+        domain = ["negative electrode", "separator", "positive electrode"]
+        var = pybamm.Variable("var", domain=domain)
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        model.events = [pybamm.Event("var=0.5", pybamm.min(var - 0.5))]
+        disc = pybamm.Discretisation(
+            get_mesh_for_testing(), {"macroscale": pybamm.FiniteVolume()}
+        )
+        disc.process_model(model)
+
+        solver = pybamm.CasadiSolver(rtol=1e-8, atol=1e-8)
+        solver.parallel_backend = "batched"
+        t_eval = np.linspace(0, 10, 100)
+        rates = [0.01, 0.1, 0.2, 0.3]
+        inputs_list = [{"rate": rate} for rate in rates]
+        solutions = solver.solve(model, t_eval, inputs=inputs_list)
+        for rate, solution in zip(rates, solutions):
+            np.testing.assert_allclose(
+                solution.y.full()[0], np.exp(-rate * solution.t), rtol=1e-04
+            )
+        # The slowest decay doesn't reach the event, the others stop at the event
+        self.assertEqual(solutions[0].termination, "final time")
+        for rate, solution in zip(rates[1:], solutions[1:]):
+            self.assertEqual(solution.termination, "event: var=0.5")
+            self.assertAlmostEqual(solution.t_event[0], np.log(2) / rate, places=3)
+
+        # The mapped integrator is cached, along with the integrator it maps
+        spec_key = solver._integrator_spec_keys[model]
+        t_eval_rounded = np.round(t_eval, decimals=12).tobytes()
+        self.assertIn((spec_key, t_eval_rounded), solver.integrator_cache)
+        key = (spec_key, t_eval_rounded, len(rates), None)
+        self.assertIn(key, solver.integrator_cache)
+        mapped_integrator = solver.integrator_cache.get(key)
+        solver.solve(model, t_eval, inputs=inputs_list)
+        self.assertIs(solver.integrator_cache.get(key), mapped_integrator)
+
+        # Errors
+        with self.assertRaisesRegex(pybamm.SolverError, "symbolic inputs"):
+            solver._integrate_batched(
+                model, t_eval, [{"rate": casadi.MX.sym("rate")}, {"rate": 0.1}]
+            )
+
     def test_model_solver_dae_inputs_in_initial_conditions(self):
         # Create model
         model = pybamm.BaseModel()
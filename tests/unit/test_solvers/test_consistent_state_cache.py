@@ -0,0 +1,97 @@
+#
+# Tests for the ConsistentStateCache class
+#
+import pybamm
+import unittest
+
+import casadi
+import numpy as np
+
+
+def get_dae_model():
+    model = pybamm.BaseModel()
+    u = pybamm.Variable("u")
+    v = pybamm.Variable("v")
+    a = pybamm.InputParameter("a")
+    model.rhs = {u: -a * u}
+    model.algebraic = {v: pybamm.exp(v) - u - 1}
+    model.initial_conditions = {u: 1, v: 0}
+    model.variables = {"u": u, "v": v}
+    pybamm.Discretisation().process_model(model)
+    return model
+
+
+class TestConsistentStateCache(unittest.TestCase):
+    def test_get_put(self):
+        model = get_dae_model()
+        cache = pybamm.ConsistentStateCache(resolution=0.1)
+        inputs = {"a": 1, "start time": 0}
+        self.assertIsNone(cache.get(model, inputs, np.array([1.0, 0.0])))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        cache.put(model, inputs, np.array([1.0, 0.7]))
+        self.assertEqual(len(cache), 1)
+        # differential states are rounded, and "start time" is ignored
+        y0 = cache.get(model, {"a": 1, "start time": 10}, np.array([[1.04], [0.0]]))
+        np.testing.assert_array_equal(y0, [[1.04], [0.7]])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        y0 = cache.get(model, inputs, casadi.DM([0.96, 0.0]))
+        self.assertIsInstance(y0, casadi.DM)
+        np.testing.assert_array_equal(y0.full(), [[0.96], [0.7]])
+
+        # different differential states or inputs
+        self.assertIsNone(cache.get(model, inputs, np.array([1.2, 0.0])))
+        self.assertIsNone(cache.get(model, {"a": 2}, np.array([1.0, 0.0])))
+        # states that can't be cached
+        self.assertIsNone(cache.get(model, {"a": casadi.MX.sym("a")}, np.zeros(2)))
+        self.assertIsNone(cache.get(model, inputs, np.zeros(3)))
+        cache.put(model, inputs, np.zeros(3))
+        self.assertEqual(len(cache), 1)
+
+        # least recently used entries are removed
+        cache = pybamm.ConsistentStateCache(max_size=2)
+        for u in [1, 2, 3]:
+            cache.put(model, inputs, np.array([u, 0.0]))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(model, inputs, np.array([1.0, 0.0])))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_solver(self):
+        model = get_dae_model()
+        for root_method in ["casadi", "lm"]:
+            solver = pybamm.CasadiSolver(root_method=root_method)
+            solver.consistent_state_cache = pybamm.ConsistentStateCache()
+            inputs = {"a": 1}
+            solution = solver.step(None, model, 1, inputs=inputs)
+            self.assertGreater(solution.root_iterations, 0)
+            self.assertEqual(solution.root_iterations, solver.root_iterations)
+            np.testing.assert_array_almost_equal(
+                solution["v"].entries, np.log(1 + solution["u"].entries)
+            )
+
+            # Starting from the same state, the converged algebraic state is reused
+            second_solution = solver.step(None, model, 1, inputs=inputs)
+            self.assertLess(
+                second_solution.root_iterations, solution.root_iterations
+            )
+            self.assertEqual(solver.consistent_state_cache.hits, 1)
+            np.testing.assert_array_almost_equal(
+                second_solution.y, solution.y, decimal=5
+            )
+
+        # No cache by default
+        solver = pybamm.CasadiSolver()
+        self.assertIsNone(solver.consistent_state_cache)
+        solver.step(None, model, 1, inputs=inputs)
+        solver.step(None, model, 1, inputs=inputs)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -298,6 +298,184 @@ class TestIDAKLUSolver(unittest.TestCase):
         with self.assertRaisesRegex(pybamm.SolverError, 'Absolute tolerances'):
             solver.solve(model, t_eval)
 
+    def test_multiple_models(self):
+        # steps alternating between models, as in an experiment
+        for form in ["python", "casadi"]:
+            if form == "casadi":
+                root_method = "casadi"
+            else:
+                root_method = "lm"
+            models = []
+            for rate in [0.1, -0.1]:
+                model = pybamm.BaseModel()
+                model.convert_to_format = form
+                u = pybamm.Variable("u")
+                v = pybamm.Variable("v")
+                model.rhs = {u: rate * v}
+                model.algebraic = {v: 1 - v}
+                model.initial_conditions = {u: 0, v: 1}
+                model.variables = {"u": u, "v": v}
+                disc = pybamm.Discretisation()
+                disc.process_model(model)
+                models.append(model)
+
+            solver = pybamm.IDAKLUSolver(root_method=root_method)
+            solution = None
+            for model in models * 2:
+                solution = solver.step(solution, model, 1, npts=10)
+            self.assertEqual(set(solver._setup), set(models))
+            # u increases then decreases by 0.1 in each step
+            np.testing.assert_array_almost_equal(
+                solution["u"](t=np.array([1, 2, 3, 4])), [0.1, 0, 0.1, 0]
+            )
+
+            # the set-up of the models is reused
+            setup = solver._setup[models[0]]
+            solver.step(solution, models[0], 1, npts=10)
+            self.assertIs(solver._setup[models[0]], setup)
+
+            # and removed explicitly
+            solver.clear_set_up(models[0])
+            self.assertEqual(set(solver._setup), {models[1]})
+            self.assertNotIn(models[0], solver.models_set_up)
+            solver.clear_set_up()
+            self.assertEqual(solver._setup, {})
+            self.assertEqual(solver.models_set_up, {})
+
+    def test_multiple_inputs_batched(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        v = pybamm.Variable("v")
+        rate = pybamm.InputParameter("rate")
+        model.rhs = {u: -rate * u}
+        model.algebraic = {v: u - v}
+        model.initial_conditions = {u: 1, v: 1}
+        model.events = [pybamm.Event("u=0.5", u - 0.5)]
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        solver = pybamm.IDAKLUSolver(rtol=1e-8, atol=1e-8)
+        solver.parallel_backend = "batched"
+        t_eval = np.linspace(0, 10, 100)
+        rates = [0.01, 0.1, 0.2, 0.3]
+        inputs_list = [{"rate": rate} for rate in rates]
+        solutions = solver.solve(model, t_eval, inputs=inputs_list, nproc=2)
+        for rate, solution in zip(rates, solutions):
+            np.testing.assert_allclose(
+                solution.y[0], np.exp(-rate * solution.t), rtol=1e-4
+            )
+            np.testing.assert_allclose(solution.y[0], solution.y[1], rtol=1e-6)
+            # same as solving for each set of inputs separately
+            serial_solution = solver.solve(model, t_eval, inputs={"rate": rate})
+            np.testing.assert_array_almost_equal(solution.t, serial_solution.t)
+            np.testing.assert_array_almost_equal(solution.y, serial_solution.y)
+        # the slowest decay doesn't reach the event, the others stop at the event
+        self.assertEqual(solutions[0].termination, "final time")
+        self.assertEqual(len(solutions[0].t), len(t_eval))
+        for rate, solution in zip(rates[1:], solutions[1:]):
+            self.assertEqual(solution.termination, "event: u=0.5")
+            self.assertAlmostEqual(solution.t[-1], np.log(2) / rate, places=3)
+
+        # only casadi format is supported
+        model.convert_to_format = "python"
+        solver = pybamm.IDAKLUSolver(root_method="lm")
+        solver.parallel_backend = "batched"
+        with self.assertRaisesRegex(pybamm.SolverError, "casadi format"):
+            solver.solve(model, t_eval, inputs=inputs_list)
+
+        # batched and sequential solves of a full model agree, with more sets of
+        # inputs than threads
+        spm = pybamm.lithium_ion.SPM()
+        geometry = spm.default_geometry
+        param = spm.default_parameter_values
+        param.update({"Current function [A]": "[input]"})
+        param.process_model(spm)
+        param.process_geometry(geometry)
+        mesh = pybamm.Mesh(geometry, spm.default_submesh_types, spm.default_var_pts)
+        disc = pybamm.Discretisation(mesh, spm.default_spatial_methods)
+        disc.process_model(spm)
+        t_eval = np.linspace(0, 3600, 100)
+        currents = [0.5, 1, 2, 3, 5]
+        inputs_list = [{"Current function [A]": current} for current in currents]
+        solver = pybamm.IDAKLUSolver()
+        solver.parallel_backend = "batched"
+        batched_solutions = solver.solve(spm, t_eval, inputs=inputs_list, nproc=2)
+        sequential_solutions = [
+            pybamm.IDAKLUSolver().solve(spm, t_eval, inputs=inputs)
+            for inputs in inputs_list
+        ]
+        for batched, sequential in zip(batched_solutions, sequential_solutions):
+            self.assertEqual(batched.termination, sequential.termination)
+            np.testing.assert_array_almost_equal(batched.t, sequential.t)
+            np.testing.assert_array_almost_equal(batched.y, sequential.y)
+            np.testing.assert_array_almost_equal(
+                batched["Terminal voltage [V]"].entries,
+                sequential["Terminal voltage [V]"].entries,
+            )
+        # the higher currents reach the voltage cut-off
+        self.assertEqual(batched_solutions[0].termination, "final time")
+        self.assertIn("event", batched_solutions[-1].termination)
+
+    def test_output_variables(self):
+        model = pybamm.lithium_ion.SPM()
+        geometry = model.default_geometry
+        param = model.default_parameter_values
+        param.process_model(model)
+        param.process_geometry(geometry)
+        mesh = pybamm.Mesh(geometry, model.default_submesh_types, model.default_var_pts)
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        disc.process_model(model)
+        t_eval = np.linspace(0, 3600, 100)
+
+        output_variables = [
+            "Terminal voltage [V]",
+            "Discharge capacity [A.h]",
+            "Negative particle concentration",
+        ]
+        solver = pybamm.IDAKLUSolver(output_variables=output_variables)
+        solution = solver.solve(model, t_eval)
+        full_solution = pybamm.IDAKLUSolver().solve(model, t_eval)
+
+        self.assertEqual(solution.output_variables.keys(), set(output_variables))
+        # only the output variables are stored
+        n_outputs = 2 + model.variables["Negative particle concentration"].size
+        self.assertEqual(solution.y.shape, (n_outputs, len(solution.t)))
+        for name in output_variables:
+            np.testing.assert_array_almost_equal(
+                solution[name].entries, full_solution[name].entries
+            )
+        with self.assertRaisesRegex(KeyError, "not one of the output variables"):
+            solution["Electrolyte concentration"]
+        # the final state is kept, to step on from
+        np.testing.assert_array_almost_equal(
+            solution.final_state, full_solution.y[:, -1]
+        )
+        step_solution = solver.step(solution, model, t_eval[-1], npts=10)
+        full_step_solution = pybamm.IDAKLUSolver().step(
+            full_solution, model, t_eval[-1], npts=10
+        )
+        np.testing.assert_array_almost_equal(
+            step_solution["Terminal voltage [V]"].entries,
+            full_step_solution["Terminal voltage [V]"].entries,
+        )
+        # solutions with other output variables can't be added together
+        other_solver = pybamm.IDAKLUSolver(output_variables=output_variables[:2])
+        with self.assertRaisesRegex(pybamm.SolverError, "different output variables"):
+            other_solver.step(solution, model, t_eval[-1], npts=10)
+
+        # errors
+        model = pybamm.BaseModel()
+        model.convert_to_format = "python"
+        u = pybamm.Variable("u")
+        model.rhs = {u: -u}
+        model.initial_conditions = {u: 1}
+        model.variables = {"u": u}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+        solver = pybamm.IDAKLUSolver(root_method="lm", output_variables=["u"])
+        with self.assertRaisesRegex(pybamm.SolverError, "casadi format"):
+            solver.solve(model, t_eval)
+
     def test_failures(self):
         # this test implements a python version of the ida Roberts
         # example provided in sundials
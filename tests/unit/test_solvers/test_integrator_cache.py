@@ -0,0 +1,118 @@
+#
+# Tests for the IntegratorCache class
+#
+import pybamm
+import unittest
+
+import casadi
+import numpy as np
+
+
+def get_integrator(n_grid):
+    x = casadi.MX.sym("x")
+    problem = {"x": x, "ode": -x}
+    return casadi.integrator(
+        "F", "cvodes", problem, {"grid": np.linspace(0, 1, n_grid)}
+    )
+
+
+def get_model():
+    model = pybamm.BaseModel()
+    var = pybamm.Variable("var")
+    model.rhs = {var: -pybamm.InputParameter("rate") * var}
+    model.initial_conditions = {var: 1}
+    model.events = [pybamm.Event("var=0.5", var - 0.5)]
+    pybamm.Discretisation().process_model(model)
+    return model
+
+
+class TestIntegratorCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = pybamm.IntegratorCache(max_entries=2)
+        self.assertIsNone(cache.get("a"))
+        integrators = {key: get_integrator(10) for key in ["a", "b", "c"]}
+        cache.put("a", integrators["a"])
+        cache.put("b", integrators["b"])
+        self.assertIs(cache.get("a"), integrators["a"])
+        # "b" is now the least recently used
+        cache.put("c", integrators["c"])
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertEqual(
+            cache.stats,
+            {
+                "entries": 2,
+                "nbytes": 2 * cache.estimate_nbytes(integrators["a"]),
+                "hits": 1,
+                "misses": 1,
+                "evictions": 1,
+            },
+        )
+        # replacing an entry
+        cache.put("c", integrators["c"])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.nbytes, 2 * cache.estimate_nbytes(integrators["a"]))
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+
+    def test_max_bytes(self):
+        small = get_integrator(10)
+        large = get_integrator(1000)
+        self.assertGreater(
+            pybamm.IntegratorCache.estimate_nbytes(large),
+            pybamm.IntegratorCache.estimate_nbytes(small),
+        )
+        nbytes = pybamm.IntegratorCache.estimate_nbytes(small)
+        cache = pybamm.IntegratorCache(max_entries=None, max_bytes=3 * nbytes)
+        for key in range(3):
+            cache.put(key, small)
+        self.assertEqual(len(cache), 3)
+        cache.put("small", small)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.evictions, 1)
+        # the latest integrator is kept even if it is larger than max_bytes
+        cache.put("large", large)
+        self.assertEqual(len(cache), 1)
+        self.assertIn("large", cache)
+
+    def test_casadi_solver(self):
+        model = get_model()
+        solver = pybamm.CasadiSolver(mode="safe", dt_max=1)
+        solver.integrator_cache = pybamm.IntegratorCache(max_entries=3)
+        for t_end in [5, 6, 7, 8, 9]:
+            solver.solve(model, np.linspace(0, t_end, 10), inputs={"rate": 0.01})
+        # the number of integrators is bounded
+        self.assertEqual(len(solver.integrator_cache), 3)
+        self.assertGreater(solver.integrator_cache.evictions, 0)
+
+        # integrators are shared between models with the same specifications
+        cache = pybamm.IntegratorCache(max_entries=None)
+        t_eval = np.linspace(0, 9, 10)
+        solver.integrator_cache = cache
+        solver.solve(model, t_eval, inputs={"rate": 0.01})
+        other_solver = pybamm.CasadiSolver(mode="safe", dt_max=1)
+        other_solver.integrator_cache = cache
+        hits, misses = cache.hits, cache.misses
+        solution = other_solver.solve(get_model(), t_eval, inputs={"rate": 0.01})
+        np.testing.assert_allclose(
+            solution.y.full()[0], np.exp(-0.01 * solution.t), rtol=1e-4
+        )
+        self.assertGreater(cache.hits, hits)
+        self.assertEqual(cache.misses, misses)
+
+        # but not between models with different specifications
+        solver = pybamm.CasadiSolver(mode="safe", dt_max=1, rtol=1e-8)
+        solver.integrator_cache = cache
+        solver.solve(get_model(), t_eval, inputs={"rate": 0.01})
+        self.assertEqual(cache.misses, misses + 1)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
@@ -0,0 +1,152 @@
+#
+# Tests for the MemoryMappedStorage class
+#
+import pybamm
+import unittest
+import os
+import tempfile
+
+import casadi
+import numpy as np
+
+
+class TestMemoryMappedStorage(unittest.TestCase):
+    def test_store_and_concatenate(self):
+        storage = pybamm.MemoryMappedStorage()
+        self.assertTrue(os.path.isdir(storage.directory))
+
+        ys = np.random.rand(3, 10)
+        stored = storage.store(ys)
+        self.assertIsInstance(stored, np.memmap)
+        np.testing.assert_array_equal(stored, ys)
+        with self.assertRaises(ValueError):
+            stored[0, 0] = 1
+        # already stored
+        self.assertIs(storage.store(stored), stored)
+        # casadi DM
+        np.testing.assert_array_equal(storage.store(casadi.DM(ys)), ys)
+
+        old_chunk_size = pybamm.settings.memmap_chunk_size
+        pybamm.settings.memmap_chunk_size = 3
+        try:
+            other = np.random.rand(3, 5)
+            y = storage.concatenate([stored, other])
+        finally:
+            pybamm.settings.memmap_chunk_size = old_chunk_size
+        self.assertIsInstance(y, np.memmap)
+        np.testing.assert_array_equal(y, np.hstack([ys, other]))
+        with self.assertRaisesRegex(ValueError, "same number of rows"):
+            storage.concatenate([ys, np.ones((2, 2))])
+
+        # temporary directory is deleted with the storage
+        directory = storage.directory
+        del storage
+        self.assertFalse(os.path.exists(directory))
+
+        # given directory
+        with tempfile.TemporaryDirectory() as directory:
+            storage = pybamm.MemoryMappedStorage(os.path.join(directory, "states"))
+            storage.store(ys)
+            self.assertEqual(len(os.listdir(storage.directory)), 1)
+
+    def test_solution_in_storage(self):
+        model = pybamm.lithium_ion.SPM()
+        experiment = pybamm.Experiment(
+            [("Discharge at 1C for 10 minutes", "Rest for 10 minutes")] * 2
+        )
+        sim = pybamm.Simulation(model, experiment=experiment)
+        sol = sim.solve()
+        voltage = sol["Terminal voltage [V]"].entries
+        c_s_n = sol["Negative particle concentration"].entries
+
+        old_chunk_size = pybamm.settings.memmap_chunk_size
+        pybamm.settings.memmap_chunk_size = 4
+        try:
+            storage = pybamm.MemoryMappedStorage()
+            sim = pybamm.Simulation(model, experiment=experiment)
+            sol_stored = sim.solve(storage=storage)
+            for ys in sol_stored.all_ys:
+                self.assertIsInstance(ys, np.memmap)
+            for step in sol_stored.cycles[1].steps:
+                for ys in step.all_ys:
+                    self.assertIsInstance(ys, np.memmap)
+            np.testing.assert_array_almost_equal(
+                sol_stored["Terminal voltage [V]"].entries, voltage
+            )
+            np.testing.assert_array_almost_equal(
+                sol_stored["Negative particle concentration"].entries, c_s_n
+            )
+        finally:
+            pybamm.settings.memmap_chunk_size = old_chunk_size
+        self.assertIsInstance(sol_stored.y, np.memmap)
+        np.testing.assert_array_almost_equal(sol_stored.y, sol.y)
+        self.assertNotIsInstance(sol_stored.final_state, np.memmap)
+
+        # without experiment, in a directory
+        with tempfile.TemporaryDirectory() as directory:
+            sim = pybamm.Simulation(model)
+            sol_stored = sim.solve([0, 3600], storage=directory)
+            self.assertIsInstance(sol_stored.all_ys[0], np.memmap)
+            # one file per sub-solution, shared with the full solution
+            self.assertEqual(
+                len(os.listdir(directory)), len(sol_stored.sub_solutions)
+            )
+
+    def test_move_to_storage(self):
+        model = pybamm.BaseModel()
+        u = pybamm.Variable("u")
+        model.rhs = {u: -u}
+        model.initial_conditions = {u: 1}
+        model.variables = {"u": u}
+        solver = pybamm.ScipySolver()
+        sol = solver.solve(model, np.linspace(0, 1, 10))
+        u_entries = sol["u"].entries
+
+        sol.move_to_storage(pybamm.MemoryMappedStorage())
+        self.assertIsInstance(sol.all_ys[0], np.memmap)
+        # processed variables are recomputed from the stored states
+        self.assertEqual(len(sol.data), 0)
+        np.testing.assert_array_equal(sol["u"].entries, u_entries)
+
+        # The states of a sum of solutions are stored once, by sub-solution
+        sol = solver.solve(model, np.linspace(0, 1, 10))
+        sol = sol + solver.solve(model, np.linspace(1, 2, 10))
+        u_entries = sol["u"].entries
+        with tempfile.TemporaryDirectory() as directory:
+            sol.move_to_storage(directory)
+            self.assertEqual(len(os.listdir(directory)), 2)
+            for ys in sol.all_ys:
+                self.assertIsInstance(ys, np.memmap)
+            np.testing.assert_array_equal(sol["u"].entries, u_entries)
+            np.testing.assert_array_equal(
+                sol.all_ys[1], sol.sub_solutions[1].all_ys[0][:, 1:]
+            )
+
+        # Only the states of the solution itself are stored, even if another
+        # solution has been built on top of it
+        sol1 = solver.solve(model, np.linspace(0, 1, 10))
+        sol = sol1 + solver.solve(model, np.linspace(1, 2, 10))
+        u_entries = sol["u"].entries
+        with tempfile.TemporaryDirectory() as directory:
+            sol1.move_to_storage(directory)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            self.assertEqual(len(sol1.all_ys), 1)
+            self.assertIsInstance(sol1.all_ys[0], np.memmap)
+            self.assertNotIsInstance(sol.all_ys[1], np.memmap)
+            np.testing.assert_array_equal(sol["u"].entries, u_entries)
+
+        sol = pybamm.Solution(
+            np.array([0, 1]), np.ones((1, 2)), model, {}, sensitivities=True
+        )
+        with self.assertRaisesRegex(NotImplementedError, "sensitivities"):
+            sol.move_to_storage(pybamm.MemoryMappedStorage())
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
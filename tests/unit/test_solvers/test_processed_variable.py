@@ -202,6 +202,36 @@ class TestProcessedVariable(unittest.TestCase):
             processed_eqn2.entries, y_sol + x_sol[:, np.newaxis]
         )
 
+    def test_processed_variable_1D_sub_solutions(self):
+        # Batched evaluation over several sub-solutions of different lengths
+        t = pybamm.t
+        var = pybamm.Variable("var", domain=["negative electrode", "separator"])
+        x = pybamm.SpatialVariable("x", domain=["negative electrode", "separator"])
+        eqn = t * var + x
+
+        disc = tests.get_discretisation_for_testing()
+        disc.set_variable_slices([var])
+        x_sol = disc.process_symbol(x).entries[:, 0]
+        eqn_sol = disc.process_symbol(eqn)
+        all_ts = [np.linspace(0, 1, 10), np.linspace(1.1, 2, 7), np.array([2.5])]
+        all_ys = [
+            np.ones_like(x_sol)[:, np.newaxis] * np.linspace(0, 5, len(ts))
+            for ts in all_ts
+        ]
+        eqn_casadi = to_casadi(eqn_sol, all_ys[0])
+        model = pybamm.BaseModel()
+        processed_eqn = pybamm.ProcessedVariable(
+            [eqn_sol] * 3,
+            [eqn_casadi] * 3,
+            pybamm.Solution(all_ts, all_ys, [model] * 3, [{}] * 3),
+            warn=False,
+        )
+        t_sol = np.concatenate(all_ts)
+        y_sol = np.hstack(all_ys)
+        np.testing.assert_array_almost_equal(
+            processed_eqn.entries, t_sol * y_sol + x_sol[:, np.newaxis]
+        )
+
     def test_processed_variable_1D_unknown_domain(self):
         x = pybamm.SpatialVariable("x", domain="SEI layer", coord_sys="cartesian")
         geometry = pybamm.Geometry(
@@ -676,6 +706,68 @@ class TestProcessedVariable(unittest.TestCase):
             processed_var(t_sol, x_sol, r_sol).shape, (10, 35, 50)
         )
 
+    def test_processed_var_2D_lazy(self):
+        var = pybamm.Variable(
+            "var",
+            domain=["negative particle"],
+            auxiliary_domains={"secondary": ["negative electrode"]},
+        )
+        x = pybamm.SpatialVariable("x", domain=["negative electrode"])
+        r = pybamm.SpatialVariable(
+            "r",
+            domain=["negative particle"],
+            auxiliary_domains={"secondary": ["negative electrode"]},
+        )
+
+        disc = tests.get_p2d_discretisation_for_testing()
+        disc.set_variable_slices([var])
+        x_sol = disc.process_symbol(x).entries[:, 0]
+        r_sol = disc.process_symbol(r).entries[:, 0]
+        # Keep only the first iteration of entries
+        r_sol = r_sol[: len(r_sol) // len(x_sol)]
+        var_sol = disc.process_symbol(var)
+        t_sol = np.linspace(0, 1)
+        y_sol = np.outer(np.linspace(1, 2, len(x_sol) * len(r_sol)), t_sol**2)
+
+        var_casadi = to_casadi(var_sol, y_sol)
+        solution = pybamm.Solution(t_sol, y_sol, pybamm.BaseModel(), {})
+        processed_var = pybamm.ProcessedVariable(
+            [var_sol], [var_casadi], solution, warn=False
+        )
+        lazy_var = pybamm.ProcessedVariable(
+            [var_sol], [var_casadi], solution, warn=False, lazy=True, cache_size=4
+        )
+        self.assertFalse(processed_var.lazy)
+        self.assertTrue(lazy_var.lazy)
+        self.assertIsNone(lazy_var._entries)
+
+        # Only the time slices around the requested time are evaluated
+        np.testing.assert_array_almost_equal(
+            lazy_var(0.33, x_sol, r_sol), processed_var(0.33, x_sol, r_sol)
+        )
+        self.assertEqual(len(lazy_var._time_slices), 2)
+        np.testing.assert_array_almost_equal(
+            lazy_var(t_sol[:3], 0.2, 0.5), processed_var(t_sol[:3], 0.2, 0.5)
+        )
+        # the least recently used slices are dropped
+        self.assertEqual(len(lazy_var._time_slices), 4)
+        self.assertEqual(list(lazy_var._time_slices), [0, 1, 2, 3])
+        np.testing.assert_array_almost_equal(
+            lazy_var(t_sol, x_sol, r_sol), processed_var(t_sol, x_sol, r_sol)
+        )
+        self.assertEqual(len(lazy_var._time_slices), 4)
+
+        # The entries are evaluated when needed
+        np.testing.assert_array_equal(lazy_var.entries, processed_var.entries)
+
+        # Setting
+        pybamm.settings.lazy_2D_variables = True
+        lazy_var = pybamm.ProcessedVariable(
+            [var_sol], [var_casadi], solution, warn=False
+        )
+        self.assertTrue(lazy_var.lazy)
+        pybamm.settings.lazy_2D_variables = False
+
     def test_processed_var_2D_fixed_t_interpolation(self):
         var = pybamm.Variable(
             "var",
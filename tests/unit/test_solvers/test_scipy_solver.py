@@ -1,5 +1,9 @@
 # Tests for the Scipy Solver class
 #
+import gc
+import multiprocessing
+import multiprocessing.pool
+import pickle
 import pybamm
 import unittest
 import numpy as np
@@ -157,6 +161,43 @@ class TestScipySolver(unittest.TestCase):
             np.ones((N, T.size)) * (T[np.newaxis, :] - np.exp(T[np.newaxis, :])),
         )
 
+    def test_model_solver_sparse_jacobian_python(self):
+        # Create model
+        model = pybamm.BaseModel()
+        model.convert_to_format = "python"
+        model.use_sparse_jacobian = True
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        var1 = pybamm.Variable("var1", domain=whole_cell)
+        var2 = pybamm.Variable("var2", domain=whole_cell)
+        model.rhs = {var1: -var1 * var2, var2: pybamm.div(pybamm.grad(var2)) - var1}
+        model.boundary_conditions = {
+            var2: {
+                "left": (pybamm.Scalar(0), "Neumann"),
+                "right": (pybamm.Scalar(0), "Neumann"),
+            }
+        }
+        model.initial_conditions = {var1: 1.0, var2: 1.0}
+        model.variables = {"var1": var1, "var2": var2}
+
+        # create discretisation
+        mesh = get_mesh_for_testing()
+        spatial_methods = {"macroscale": pybamm.FiniteVolume()}
+        disc = pybamm.Discretisation(mesh, spatial_methods)
+        disc.process_model(model)
+        model_dense = model.new_copy()
+        model_dense.use_sparse_jacobian = False
+        self.assertTrue(model.new_copy().use_sparse_jacobian)
+
+        # Solve with and without the sparse jacobian
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="BDF")
+        t_eval = np.linspace(0, 1, 100)
+        solution = solver.solve(model, t_eval)
+        self.assertIsInstance(
+            model.jac_rhs_eval, pybamm.EvaluatorPythonSparseJacobian
+        )
+        solution_dense = solver.solve(model_dense, t_eval)
+        np.testing.assert_array_almost_equal(solution.y, solution_dense.y)
+
     def test_model_step_python(self):
         # Create model
         model = pybamm.BaseModel()
@@ -283,6 +324,78 @@ class TestScipySolver(unittest.TestCase):
                         solution.y[0], np.exp(-0.01 * (i + 1) * solution.t)
                     )
 
+    def test_model_solver_multiple_inputs_parallel_backends(self):
+        model = pybamm.BaseModel()
+        model.convert_to_format = "casadi"
+        var = pybamm.Variable("var")
+        model.rhs = {var: -pybamm.InputParameter("rate") * var}
+        model.initial_conditions = {var: 1}
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        t_eval = np.linspace(0, 10, 100)
+        ninputs = 6
+        inputs_list = [{"rate": 0.01 * (i + 1)} for i in range(ninputs)]
+
+        def check(solutions):
+            for i in range(ninputs):
+                np.testing.assert_array_equal(solutions[i].t, t_eval)
+                np.testing.assert_allclose(
+                    solutions[i].y[0], np.exp(-0.01 * (i + 1) * t_eval), rtol=1e-6
+                )
+                self.assertIs(solutions[i].all_models[0], model)
+
+        # The process pool is reused by consecutive solves...
+        solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
+        check(solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+        pool = solver._pool
+        self.assertIsNotNone(pool)
+        check(solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+        self.assertIs(solver._pool, pool)
+        # ... until it is closed
+        solver.close_pool()
+        self.assertIsNone(solver._pool)
+        self.assertEqual(pool._state, multiprocessing.pool.TERMINATE)
+        # ... or until the end of a with block
+        with solver:
+            check(solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+            pool = solver._pool
+            self.assertIsNotNone(pool)
+            check(solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+            self.assertIs(solver._pool, pool)
+            # ... but not copied or pickled
+            self.assertIsNone(solver.copy()._pool)
+            self.assertIsNone(pickle.loads(pickle.dumps(solver))._pool)
+            # A new pool is created when the options change
+            solver.rtol = 1e-9
+            check(solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+            self.assertIsNot(solver._pool, pool)
+        self.assertIsNone(solver._pool)
+        self.assertEqual(pool._state, multiprocessing.pool.TERMINATE)
+
+        # The workers don't refer to the solver, so the pool is shut down when the
+        # solver is garbage collected
+        other_solver = pybamm.ScipySolver(rtol=1e-8, atol=1e-8, method="RK45")
+        check(other_solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+        pool = other_solver._pool
+        del other_solver
+        gc.collect()
+        self.assertEqual(pool._state, multiprocessing.pool.TERMINATE)
+
+        # Threads
+        solver.parallel_backend = "threads"
+        check(solver.solve(model, t_eval, inputs=inputs_list, nproc=2))
+        solver.close_pool()
+
+        # User-supplied pool
+        with multiprocessing.Pool(2) as pool:
+            solver.parallel_backend = pool
+            check(solver.solve(model, t_eval, inputs=inputs_list))
+            self.assertIsNone(solver._pool)
+
+        with self.assertRaisesRegex(pybamm.SolverError, "parallel_backend must be"):
+            solver.parallel_backend = "gpu"
+
     def test_model_solver_multiple_inputs_discontinuity_error(self):
         # Create model
         model = pybamm.BaseModel()
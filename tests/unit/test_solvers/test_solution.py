@@ -1,6 +1,7 @@
 #
 # Tests for the Solution class
 #
+import casadi
 import json
 import pybamm
 import unittest
@@ -104,6 +105,35 @@ class TestSolution(unittest.TestCase):
         ):
             2 + sol3
 
+    def test_add_solutions_in_place(self):
+        model = pybamm.BaseModel()
+        sols = [
+            pybamm.Solution(
+                np.linspace(i, i + 1), np.tile(np.linspace(i, i + 1), (2, 1)), model, {}
+            )
+            for i in range(4)
+        ]
+        for sol in sols:
+            sol.solve_time = sol.integration_time = 0
+        sol01 = sols[0] + sols[1]
+        sol012 = sol01 + sols[2]
+        # The sub-solution data is extended in place rather than copied ...
+        self.assertIs(sol012._all_ts, sol01._all_ts)
+        # ... but the earlier solution is unchanged
+        self.assertEqual(len(sol01.all_ts), 2)
+        self.assertEqual(len(sol01.sub_solutions), 2)
+        self.assertEqual(len(sol01.t), 99)
+        self.assertEqual(sol01.y.shape, (2, 99))
+        self.assertEqual(len(sol012.all_ts), 3)
+        self.assertEqual(len(sol012.t), 148)
+
+        # Adding to a solution that has already been extended creates new lists
+        sol013 = sol01 + sols[3].copy()
+        self.assertIsNot(sol013._all_ts, sol01._all_ts)
+        np.testing.assert_array_equal(sol013.all_ts[2], sols[3].t)
+        np.testing.assert_array_equal(sol012.all_ts[2], sols[2].t[1:])
+        self.assertEqual(len(sol01.all_ts), 2)
+
     def test_add_solutions_different_models(self):
         # Set up first solution
         t1 = np.linspace(0, 1)
@@ -217,6 +247,99 @@ class TestSolution(unittest.TestCase):
         np.testing.assert_array_equal(twoc_sol.entries, twoc_sol(solution.t))
         np.testing.assert_array_equal(twoc_sol.entries, 2 * c_sol.entries)
 
+    def test_output_variables(self):
+        model = pybamm.BaseModel()
+        c = pybamm.Variable("c")
+        model.rhs = {c: -c}
+        model.initial_conditions = {c: 1}
+        model.variables["c"] = c
+        model.variables["2c"] = 2 * c
+        disc = pybamm.Discretisation()
+        disc.process_model(model)
+
+        # the solution only stores the values of "2c", and the final state
+        t_sym = casadi.MX.sym("t")
+        y_sym = casadi.MX.sym("y")
+        p_sym = casadi.MX.sym("p", 0)
+        output_variables = {
+            "2c": casadi.Function("variable", [t_sym, y_sym, p_sym], [y_sym])
+        }
+        t = np.linspace(0, 1)
+        solution = pybamm.Solution(
+            t,
+            2 * np.exp(-t)[np.newaxis, :],
+            model,
+            {},
+            np.array([1]),
+            np.array([[np.exp(-1)]]),
+            output_variables=output_variables,
+        )
+        solution.solve_time = solution.integration_time = 0
+        self.assertIs(solution.output_variables, output_variables)
+        np.testing.assert_array_almost_equal(solution["2c"].entries, 2 * np.exp(-t))
+        np.testing.assert_array_equal(solution.final_state, [np.exp(-1)])
+        with self.assertRaisesRegex(KeyError, "not one of the output variables"):
+            solution["c"]
+
+        # output variables are kept when adding solutions
+        other = pybamm.Solution(
+            t + 1,
+            2 * np.exp(-t - 1)[np.newaxis, :],
+            model,
+            {},
+            np.array([2]),
+            np.array([[np.exp(-2)]]),
+            output_variables=output_variables,
+        )
+        other.solve_time = other.integration_time = 0
+        sum_solution = solution + other
+        np.testing.assert_array_almost_equal(
+            sum_solution["2c"].entries, 2 * np.exp(-sum_solution.t)
+        )
+        np.testing.assert_array_equal(sum_solution.final_state, [np.exp(-2)])
+        np.testing.assert_array_almost_equal(
+            sum_solution.last_state["2c"].entries, [2 * np.exp(-2)]
+        )
+
+        # the first state only contains the output variables
+        np.testing.assert_array_almost_equal(
+            sum_solution.first_state["2c"].entries, [2]
+        )
+        with self.assertRaisesRegex(pybamm.SolverError, "final state"):
+            sum_solution.first_state.final_state
+
+        # but can't be mixed with states
+        states = pybamm.ScipySolver().solve(model, np.linspace(0, 1))
+        np.testing.assert_array_equal(states.final_state, states.y[:, -1])
+        with self.assertRaisesRegex(pybamm.SolverError, "output variables"):
+            states + other
+
+        # or with a different layout of output variables
+        y2_sym = casadi.MX.sym("y", 2)
+        for other_output_variables in [
+            {"c": casadi.Function("variable", [t_sym, y_sym, p_sym], [y_sym])},
+            {
+                "2c": casadi.Function(
+                    "variable", [t_sym, y2_sym, p_sym], [y2_sym[0]]
+                ),
+                "c": casadi.Function("variable", [t_sym, y2_sym, p_sym], [y2_sym[1]]),
+            },
+        ]:
+            n_outputs = len(other_output_variables)
+            other = pybamm.Solution(
+                t + 1,
+                np.ones((n_outputs, len(t))),
+                model,
+                {},
+                np.array([2]),
+                np.array([[np.exp(-2)]]),
+                output_variables=other_output_variables,
+            )
+            with self.assertRaisesRegex(
+                pybamm.SolverError, "different output variables"
+            ):
+                solution + other
+
     def test_plot(self):
         model = pybamm.BaseModel()
         c = pybamm.Variable("c")
@@ -0,0 +1,122 @@
+#
+# Tests for the summary variable reductions
+#
+import pybamm
+import unittest
+
+import numpy as np
+
+
+class TestSummaryReductions(unittest.TestCase):
+    def test_reductions(self):
+        t = np.linspace(0, 10, 11)
+        values = np.sin(t)
+        reductions = {
+            "min": np.min(values),
+            "max": np.max(values),
+            "range": np.max(values) - np.min(values),
+            "first": values[0],
+            "last": values[-1],
+            "change": values[-1] - values[0],
+            "integral": np.sum(np.diff(t) * (values[1:] + values[:-1]) / 2),
+        }
+        for name, expected in reductions.items():
+            reduction = pybamm.SummaryVariableReducer.registry[name]()
+            self.assertTrue(np.isnan(reduction.result()))
+            # Same result when the values are given in batches
+            for batch in [slice(0, 4), slice(4, 5), slice(5, 11)]:
+                reduction.update(t[batch], values[batch])
+            self.assertAlmostEqual(reduction.result(), expected)
+            reduction.reset()
+            self.assertTrue(np.isnan(reduction.result()))
+
+        with self.assertRaises(NotImplementedError):
+            pybamm.BaseReduction()
+
+    def test_reducer(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        sim.solve([0, 1800])
+        # Two sub-solutions
+        sol = sim.step(600)
+
+        reducer = pybamm.SummaryVariableReducer.from_model(
+            sol.all_models[0],
+            {
+                "Throughput [A.s]": ("Current [A]", "integral"),
+                "Final current [A]": ("Current [A]", "last"),
+            },
+        )
+        # Each variable is only evaluated once
+        self.assertEqual(reducer.variables.count("Current [A]"), 1)
+        reducer.update(sol)
+        summary = reducer.result()
+
+        Q = sol["Discharge capacity [A.h]"].data
+        V = sol["Battery voltage [V]"].data
+        np.testing.assert_almost_equal(
+            summary["Minimum measured discharge capacity [A.h]"], np.min(Q)
+        )
+        np.testing.assert_almost_equal(summary["Measured capacity [A.h]"], np.ptp(Q))
+        np.testing.assert_almost_equal(summary["Minimum voltage [V]"], np.min(V))
+        np.testing.assert_almost_equal(summary["Maximum voltage [V]"], np.max(V))
+        for var in model.summary_variables:
+            data = sol[var].data
+            np.testing.assert_almost_equal(summary[var], data[-1])
+            var_lowercase = var[0].lower() + var[1:]
+            np.testing.assert_almost_equal(
+                summary["Change in " + var_lowercase], data[-1] - data[0]
+            )
+        np.testing.assert_almost_equal(
+            summary["Throughput [A.s]"] / 3600, np.max(Q) - np.min(Q), 3
+        )
+
+        # Functions are shared between steps with similar numbers of time points,
+        # and at most `max_functions` are kept
+        for n_t in [len(ts) for ts in sol.all_ts]:
+            self.assertIn(
+                (sol.all_models[0], True, 1 << (n_t - 1).bit_length()),
+                reducer._mapped_casadi,
+            )
+        small_reducer = pybamm.SummaryVariableReducer(
+            {"Minimum voltage [V]": ("Battery voltage [V]", "min")}, max_functions=1
+        )
+        small_reducer.update(sol)
+        self.assertEqual(len(small_reducer._mapped_casadi), 1)
+        np.testing.assert_almost_equal(
+            small_reducer.result()["Minimum voltage [V]"], np.min(V)
+        )
+
+        # Reset for the next cycle
+        reducer.reset()
+        self.assertTrue(np.isnan(reducer.result()["Minimum voltage [V]"]))
+
+        with self.assertRaisesRegex(ValueError, "Unknown reduction"):
+            pybamm.SummaryVariableReducer({"a": ("Current [A]", "median")})
+
+    def test_reducer_memory_mapped_states(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        sol = sim.solve([0, 3600])
+        reducer = pybamm.SummaryVariableReducer.from_model(sol.all_models[0])
+        reducer.update(sol)
+
+        old_chunk_size = pybamm.settings.memmap_chunk_size
+        pybamm.settings.memmap_chunk_size = 7
+        sol.move_to_storage(pybamm.MemoryMappedStorage())
+        stored_reducer = pybamm.SummaryVariableReducer.from_model(sol.all_models[0])
+        stored_reducer.update(sol)
+        pybamm.settings.memmap_chunk_size = old_chunk_size
+
+        for name, value in reducer.result().items():
+            np.testing.assert_almost_equal(stored_reducer.result()[name], value)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()
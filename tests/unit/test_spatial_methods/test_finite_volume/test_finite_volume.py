@@ -532,6 +532,73 @@ class TestFiniteVolume(unittest.TestCase):
         self.assertEqual(disc.bcs[var]["right"][0], pybamm.Scalar(0))
         self.assertEqual(disc.bcs[var]["right"][1], "Neumann")
 
+    def test_matrices_are_cached(self):
+        mesh = get_mesh_for_testing()
+        fin_vol = pybamm.FiniteVolume()
+        fin_vol.build(mesh)
+        whole_cell = ["negative electrode", "separator", "positive electrode"]
+        domains = {"primary": whole_cell}
+        grad = fin_vol.gradient_matrix(whole_cell, domains)
+        div = fin_vol.divergence_matrix(domains)
+        self.assertIs(fin_vol.gradient_matrix(whole_cell, domains), grad)
+        self.assertIs(fin_vol.divergence_matrix(domains), div)
+        self.assertIsNot(
+            fin_vol.divergence_matrix({"primary": ["negative electrode"]}), div
+        )
+
+        var = pybamm.Variable("var", domain=whole_cell)
+        integral = fin_vol.definite_integral_matrix(var)
+        self.assertIs(fin_vol.definite_integral_matrix(var), integral)
+        var_edges = pybamm.grad(var)
+        self.assertIsNot(fin_vol.definite_integral_matrix(var_edges), integral)
+
+        arithmetic = fin_vol.arithmetic_mean_matrix(domains, "node to edge")
+        self.assertIs(
+            fin_vol.arithmetic_mean_matrix(domains, "node to edge"), arithmetic
+        )
+        harmonic = fin_vol.harmonic_mean_matrices(domains, "edge to node")
+        self.assertIs(fin_vol.harmonic_mean_matrices(domains, "edge to node"), harmonic)
+
+        # Matrices are shared with other spatial methods with the same options and an
+        # identical mesh
+        other_fin_vol = pybamm.FiniteVolume()
+        other_fin_vol.build(get_mesh_for_testing())
+        self.assertIs(other_fin_vol.gradient_matrix(whole_cell, domains), grad)
+        other_fin_vol = pybamm.FiniteVolume(
+            {"extrapolation": {"order": "quadratic"}}
+        )
+        other_fin_vol.build(mesh)
+        self.assertIsNot(other_fin_vol.gradient_matrix(whole_cell, domains), grad)
+
+        # Building with a new mesh gives new matrices
+        fin_vol.build(get_mesh_for_testing(xpts=10))
+        new_grad = fin_vol.gradient_matrix(whole_cell, domains)
+        self.assertIsNot(new_grad, grad)
+        self.assertEqual(new_grad.shape[0], 29)
+
+    def test_matrices_shared_between_discretisations(self):
+        model = pybamm.lithium_ion.SPMe()
+        geometry = model.default_geometry
+        param = model.default_parameter_values
+        param.process_model(model)
+        param.process_geometry(geometry)
+        mesh = pybamm.Mesh(geometry, model.default_submesh_types, model.default_var_pts)
+
+        pybamm.operator_matrix_cache.clear()
+        misses = pybamm.operator_matrix_cache.misses
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        disc.process_model(model, inplace=False)
+        stats = pybamm.operator_matrix_cache.stats
+        self.assertGreater(stats["misses"], misses)
+
+        # A second discretisation, with new spatial methods, only reuses matrices
+        disc = pybamm.Discretisation(mesh, model.default_spatial_methods)
+        disc.process_model(model, inplace=False)
+        new_stats = pybamm.operator_matrix_cache.stats
+        self.assertEqual(new_stats["misses"], stats["misses"])
+        self.assertEqual(new_stats["entries"], stats["entries"])
+        self.assertGreater(new_stats["hits"], stats["hits"])
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
@@ -0,0 +1,48 @@
+#
+# Tests for the operator matrix cache
+#
+import pybamm
+import unittest
+
+import numpy as np
+
+
+class TestOperatorMatrixCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = pybamm.OperatorMatrixCache(max_entries=2)
+        matrices = [pybamm.Matrix(np.eye(n)) for n in range(1, 4)]
+
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", matrices[0])
+        cache.put("b", matrices[1])
+        self.assertIs(cache.get("a"), matrices[0])
+        # "b" is the least recently used, so is removed
+        cache.put("c", matrices[2])
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIs(cache.get("c"), matrices[2])
+        self.assertEqual(
+            cache.stats, {"entries": 2, "hits": 2, "misses": 1, "evictions": 1}
+        )
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+        # No limit, or no caching
+        cache = pybamm.OperatorMatrixCache(max_entries=None)
+        for i, matrix in enumerate(matrices):
+            cache.put(i, matrix)
+        self.assertEqual(len(cache), 3)
+        cache = pybamm.OperatorMatrixCache(max_entries=0)
+        cache.put("a", matrices[0])
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    pybamm.settings.debug_mode = True
+    unittest.main()